@@ -0,0 +1,94 @@
+"""
+Benchmark of asset uploads batched by number of assets or by payload size
+
+    python -m benchmarks.batching
+
+The stub server answers after a fixed latency plus a time proportional
+to the size of the request, like an API parsing and storing the payload.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from kili.constants import MUTATION_BATCH_MAX_BYTES, MUTATION_BATCH_SIZE
+from kili.graphql_client import GraphQLClient
+from kili.mutations.asset.helpers import process_append_many_to_dataset_parameters
+from kili.utils.pagination import _mutate_from_paginated_call
+from kili.utils.rate_limiter import RateLimiter
+
+from benchmarks.stub_server import stub_graphql_server
+
+LATENCY = 0.05
+SECONDS_PER_MEGABYTE = 0.02
+
+
+def write_images(directory, number, size):
+    """Write random png files of the given size"""
+    paths = []
+    for _ in range(number):
+        path = os.path.join(directory, f'{len(os.listdir(directory))}.png')
+        with open(path, 'wb') as file:
+            file.write(os.urandom(size))
+        paths.append(path)
+    return paths
+
+
+def upload(endpoint, input_type, content_array, batch_size, max_bytes):
+    """Upload the assets and return the size of the largest request"""
+    largest_request = 0
+    client = GraphQLClient(endpoint, rate_limiter=RateLimiter(max_calls=10**6))
+    kili = SimpleNamespace(auth=SimpleNamespace(client=client))
+    properties_to_batch, _, request = process_append_many_to_dataset_parameters(
+        input_type, content_array, None, None, None, None, None)
+
+    def generate_variables(batch):
+        nonlocal largest_request
+        variables = {'data': {'contentArray': batch['content_array'],
+                              'externalIDArray': batch['external_id_array']}}
+        largest_request = max(largest_request, len(json.dumps(variables)))
+        return variables
+
+    _mutate_from_paginated_call(kili, properties_to_batch, generate_variables, request,
+                                batch_size=batch_size, max_bytes=max_bytes)
+    client.close()
+    return largest_request
+
+
+def resolver(payload):
+    """Take time proportionally to the size of the payload"""
+    size = len(json.dumps(payload))
+    threading.Event().wait(SECONDS_PER_MEGABYTE * size / 2**20)
+    return {'data': {'data': {'id': 'project'}}}
+
+
+def main():
+    """Run the benchmark"""
+    with tempfile.TemporaryDirectory() as directory, \
+            stub_graphql_server(resolver=resolver, latency=LATENCY) as endpoint:
+        images = write_images(directory, 300, 20 * 2**10) + \
+            write_images(directory, 30, 2 * 2**20)
+        images = images[::11] + [path for i, path in enumerate(images) if i % 11]
+        texts = [f'text number {i}' for i in range(3000)]
+        datasets = [('IMAGE', 'mixed images', images), ('TEXT', 'short texts', texts)]
+        strategies = [
+            ('100 assets', MUTATION_BATCH_SIZE, None),
+            ('100 assets or 10 MB', MUTATION_BATCH_SIZE, MUTATION_BATCH_MAX_BYTES),
+            ('1000 assets or 10 MB', 1000, MUTATION_BATCH_MAX_BYTES),
+        ]
+        for input_type, dataset_name, content_array in datasets:
+            for strategy_name, batch_size, max_bytes in strategies:
+                start = time.perf_counter()
+                largest_request = upload(
+                    endpoint, input_type, content_array, batch_size, max_bytes)
+                duration = time.perf_counter() - start
+                print(f'{dataset_name:14} {strategy_name:22} '
+                      f'{len(content_array) / duration:8.0f} assets/sec '
+                      f'{largest_request / 2**20:8.1f} MB largest request')
+
+
+if __name__ == '__main__':
+    main()
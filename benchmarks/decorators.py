@@ -0,0 +1,64 @@
+"""
+Benchmark of the overhead of the decorators of the public methods of the client
+
+    python -m benchmarks.decorators
+
+Calls update_properties_in_assets with 100k asset ids and the labels query with
+one row, with the API calls stubbed out, through the decorated methods and through
+the methods bound by the production mode.
+"""
+
+import time
+from typing import List
+from unittest.mock import MagicMock, patch
+
+import typeguard
+
+from kili.client import Kili
+
+NUMBER_OF_ASSETS = 100_000
+NUMBER_OF_SMALL_CALLS = 10_000
+
+
+def stub_client(production_mode):
+    """A Kili client which does not call the API"""
+    kili = Kili.__new__(Kili)
+    kili.auth = MagicMock()
+    kili.auth.client.endpoint = 'https://cloud.kili-technology.com/api/label/v2/graphql'
+    if production_mode:
+        kili._bind_undecorated_resolvers()  # pylint: disable=protected-access
+    return kili
+
+
+def timed(function, number=1):
+    """Duration of one call of the function, in microseconds"""
+    start = time.perf_counter()
+    for _ in range(number):
+        function()
+    return (time.perf_counter() - start) / number * 1e6
+
+
+def main():
+    """Run the benchmark"""
+    asset_ids = [f'asset{i}' for i in range(NUMBER_OF_ASSETS)]
+    # typeguard 2 checks every element of the lists, like typeguard>=3 with ALL_ITEMS
+    options = {}
+    if hasattr(typeguard, 'CollectionCheckStrategy'):
+        options['collection_check_strategy'] = typeguard.CollectionCheckStrategy.ALL_ITEMS
+    print(f'typeguard check of List[str] with {NUMBER_OF_ASSETS} ids: '
+          f'{timed(lambda: typeguard.check_type(asset_ids, List[str], **options)):8.0f} us')
+    with patch('kili.mutations.asset._mutate_from_paginated_call', return_value=[]), \
+            patch('kili.mutations.asset.format_result', return_value=[]), \
+            patch('kili.queries.label.QueriesLabel._query_labels', return_value=[]):
+        for production_mode in [False, True]:
+            kili = stub_client(production_mode)
+            mutation = timed(lambda kili=kili: kili.update_properties_in_assets(
+                asset_ids=asset_ids, priorities=[0] * NUMBER_OF_ASSETS), 10)
+            query = timed(lambda kili=kili: kili.labels(
+                project_id='project', first=1, disable_tqdm=True), NUMBER_OF_SMALL_CALLS)
+            print(f'production_mode={production_mode!s:5} '
+                  f'update_properties_in_assets {mutation:8.0f} us   labels {query:6.1f} us')
+
+
+if __name__ == '__main__':
+    main()
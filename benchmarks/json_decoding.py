@@ -0,0 +1,71 @@
+"""
+Micro-benchmark of the decoding of labels with large segmentation masks
+
+    python -m benchmarks.json_decoding
+
+Compares the standard library with the backend picked by kili.utils.json_decoder
+(orjson or ujson when installed), and skipping the decoding of the json fields.
+"""
+
+import json
+import random
+import time
+
+from kili import helpers
+from kili.orm import Label
+from kili.utils import json_decoder
+
+NUMBER_OF_LABELS = 200
+NUMBER_OF_POLYGONS = 20
+NUMBER_OF_VERTICES = 200
+
+
+def synthetic_json_response():
+    """A semantic segmentation label made of many polygons"""
+    return {'JOB_0': {'annotations': [{
+        'boundingPoly': [{'normalizedVertices': [
+            {'x': random.random(), 'y': random.random()} for _ in range(NUMBER_OF_VERTICES)]}],
+        'categories': [{'name': 'CAR', 'confidence': 100}],
+        'mid': f'{i}',
+        'type': 'semantic'} for i in range(NUMBER_OF_POLYGONS)]}}
+
+
+def synthetic_response():
+    """The body of an answer of the API to a labels query"""
+    return json.dumps({'data': {'data': [{
+        'id': f'label{i}',
+        'jsonResponse': json.dumps(synthetic_json_response()),
+        'author': {'email': 'test@kili-technology.com', 'id': 'user'},
+    } for i in range(NUMBER_OF_LABELS)]}}).encode('utf-8')
+
+
+def measure(body, loads, decode_json):
+    """Seconds to parse the body and read the json responses of the labels"""
+    original_loads = helpers.loads
+    helpers.loads = loads
+    try:
+        start = time.perf_counter()
+        labels = helpers.format_result('data', loads(body), Label, decode_json)
+        for label in labels:
+            _ = label['jsonResponse']
+        return time.perf_counter() - start
+    finally:
+        helpers.loads = original_loads
+
+
+def main():
+    """Run the benchmark"""
+    body = synthetic_response()
+    print(f'{NUMBER_OF_LABELS} labels, {len(body) / 2**20:.1f} MB, '
+          f'backend: {json_decoder.JSON_BACKEND}')
+    for name, loads, decode_json in [('json', json.loads, True),
+                                     (json_decoder.JSON_BACKEND, json_decoder.loads, True),
+                                     ('no decoding', json_decoder.loads, False)]:
+        durations = []
+        for _ in range(5):
+            durations.append(measure(body, loads, decode_json))
+        print(f'{name:12} {NUMBER_OF_LABELS / min(durations):10.0f} labels/sec')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark of the memory held by the results of a labels query, as dict records or compact records
+
+    python -m benchmarks.memory [number_of_rows]
+
+Rows are built page by page from synthetic API results, like kili.labels does,
+and the memory still allocated once all the rows are kept is reported.
+"""
+
+import sys
+import time
+import tracemalloc
+
+from kili.helpers import format_result
+from kili.orm import Label, compact_record, fields_tree
+
+NUMBER_OF_ROWS = 1_000_000
+PAGE_SIZE = 100
+FIELDS = ['author.email', 'author.id', 'createdAt', 'id', 'labelType', 'secondsToLabel', 'skipped']
+
+
+def synthetic_page(offset):
+    """The result of a labels query for one page, as decoded from the API response"""
+    return {'data': {'data': [{
+        'author': {'email': f'labeler{i % 10}@kili-technology.com', 'id': f'user{i % 10}'},
+        'createdAt': f'2022-01-01T00:00:{i % 60:02d}.000Z',
+        'id': f'cl{i:023d}',
+        'labelType': 'DEFAULT',
+        'secondsToLabel': i % 100,
+        'skipped': False,
+    } for i in range(offset, offset + PAGE_SIZE)]}}
+
+
+def as_dict_records(page):
+    """Label records, as returned by kili.labels()"""
+    return format_result('data', page, Label)
+
+
+def as_compact_records(page):
+    """Compact records, as returned by kili.labels(format='compact')"""
+    tree = fields_tree(FIELDS)
+    return [compact_record(row, tree) for row in format_result('data', page)]
+
+
+def main():
+    """Run the benchmark"""
+    number_of_rows = int(sys.argv[1]) if len(sys.argv) > 1 else NUMBER_OF_ROWS
+    print(f'{number_of_rows} labels with fields {FIELDS}')
+    for name, build_records in [('dict records', as_dict_records),
+                                 ('compact records', as_compact_records)]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        rows = []
+        for offset in range(0, number_of_rows, PAGE_SIZE):
+            rows.extend(build_records(synthetic_page(offset)))
+        duration = time.perf_counter() - start
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del rows
+        print(f'{name:16} {memory / 2**20:8.0f} MB '
+              f'{memory / number_of_rows:6.0f} bytes/row {duration:6.1f} s')
+
+
+if __name__ == '__main__':
+    main()
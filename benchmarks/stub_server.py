@@ -0,0 +1,85 @@
+"""
+Local stub GraphQL server used by the benchmarks
+"""
+
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import gzip
+import json
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+
+
+def default_resolver(_payload):
+    """
+    Answer every query with an empty list
+    """
+    return {'data': {'data': []}}
+
+
+def wrap_with_self_signed_certificate(server, directory):
+    """
+    Serve over TLS with a certificate generated by openssl
+
+    Args:
+        server: the HTTP server
+        directory: where the certificate is written
+    """
+    cert = os.path.join(directory, 'cert.pem')
+    key = os.path.join(directory, 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+                    '-keyout', key, '-out', cert, '-days', '1', '-subj', '/CN=127.0.0.1'],
+                   check=True, capture_output=True)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+
+
+@contextmanager
+def stub_graphql_server(resolver=default_resolver, latency=0., tls=False):
+    """
+    Run a GraphQL server answering on http(s)://127.0.0.1:<port>/api/label/v2/graphql
+
+    Args:
+        resolver: function mapping a GraphQL payload to the JSON response
+        latency: seconds waited by the server before answering
+        tls: if True, serve over https with a self-signed certificate (requires openssl)
+    """
+    class Handler(BaseHTTPRequestHandler):
+        """Handler keeping connections alive"""
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+        wbufsize = -1
+
+        def do_POST(self):  # pylint: disable=invalid-name
+            """Answer a GraphQL query"""
+            body = self.rfile.read(int(self.headers['Content-Length']))
+            if self.headers.get('Content-Encoding') == 'gzip':
+                body = gzip.decompress(body)
+            response = json.dumps(resolver(json.loads(body))).encode('utf-8')
+            if latency:
+                threading.Event().wait(latency)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(response)))
+            self.end_headers()
+            self.wfile.write(response)
+
+        def log_message(self, *_):  # pylint: disable=arguments-differ
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    with tempfile.TemporaryDirectory() as directory:
+        if tls:
+            wrap_with_self_signed_certificate(server, directory)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        scheme = 'https' if tls else 'http'
+        try:
+            yield f'{scheme}://127.0.0.1:{server.server_address[1]}/api/label/v2/graphql'
+        finally:
+            server.shutdown()
+            server.server_close()
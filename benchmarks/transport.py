@@ -0,0 +1,53 @@
+"""
+Benchmark of the HTTP transport: requests/sec with and without connection pooling
+
+    python -m benchmarks.transport
+"""
+
+import json
+import shutil
+import time
+import warnings
+
+import requests
+
+from kili.graphql_client import GraphQLClient
+from kili.utils.rate_limiter import RateLimiter
+
+from benchmarks.stub_server import stub_graphql_server
+
+NUMBER_OF_CALLS = 300
+QUERY = 'query { data: me { id } }'
+
+
+def without_pooling(endpoint, number_of_calls):
+    """A new connection, and a new TLS handshake, for each call"""
+    for _ in range(number_of_calls):
+        requests.post(endpoint, json.dumps({'query': QUERY}),
+                      headers={'Content-Type': 'application/json'}, verify=False).json()
+
+
+def with_pooling(endpoint, number_of_calls):
+    """Connections kept alive in the pool of the GraphQL client, without rate limit"""
+    client = GraphQLClient(endpoint, verify=False, rate_limiter=RateLimiter(max_calls=10**6))
+    for _ in range(number_of_calls):
+        client.execute(QUERY)
+    client.close()
+
+
+def main():
+    """Run the benchmark"""
+    warnings.filterwarnings('ignore', message='Unverified HTTPS request')
+    for tls in [False, True] if shutil.which('openssl') else [False]:
+        with stub_graphql_server(tls=tls) as endpoint:
+            for name, method in [('without pooling', without_pooling),
+                                 ('with pooling', with_pooling)]:
+                start = time.perf_counter()
+                method(endpoint, NUMBER_OF_CALLS)
+                duration = time.perf_counter() - start
+                print(f'{endpoint.split(":")[0]:6} {name:20} '
+                      f'{NUMBER_OF_CALLS / duration:8.0f} requests/sec')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+This script permits to initialize the asynchronous Kili Python SDK client.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import asyncio
+import functools
+
+from kili.client import Kili
+from kili.graphql_client import DEFAULT_POOL_MAXSIZE
+
+ASYNC_GENERATOR_CHUNK_SIZE = 100
+
+
+class AsyncKili:
+    """
+    Asynchronous Kili Client.
+
+    Every method of `Kili` is available as a coroutine, and queries called with
+    `as_generator=True` return async generators. Calls run in a pool of
+    `max_concurrency` threads sharing the keep-alive HTTP connections and the
+    rate limit of a single `Kili` client, so that an event loop can await many
+    calls at once without blocking.
+
+    !!! info "Concurrency"
+        This is not an asynchronous HTTP client: each call runs the blocking method
+        of `Kili` in one of the `max_concurrency` threads, so at most `max_concurrency`
+        calls are sent at the same time and the others wait for a free thread.
+        `AsyncKili(...)` authenticates with blocking requests: inside an event loop,
+        create the client with `await AsyncKili.create(...)` instead.
+    """
+
+    def __init__(self, api_key=None,
+                 api_endpoint=None,
+                 verify=True,
+                 max_concurrency=DEFAULT_POOL_MAXSIZE,
+                 compress_requests=False):
+        """
+        Args:
+            api_key: User API key generated
+                from https://cloud.kili-technology.com/label/my-account/api-key
+                Default to  KILI_API_KEY environment variable).
+            api_endpoint: Recipient of the HTTP operation
+                Default to  KILI_API_ENDPOINT environment variable).
+            verify: Verify certificate. Set to False on local deployment without SSL.
+            max_concurrency: Number of threads running the calls, hence maximum number
+                of calls to Kili running at the same time.
+                Further calls wait for a free thread.
+            compress_requests: If `True`, request bodies larger than 1kB are gzipped.
+
+        Examples:
+            >>> async with AsyncKili() as kili:
+                    assets, labels = await asyncio.gather(
+                        kili.assets(project_id), kili.labels(project_id))
+                    async for asset in kili.assets(project_id, as_generator=True):
+                        print(asset['id'])
+        """
+        self.kili = Kili(api_key=api_key, api_endpoint=api_endpoint, verify=verify,
+                         pool_maxsize=max_concurrency, compress_requests=compress_requests)
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                           thread_name_prefix='kili')
+
+    @classmethod
+    async def create(cls, api_key=None,
+                     api_endpoint=None,
+                     verify=True,
+                     max_concurrency=DEFAULT_POOL_MAXSIZE,
+                     compress_requests=False):
+        """
+        Create a client without blocking the event loop: the authentication
+        requests run in the thread pool of the client
+
+        Args:
+            api_key: User API key
+            api_endpoint: Recipient of the HTTP operation
+            verify: Verify certificate. Set to False on local deployment without SSL.
+            max_concurrency: Maximum number of calls to Kili running at the same time
+            compress_requests: If `True`, request bodies larger than 1kB are gzipped.
+
+        Examples:
+            >>> async with await AsyncKili.create() as kili:
+                    assets = await kili.assets(project_id)
+        """
+        async_kili = cls.__new__(cls)
+        async_kili.executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                                 thread_name_prefix='kili')
+        loop = asyncio.get_running_loop()
+        try:
+            async_kili.kili = await loop.run_in_executor(async_kili.executor, functools.partial(
+                Kili, api_key=api_key, api_endpoint=api_endpoint, verify=verify,
+                pool_maxsize=max_concurrency, compress_requests=compress_requests))
+        except BaseException:
+            async_kili.executor.shutdown(wait=False)
+            raise
+        return async_kili
+
+    def __getattr__(self, name):
+        attribute = getattr(self.kili, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def method(*args, **kwargs):
+            if kwargs.get('as_generator'):
+                return self._iterate(attribute, *args, **kwargs)
+            return self._run(attribute, *args, **kwargs)
+        return method
+
+    async def _run(self, method, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(method, *args, **kwargs))
+
+    async def _iterate(self, method, *args, **kwargs):
+        rows = await self._run(method, *args, **kwargs)
+        try:
+            while True:
+                chunk = await self._run(list, islice(rows, ASYNC_GENERATOR_CHUNK_SIZE))
+                for row in chunk:
+                    yield row
+                if len(chunk) < ASYNC_GENERATOR_CHUNK_SIZE:
+                    return
+        finally:
+            await self._run(rows.close)
+
+    async def close(self):
+        """
+        Wait for the running calls and close the HTTP connections
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self.executor.shutdown, wait=True))
+        self.kili.auth.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
@@ -1,16 +1,14 @@
 """API authentication module"""
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
-import requests
-
 from . import __version__
-from .graphql_client import GraphQLClient
+from .graphql_client import DEFAULT_POOL_MAXSIZE, GraphQLClient
 from .helpers import format_result
 from .queries.api_key import QueriesApiKey
 from .queries.user.queries import GQL_ME
-
-MAX_RETRIES = 20
+from .utils.auth_cache import AuthCache
 
 warnings.filterwarnings("default", module='kili', category=DeprecationWarning)
 
@@ -34,10 +32,18 @@ class KiliAuth:
     def __init__(self,
                  api_key,
                  api_endpoint,
-                 verify=True):
-        self.session = requests.Session()
-
+                 verify=True,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 compress_requests=False,
+                 query_cache=None,
+                 auth_cache=None):
+        # pylint: disable=too-many-arguments
         self.verify = verify
+        self.client = GraphQLClient(
+            api_endpoint, verify=self.verify,
+            pool_maxsize=pool_maxsize, compress_requests=compress_requests,
+            query_cache=query_cache)
+        self.session = self.client.session
 
         if api_endpoint and 'v1/graphql' in api_endpoint:
             # pylint: disable=line-too-long
@@ -45,28 +51,33 @@ class KiliAuth:
                 ' please use the new endpoint https://cloud.kili-technology.com/api/label/v2/graphql' \
                 ' (or None), the former endpoint call will be deprecated on February 15th 2021'
             warnings.warn(message, DeprecationWarning)
-        try:
-            self.check_versions_match(api_endpoint)
-        except:  # pylint: disable=bare-except
-            message = 'We could not check the version, there might be a version' \
-                'mismatch or the app might be in deployment'
-            warnings.warn(message, UserWarning)
 
-        adapter = requests.adapters.HTTPAdapter(max_retries=MAX_RETRIES)
-        self.session.mount('https://', adapter)
-        self.session.mount('http://', adapter)
-        self.client = GraphQLClient(
-            api_endpoint, self.session, verify=self.verify)
         self.client.inject_token('X-API-Key: ' + api_key)
 
-        user = self.get_user()
-
-        if (user is None or user['id'] is None or user['email'] is None):
-            raise Exception('No user attached to the API key was found')
-
-        self.user_id = user['id']
-        self.user_email = user['email']
-        self.check_expiry_of_key_is_close(api_key)
+        auth_cache = auth_cache if auth_cache is not None else AuthCache()
+        cached = auth_cache.get(api_key, api_endpoint)
+        if cached is None:
+            # the three checks are independent, so they are sent at once
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                version_check = executor.submit(self.check_versions_match, api_endpoint)
+                user_query = executor.submit(self.get_user)
+                key_query = executor.submit(self.get_api_key_creation_date, api_key)
+            try:
+                version_check.result()
+            except:  # pylint: disable=bare-except
+                message = 'We could not check the version, there might be a version' \
+                    'mismatch or the app might be in deployment'
+                warnings.warn(message, UserWarning)
+            user = user_query.result()
+            if (user is None or user['id'] is None or user['email'] is None):
+                raise Exception('No user attached to the API key was found')
+            cached = {'user_id': user['id'], 'user_email': user['email'],
+                      'key_created_at': key_query.result()}
+            auth_cache.set(api_key, api_endpoint, cached)
+
+        self.user_id = cached['user_id']
+        self.user_email = cached['user_email']
+        self.check_expiry_of_key_is_close(api_key, cached['key_created_at'])
 
     def __del__(self):
         self.session.close()
@@ -78,26 +89,36 @@ class KiliAuth:
             api_endpoint: url of the Kili API
         """
         url = api_endpoint.replace('/graphql', '/version')
-        response = requests.get(url, verify=self.verify).json()
+        response = self.session.get(url, verify=self.verify).json()
         version = response['version']
         if get_version_without_patch(version) != get_version_without_patch(__version__):
             message = 'Kili Python SDK version should match with Kili API version.\n' + \
                       f'Please install version: "pip install kili=={version}"'
             warnings.warn(message, UserWarning)
 
-    def check_expiry_of_key_is_close(self, api_key):
-        """Check that the expiration date of the api_key is not too close.
+    def get_api_key_creation_date(self, api_key):
+        """Return the creation date of the api_key, as sent by the API
 
         Args:
             api_key: key used to connect to the Kili API
         """
-        duration_days = 365
-        warn_days = 30
         queries = QueriesApiKey(self)
         key_object = queries.api_keys(api_key=api_key, fields=[
                                       'createdAt'], disable_tqdm=True)
-        key_creation = datetime.strptime(
-            key_object[0]['createdAt'], '%Y-%m-%dT%H:%M:%S.%fZ')
+        return key_object[0]['createdAt']
+
+    def check_expiry_of_key_is_close(self, api_key, key_created_at=None):
+        """Check that the expiration date of the api_key is not too close.
+
+        Args:
+            api_key: key used to connect to the Kili API
+            key_created_at: creation date of the key, queried if not given
+        """
+        duration_days = 365
+        warn_days = 30
+        if key_created_at is None:
+            key_created_at = self.get_api_key_creation_date(api_key)
+        key_creation = datetime.strptime(key_created_at, '%Y-%m-%dT%H:%M:%S.%fZ')
         key_expiry = key_creation + timedelta(days=duration_days)
         key_remaining_time = key_expiry - datetime.now()
         key_soon_deprecated = key_remaining_time < timedelta(days=warn_days)
@@ -4,10 +4,7 @@ import os
 from typing import Optional, Tuple, List, Dict, cast
 import json
 import click
-from tabulate import tabulate
 from typeguard import typechecked
-import pandas as pd
-import numpy as np
 from kili.client import Kili
 from kili import __version__
 from kili.constants import INPUT_TYPE
@@ -15,8 +12,13 @@ from kili.exceptions import NotFound
 from kili.mutations.asset.helpers import (
     generate_json_metadata_array, get_file_paths_to_upload)
 from kili.mutations.label.helpers import (
-    generate_create_predictions_arguments, read_import_label_csv)
+    generate_create_predictions_arguments, read_import_label_csv, read_json_files)
 from kili.queries.project.helpers import get_project_metadata, get_project_metrics, get_project_url
+from kili.utils.lazy_import import LazyModule
+
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+tabulate = LazyModule('tabulate')
 
 CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 
@@ -104,7 +106,7 @@ def list_project(api_key: Optional[str],
     projects['ID'] = projects["id"]
 
     projects = projects[['TITLE', 'ID', 'PROGRESS', 'DESCRIPTION']]
-    print(tabulate(projects, headers='keys', tablefmt=tablefmt,
+    print(tabulate.tabulate(projects, headers='keys', tablefmt=tablefmt,
           showindex=False, colalign=("left", "left", "right", "left")))
 
 
@@ -178,7 +180,7 @@ def create_project(api_key: Optional[str],
 
     project_url = get_project_url(project_id, kili.auth.client.endpoint)
     print(
-        tabulate(
+        tabulate.tabulate(
             [[project_id, project_url]],
             headers=["ID", "URL"],
             tablefmt=tablefmt
@@ -201,6 +203,10 @@ def create_project(api_key: Optional[str],
               help="Only for a frame project, import videos with a specific frame rate")
 @click.option('--verbose', type=bool, is_flag=True, default=False,
               help='Show logs')
+@click.option('--journal', type=click.Path(dir_okay=False),
+              help="File recording the imported files. "
+              "If the import is interrupted, run it again with the same journal "
+              "to only import the remaining files.")
 @typechecked
 # pylint: disable=too-many-arguments
 def import_assets(api_key: Optional[str],
@@ -210,7 +216,8 @@ def import_assets(api_key: Optional[str],
                   exclude: Optional[Tuple[str, ...]],
                   fps: Optional[int],
                   as_frames: bool,
-                  verbose: bool):
+                  verbose: bool,
+                  journal: Optional[str]):
     """
     Add assets into a project
 
@@ -231,6 +238,12 @@ def import_assets(api_key: Optional[str],
             --frames \\
             --fps 24
         ```
+        ```
+        kili project import \\
+            dir1/ \\
+            --project-id <project_id> \\
+            --journal import.journal
+        ```
 
     \b
     !!! warning "Unsupported imports"
@@ -272,7 +285,8 @@ def import_assets(api_key: Optional[str],
         project_id=project_id,
         content_array=files_to_upload,
         external_id_array=external_ids,
-        json_metadata_array=json_metadata_array)
+        json_metadata_array=json_metadata_array,
+        journal=journal)
 
     if as_frames:
         print(f'The import of {len(files_to_upload)} files have just started, '
@@ -317,11 +331,11 @@ def describe_project(api_key: Optional[str],
     metadata = get_project_metadata(projects[0], kili.auth.client.endpoint)
     dataset_metrics, quality_metrics = get_project_metrics(projects[0])
 
-    print(tabulate(metadata, tablefmt='plain'), end='\n'*2)
+    print(tabulate.tabulate(metadata, tablefmt='plain'), end='\n'*2)
     print('Dataset KPIs', end='\n'+'-'*len('Dataset KPIs')+'\n')
-    print(tabulate(dataset_metrics, tablefmt='plain'), end='\n'*2)
+    print(tabulate.tabulate(dataset_metrics, tablefmt='plain'), end='\n'*2)
     print('Quality KPIs', end='\n'+'-'*len('Quality KPIs')+'\n')
-    print(tabulate(quality_metrics, tablefmt='plain'))
+    print(tabulate.tabulate(quality_metrics, tablefmt='plain'))
 
 
 @project.command(name='label')
@@ -396,16 +410,11 @@ def import_labels(
         print(f"{len(external_id_array)} labels have been successfully imported")
 
     else:
-        for row in row_dict:
-            external_id = row['external_id']
-            path = row['json_response_path']
-            with open(path, encoding='utf-8') as label_file:
-                json_response = json.load(label_file)
-
-            kili.append_to_labels(
-                label_asset_external_id=external_id,
-                json_response=json_response,
-                project_id=project_id)
+        kili.append_many_labels(
+            label_asset_external_id_array=[row['external_id'] for row in row_dict],
+            json_response_array=read_json_files(
+                [row['json_response_path'] for row in row_dict]),
+            project_id=project_id)
         print(f"{len(row_dict)} labels have been successfully imported")
 
 
@@ -1,7 +1,10 @@
 """
 This script permits to initialize the Kili Python SDK client.
 """
+from typing import Callable, List, Union
+import inspect
 import os
+import types
 
 from kili.exceptions import NotFound, AuthenticationFailed
 from kili.mutations.api_key import MutationsApiKey
@@ -28,6 +31,10 @@ from kili.subscriptions.label import SubscriptionsLabel
 
 
 from kili.authentication import KiliAuth
+from kili.graphql_client import DEFAULT_POOL_MAXSIZE
+from kili.helpers import shallow_typechecked
+from kili.utils.fan_out import fan_out_calls, tagged_dataframe
+from kili.utils.query_cache import QueryCache
 
 
 class Kili(  # pylint: disable=too-many-ancestors
@@ -57,7 +64,12 @@ class Kili(  # pylint: disable=too-many-ancestors
 
     def __init__(self, api_key=None,
                  api_endpoint=None,
-                 verify=True):
+                 verify=True,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 compress_requests=False,
+                 query_cache=None,
+                 production_mode=False):
+        # pylint: disable=too-many-arguments
         """
         Args:
             api_key: User API key generated
@@ -69,6 +81,23 @@ class Kili(  # pylint: disable=too-many-ancestors
                 If not passed, default to Kili SaaS:
                 'https://cloud.kili-technology.com/api/label/v2/graphql'
             verify: Verify certificate. Set to False on local deployment without SSL.
+            pool_maxsize: Maximum number of HTTP connections kept alive to the endpoint.
+                Should be at least the number of threads sharing the client.
+            compress_requests: If `True`, request bodies larger than 1kB are gzipped.
+                Useful when uploading large payloads over a slow network.
+            query_cache: If `True`, or a `QueryCache` configured with its size and times to live,
+                the results of queries are cached and identical queries are answered without
+                calling the API. Mutations sent by this client evict the results they may change.
+                Hits and misses are counted in `kili.auth.client.query_cache`.
+            production_mode: If `True`, the compatibility of the methods with the endpoint is
+                checked once here instead of at each call, deprecation wrappers are skipped and
+                arguments are only checked to be of the right type, not their elements.
+                Speeds up calls with long lists of ids or many small calls.
+
+        !!! info "Startup cache"
+            If the `KILI_CACHE_DIR` environment variable is set, the user attached to the API key
+            and the creation date of the key are cached in this directory for an hour, so that
+            creating a client in a short-lived process does not call the API.
 
         Returns:
             Object container your API session
@@ -87,9 +116,13 @@ class Kili(  # pylint: disable=too-many-ancestors
 
         if api_key is None:
             raise AuthenticationFailed(api_key, api_endpoint)
+        if query_cache is True:
+            query_cache = QueryCache()
         try:
             self.auth = KiliAuth(
-                api_key=api_key, api_endpoint=api_endpoint, verify=verify)
+                api_key=api_key, api_endpoint=api_endpoint, verify=verify,
+                pool_maxsize=pool_maxsize, compress_requests=compress_requests,
+                query_cache=query_cache or None)
             super().__init__(self.auth)
         except Exception as exception:  # pylint: disable=W0703
             exception_str = str(exception)
@@ -97,6 +130,62 @@ class Kili(  # pylint: disable=too-many-ancestors
                 raise AuthenticationFailed(
                     api_key, api_endpoint) from exception
             raise exception
+        if production_mode:
+            self._bind_undecorated_resolvers()
+
+    def _bind_undecorated_resolvers(self):
+        """
+        Shadow the decorated public methods compatible with the endpoint by their undecorated
+        version, with a shallow check of the types of their arguments
+        """
+        endpoint = self.auth.client.endpoint
+        for name, method in inspect.getmembers(type(self), inspect.isfunction):
+            if name.startswith('_') or not hasattr(method, '__wrapped__'):
+                continue
+            compatibility = getattr(method, 'compatibility', None)
+            if compatibility is not None and not compatibility.client_is_compatible(endpoint):
+                continue
+            setattr(self, name, types.MethodType(shallow_typechecked(inspect.unwrap(method)), self))
+
+    def fan_out(self, query: Union[str, Callable], project_ids: List[str],
+                max_workers: int = DEFAULT_POOL_MAXSIZE, as_dataframe: bool = False, **kwargs):
+        """Run the same query over several projects concurrently.
+
+        The calls share the HTTP connections and the rate limit of the client,
+        so that a report over many projects takes the time of the slowest
+        projects rather than the sum of all of them.
+
+        Args:
+            query: Name of a method of the client taking a `project_id` argument,
+                such as `'assets'` or `'count_labels'`, or a function taking a project id.
+            project_ids: Identifiers of the projects
+            max_workers: Number of queries running at the same time.
+                Should not exceed the `pool_maxsize` of the client.
+            as_dataframe: If `True`, the results are concatenated in a DataFrame,
+                with a `projectId` column.
+            kwargs: Arguments of the method named by `query`, other than `project_id`
+
+        Returns:
+            A generator of `(project_id, result)` pairs, in the order in which
+                the queries complete, or a DataFrame if `as_dataframe` is `True`.
+
+        Examples:
+            >>> for project_id, assets in kili.fan_out('assets', project_ids, fields=['id']):
+                    print(project_id, len(assets))
+            >>> labels = kili.fan_out('labels', project_ids, as_dataframe=True,
+                                      fields=['author.email', 'createdAt'])
+        """
+        if isinstance(query, str):
+            method = getattr(self, query)
+            if 'disable_tqdm' in inspect.signature(method).parameters:
+                # progress bars of concurrent queries would overwrite each other
+                kwargs.setdefault('disable_tqdm', True)
+
+            def call_method(project_id):
+                return method(project_id=project_id, **kwargs)
+            query = call_method
+        results = fan_out_calls(query, project_ids, max_workers)
+        return tagged_dataframe(results) if as_dataframe else results
 
     def get_project(self, project_id: str) -> Project:
         """Return a project object corresponding to the project_id given.
@@ -33,4 +33,16 @@ mime_extensions_for_IV2 = {
 }
 
 MUTATION_BATCH_SIZE = 100
-THROTTLING_DELAY = 60/250
+MUTATION_BATCH_MAX_BYTES = 10 * 2**20
+MAX_CALLS_PER_MINUTE = 250
+BASE64_CHUNK_SIZE = 3 * 2**18
+JSON_INTERFACE_CACHE_SIZE = 256
+JSON_INTERFACE_CACHE_MAX_AGE = 10
+JSON_INTERFACE_DOWNLOAD_WORKERS = 8
+QUERY_CACHE_SIZE = 1024
+QUERY_CACHE_TTL = 60
+AUTH_CACHE_TTL = 3600
+PAGINATION_COUNT_TTL = 10
+LABEL_FILE_READ_WORKERS = 8
+EXTERNAL_ID_INDEX_TTL = 60
+EXTERNAL_ID_LOOKUP_BATCH_SIZE = 100
@@ -44,10 +44,31 @@ class GraphQLError(Exception):
     Used when the GraphQL call returns an error
     """
 
-    def __init__(self, mutation, error, batch_number=None):
-        if batch_number is None:
+    def __init__(self, mutation, error, batch_number=None, data=None, offset=None):
+        self.batch_number = batch_number
+        self.errors = error
+        # results of the parts of the request which succeeded, by field or alias
+        self.data = data
+        # index of the first object of the failed batch
+        self.offset = offset
+        if offset is not None:
             super().__init__(
-                f'Mutation "{mutation}" failed with error: "{error}"')
+                f'Mutation "{mutation}" failed from index {offset} with error: "{error}"')
+        elif batch_number is not None:
+            super().__init__(
+                f'Mutation "{mutation}" failed in batch {batch_number} with error: "{error}"')
         else:
             super().__init__(
-                f'Mutation "{mutation}" failed from index {100*batch_number} with error: "{error}"')
+                f'Mutation "{mutation}" failed with error: "{error}"')
+
+
+class BatchMutationError(Exception):
+    """
+    Used when some batches of a paginated mutation fail while the others succeed
+    """
+
+    def __init__(self, results, errors):
+        self.results = results
+        self.errors = errors
+        super().__init__(
+            f'{len(errors)} batch(es) failed: ' + '; '.join(str(error) for error in errors))
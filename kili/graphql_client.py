@@ -3,29 +3,104 @@ GraphQL Client
 """
 
 from datetime import datetime
+import gzip
 import json
 import random
 import string
 import threading
 import time
-import websocket
 
-from six.moves import urllib
+import requests
+from urllib3.exceptions import ConnectTimeoutError
 
 from . import __version__
+from .utils.json_decoder import loads
+from .utils.lazy_import import LazyModule
+from .utils.pagination import clear_recent_counts
+from .utils.query_cache import is_mutation
+from .utils.rate_limiter import get_rate_limiter
+
+websocket = LazyModule('websocket')
+
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 10
+MAX_RETRIES = 20
+COMPRESSION_THRESHOLD = 1024
+
+
+def create_session(pool_connections=DEFAULT_POOL_CONNECTIONS,
+                   pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                   max_retries=MAX_RETRIES):
+    """
+    Create a requests session keeping its connections alive in a pool
+
+    Args:
+        pool_connections: number of hosts for which connections are pooled
+        pool_maxsize: maximum number of connections kept alive per host.
+            Should be at least the number of threads sharing the session.
+        max_retries: number of retries on connection errors
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections,
+                                            pool_maxsize=pool_maxsize,
+                                            max_retries=max_retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Accept-Encoding': 'gzip, deflate',
+                            'Connection': 'keep-alive'})
+    return session
+
+
+def retry_after(response, default=1.):
+    """
+    Return the number of seconds to wait before retrying, read from the Retry-After header
+
+    Args:
+        response: the response of the API
+        default: delay used when the header is missing or is a date
+    """
+    try:
+        return float(response.headers.get('Retry-After', default))
+    except ValueError:
+        return default
+
+
+def is_connection_failure(error):
+    """
+    Whether a connection error happened before the request was sent, so that the server
+    cannot have processed it
+
+    Args:
+        error: the requests.exceptions.ConnectionError raised when posting
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    # NewConnectionError subclasses ConnectTimeoutError
+    return isinstance(reason, ConnectTimeoutError)
 
 
 class GraphQLClient:
     """
     A simple GraphQL client
     """
+    # pylint: disable=too-many-arguments,too-many-instance-attributes
 
-    def __init__(self, endpoint, session=None, verify=True):
+    def __init__(self, endpoint, session=None, verify=True,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, compress_requests=False,
+                 rate_limiter=None, query_cache=None):
         self.endpoint = endpoint
+        self.query_cache = query_cache
+        self.rate_limiter = rate_limiter if rate_limiter is not None \
+            else get_rate_limiter(endpoint)
         self.headername = None
+        if session is None:
+            session = create_session(pool_maxsize=pool_maxsize)
         self.session = session
+        self.session.verify = verify
         self.token = None
         self.verify = verify
+        self.compress_requests = compress_requests
 
     def execute(self, query, variables=None):
         """
@@ -35,7 +110,21 @@ class GraphQLClient:
             query
             variables
         """
-        return self._send(query, variables)
+        if is_mutation(query):
+            try:
+                return self._send(query, variables)
+            finally:
+                clear_recent_counts()
+                if self.query_cache is not None:
+                    self.query_cache.invalidate(query)
+        if self.query_cache is None:
+            return self._send(query, variables)
+        result = self.query_cache.get(query, variables)
+        if result is None:
+            result = self._send(query, variables)
+            if 'errors' not in result:
+                self.query_cache.put(query, variables, result)
+        return result
 
     def inject_token(self, token, headername='Authorization'):
         """Inject a token.
@@ -47,6 +136,26 @@ class GraphQLClient:
         self.token = token
         self.headername = headername
 
+    def close(self):
+        """
+        Close the connections of the pool
+        """
+        self.session.close()
+
+    def _build_body(self, data, headers):
+        """
+        Serialize the payload, gzipping it if compression is enabled
+
+        Args:
+            data: payload of the request
+            headers: headers of the request, updated in place
+        """
+        body = json.dumps(data).encode('utf-8')
+        if self.compress_requests and len(body) > COMPRESSION_THRESHOLD:
+            body = gzip.compress(body, compresslevel=1)
+            headers['Content-Encoding'] = 'gzip'
+        return body
+
     def _send(self, query, variables):
         """
         Send the query
@@ -63,34 +172,46 @@ class GraphQLClient:
         if self.token is not None:
             headers[self.headername] = f'{self.token}'
 
-        if self.session is not None:
-            try:
-                number_of_trials = 10
-                for _ in range(number_of_trials):
-                    self.session.verify = self.verify
-                    req = self.session.post(self.endpoint, json.dumps(
-                        data).encode('utf-8'), headers=headers)
-                    if req.status_code == 200 and 'errors' not in req.json():
-                        break
-                    if req.status_code == 401:
-                        raise Exception("Invalid API KEY")
-                    time.sleep(1)
-                return req.json()
-            except Exception as exception:
-                if req is not None:
-                    raise Exception(req.content) from exception
-                raise exception
-
-        req = urllib.request.Request(
-            self.endpoint, json.dumps(data).encode('utf-8'), headers)
+        body = self._build_body(data, headers)
+        # a mutation may have been applied when the server received it, so it is
+        # only sent again when it was rejected by the rate limit or never sent
+        retry_on_errors = not is_mutation(query)
+        req = None
         try:
-            with urllib.request.urlopen(req) as response:
-                str_json = response.read().decode('utf-8')
-                return json.loads(str_json)
-        except urllib.error.HTTPError as error:
-            print((error.read()))
-            print('')
-            raise error
+            number_of_trials = 10
+            for trial in range(number_of_trials):
+                self.rate_limiter.acquire()
+                try:
+                    req = self.session.post(self.endpoint, body, headers=headers,
+                                            verify=self.verify)
+                except requests.exceptions.ConnectionError as error:
+                    if trial == number_of_trials - 1 or \
+                            not (retry_on_errors or is_connection_failure(error)):
+                        raise
+                    time.sleep(1)
+                    continue
+                if req.status_code == 401:
+                    raise Exception("Invalid API KEY")
+                if req.status_code >= 500 and not retry_on_errors:
+                    raise Exception(f'Mutation failed with status {req.status_code}, '
+                                    'it may have been partially applied')
+                if req.status_code == 429 or req.status_code >= 500:
+                    self.rate_limiter.on_throttled()
+                    time.sleep(retry_after(req))
+                    continue
+                if req.status_code == 200:
+                    self.rate_limiter.on_success()
+                    result = loads(req.content)
+                    if 'errors' not in result or not retry_on_errors:
+                        return result
+                elif not retry_on_errors:
+                    break
+                time.sleep(1)
+            return loads(req.content)
+        except Exception as exception:
+            if req is not None:
+                raise Exception(req.content) from exception
+            raise exception
 
 
 GQL_WS_SUBPROTOCOL = "graphql-ws"
@@ -2,18 +2,44 @@
 Helpers for GraphQL Queries and Mutations
 """
 
-from typing import Optional
+from typing import Any, List, Optional, Union, get_origin, get_type_hints
 import base64
 import functools
-from json import dumps, loads
+import inspect
+import os
+from json import dumps
 import re
 import warnings
 import mimetypes
-import pyparsing as pp
-
-import requests
 
+from kili.constants import BASE64_CHUNK_SIZE
 from kili.exceptions import EndpointCompatibilityError, GraphQLError
+from kili.utils.external_id_index import get_external_id_index
+from kili.utils.interface_cache import get_json_interface_cache
+from kili.utils.json_decoder import loads
+from kili.utils.lazy_import import LazyModule
+
+pp = LazyModule('pyparsing')
+
+JSON_FIELDS = ('jsonInterface', 'jsonMetadata', 'jsonResponse')
+
+
+@functools.lru_cache(maxsize=None)
+def endpoint_version(endpoint: str) -> Optional[str]:
+    """
+    Version of the Kili API of an endpoint, v1 or v2, or None if it cannot be told
+
+    Args:
+        endpoint: the Kili API endpoint
+    """
+    version = None
+    address_matched = re.search(r':400\d+/', endpoint)
+    version_matched = re.search(r'\/v\d+/', endpoint)
+    if address_matched:
+        version = 'v1' if address_matched.group() == ':4000/' else 'v2'
+    if version_matched:
+        version = 'v1' if version_matched.group() == '/v1/' else 'v2'
+    return version
 
 
 class Compatible():
@@ -24,8 +50,6 @@ class Compatible():
     # pylint: disable=dangerous-default-value
     def __init__(self, endpoints=['v1']):
         self.endpoints = endpoints
-        self.version_extractor = re.compile(r'\/v\d+/')
-        self.address_extractor = re.compile(r':400\d+/')
 
     def client_is_compatible(self, endpoint: str):
         """
@@ -34,15 +58,8 @@ class Compatible():
         Args:
             endpoint: the Kili API endpoint
         """
-        version_matched = self.version_extractor.search(endpoint)
-        address_matched = self.address_extractor.search(endpoint)
-        if not version_matched and not address_matched:
-            return False
-        if address_matched:
-            version = 'v1' if address_matched.group() == ':4000/' else 'v2'
-        if version_matched:
-            version = 'v1' if version_matched.group() == '/v1/' else 'v2'
-        return version in self.endpoints
+        version = endpoint_version(endpoint)
+        return version is not None and version in self.endpoints
 
     def __call__(self, resolver, *args, **kwargs):
         @functools.wraps(resolver)
@@ -57,25 +74,86 @@ class Compatible():
                 return resolver(*args, **kwargs)
             raise EndpointCompatibilityError(
                 resolver.__name__, client_endpoint)
+        checked_resolver.compatibility = self
         return checked_resolver
 
 
-def format_result(name, result, _object=None):
+def outer_types(hint) -> Optional[tuple]:
+    """
+    Classes that a value annotated with a type hint is an instance of,
+    without looking at its elements, or None if they cannot be told.
+    For example `Optional[List[str]]` gives `(list, NoneType)`.
+
+    Args:
+        hint: a type hint
+    """
+    if hint is Any:
+        return None
+    origin = get_origin(hint)
+    if origin is Union:
+        types = [outer_types(argument) for argument in hint.__args__]
+        if any(type_ is None for type_ in types):
+            return None
+        return tuple(type_ for union_types in types for type_ in union_types)
+    if isinstance(origin, type):
+        return (origin,)
+    if isinstance(hint, type):
+        return (float, int) if hint is float else (hint,)
+    return None
+
+
+def shallow_typechecked(resolver):
+    """
+    Decorator checking the type of the arguments of a resolver, but not the type of their
+    elements. Much cheaper than typeguard on long lists, it is used by the production mode.
+
+    Args:
+        resolver: the undecorated resolver
+    """
+    try:
+        hints = get_type_hints(resolver)
+    except Exception:  # pylint: disable=broad-except
+        return resolver
+    parameter_names = list(inspect.signature(resolver).parameters)
+    expected_types = {name: outer_types(hint) for name, hint in hints.items()
+                      if name != 'return' and outer_types(hint) is not None}
+
+    def check(name, value):
+        if name in expected_types and not isinstance(value, expected_types[name]):
+            raise TypeError(
+                f'type of argument "{name}" must be one of '
+                f'{[type_.__name__ for type_ in expected_types[name]]};'
+                f' got {type(value).__name__} instead')
+
+    @functools.wraps(resolver)
+    def checked_resolver(*args, **kwargs):
+        for name, value in zip(parameter_names, args):
+            check(name, value)
+        for name, value in kwargs.items():
+            check(name, value)
+        return resolver(*args, **kwargs)
+    return checked_resolver
+
+
+def format_result(name, result, _object=None, decode_json=True):
     """
     Formats the result of the GraphQL queries.
 
     Args:
         name: name of the field to extract, usually data
         result: query result to parse
+        decode_json: if False, jsonInterface, jsonMetadata and jsonResponse
+            are returned as the raw strings sent by the API
     """
     if 'errors' in result:
         raise GraphQLError(name, result['errors'])
-    formatted_json = format_json(result['data'][name])
     if _object is None:
-        return formatted_json
-    if isinstance(formatted_json, list):
-        return [_object(element) for element in formatted_json]
-    return _object(formatted_json)
+        return format_json(result['data'][name], decode_json)
+    # ORM records decode their json fields when they are first read
+    data = result['data'][name]
+    if isinstance(data, list):
+        return [_object(element, decode_json=decode_json) for element in data]
+    return _object(data, decode_json=decode_json)
 
 
 def content_escape(content):
@@ -99,17 +177,35 @@ def get_data_type(path):
     return mime_type if mime_type else ''
 
 
-def encode_base64(path):
+def encode_base64(path, chunk_size=BASE64_CHUNK_SIZE):
     """
     Encode a file in base 64
 
+    The file is read and encoded by chunks, so that its raw bytes are never
+    held in memory next to the encoded string.
+
     Args:
         path: path of the file
+        chunk_size: number of bytes read at once, must be a multiple of 3
     """
     data_type = get_data_type(path)
-    with open(path, 'rb') as image_file:
-        return f'data:{data_type};base64,' + \
-            base64.b64encode(image_file.read()).decode('ascii')
+    encoded = bytearray(f'data:{data_type};base64,'.encode('ascii'))
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            encoded += base64.b64encode(chunk)
+    return encoded.decode('ascii')
+
+
+def base64_size(path):
+    """
+    Size in bytes of the base 64 encoding of a file, as returned by encode_base64,
+    computed without reading the file
+
+    Args:
+        path: path of the file
+    """
+    prefix = f'data:{get_data_type(path)};base64,'
+    return len(prefix) + 4 * -(-os.path.getsize(path) // 3)
 
 
 def is_url(path):
@@ -122,84 +218,123 @@ def is_url(path):
     return isinstance(path, str) and re.match(r'^(http://|https://)', path.lower())
 
 
-def format_json_dict(result):
+def decode_json_field(key, value, project_id=None):
+    """
+    Decodes the value of a jsonInterface, jsonMetadata or jsonResponse field
+
+    Args:
+        key: name of the field
+        value: value of the field sent by the API
+        project_id: identifier of the project a jsonInterface URL belongs to, used to cache it
+    """
+    if (value == '' or value is None) \
+            and not (is_url(value) and key == 'jsonInterface'):
+        return {}
+    if isinstance(value, str):
+        try:
+            if is_url(value):
+                return get_json_interface_cache().get(value, project_id)
+            return loads(value)
+        except Exception as exception:
+            raise ValueError(
+                'Json Metadata / json response /'
+                ' json interface should be valid jsons') from exception
+    return value
+
+
+def format_json_dict(result, decode_json=True):
     """
     Formats the dict part of a json return by a GraphQL query into a python object
 
     Args:
         result: result of a GraphQL query
+        decode_json: if False, the json fields are left as strings
     """
     for key, value in result.items():
-        if key in ['jsonInterface', 'jsonMetadata', 'jsonResponse']:
-            if (value == '' or value is None) \
-                    and not (is_url(value) and key == 'jsonInterface'):
-                result[key] = {}
-            elif isinstance(value, str):
-                try:
-                    if is_url(value):
-                        result[key] = requests.get(value).json()
-                    else:
-                        result[key] = loads(value)
-                except Exception as exception:
-                    raise ValueError(
-                        'Json Metadata / json response /'
-                        ' json interface should be valid jsons') from exception
+        if key in JSON_FIELDS:
+            if decode_json:
+                result[key] = decode_json_field(key, value, result.get('id'))
         else:
-            result[key] = format_json(value)
+            result[key] = format_json(value, decode_json)
     return result
 
 
-def format_json(result):
+def format_json(result, decode_json=True):
     """
     Formats the json return by a GraphQL query into a python object
 
     Args:
         result: result of a GraphQL query
+        decode_json: if False, the json fields are left as strings
     """
     if result is None:
         return result
     if isinstance(result, list):
-        return [format_json(elem) for elem in result]
+        if decode_json:
+            get_json_interface_cache().prefetch(
+                (elem['jsonInterface'], elem.get('id')) for elem in result
+                if isinstance(elem, dict) and is_url(elem.get('jsonInterface')))
+        return [format_json(elem, decode_json) for elem in result]
     if isinstance(result, dict):
-        return format_json_dict(result)
+        return format_json_dict(result, decode_json)
     return result
 
 
-def fragment_builder(fields, type_of_fields):
+@functools.lru_cache(maxsize=None)
+def schema_index(type_of_fields):
     """
-    Builds a GraphQL fragment for a list of fields to query
+    Index of the fields of a type of kili.types, mapped to the type of their subfields,
+    or to None for scalar fields
 
     Args:
-        fields
-        type_of_fields
+        type_of_fields: a class of kili.types
     """
+    index = {}
+    for field in dir(type_of_fields):
+        if field.startswith('__'):
+            continue
+        value = getattr(type_of_fields, field)
+        index[field] = value if isinstance(value, type) else None
+    return index
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_fragment(fields, type_of_fields):
+    index = schema_index(type_of_fields)
     fragment = ''
     subfields = [field.split('.', 1) for field in fields if '.' in field]
-    if subfields:
-        for subquery in {subfield[0] for subfield in subfields}:
-            type_of_fields_subquery = getattr(type_of_fields, subquery)
-            try:
-                if issubclass(type_of_fields_subquery, object):
-                    fields_subquery = [subfield[1]
-                                       for subfield in subfields if subfield[0] == subquery]
-                    new_fragment = fragment_builder(
-                        fields_subquery, type_of_fields_subquery)
-                    fragment += f' {subquery}{{{new_fragment}}}'
-            except ValueError:
-                print(f'{subquery} must be a valid subquery field')
-        fields = [field for field in fields if '.' not in field]
+    for subquery in dict.fromkeys(subfield[0] for subfield in subfields):
+        if index.get(subquery) is None:
+            raise AttributeError(
+                f'{subquery} must be a valid subquery field of {type_of_fields.__name__}')
+        fields_subquery = tuple(subfield[1] for subfield in subfields if subfield[0] == subquery)
+        fragment += f' {subquery}{{{_build_fragment(fields_subquery, index[subquery])}}}'
     for field in fields:
-        try:
-            getattr(type_of_fields, field)
-        except ValueError:
-            print(f'{field} must be an instance of {type_of_fields}')
-        if isinstance(field, str):
-            fragment += f' {field}'
-        else:
-            raise Exception('Please provide the fields to query as strings')
+        if '.' in field:
+            continue
+        if field not in index:
+            raise AttributeError(f'{field} must be a field of {type_of_fields.__name__}')
+        fragment += f' {field}'
     return fragment
 
 
+def fragment_builder(fields, type_of_fields):
+    """
+    Builds a GraphQL fragment for a list of fields to query
+
+    Fragments are cached by fields and type, and the fields are validated
+    against the index of the type, so that building the query of each page is cheap.
+
+    Args:
+        fields
+        type_of_fields
+    """
+    fields = tuple(fields)
+    if not all(isinstance(field, str) for field in fields):
+        raise Exception('Please provide the fields to query as strings')
+    return _build_fragment(fields, type_of_fields)
+
+
 def deprecate(
         msg: Optional[str] = None,
         removed_in: Optional[str] = None,
@@ -301,16 +436,27 @@ def infer_id_from_external_id(kili, asset_id: str, external_id: str, project_id:
             'Either provide asset_id or external_id and project_id')
     if asset_id is not None:
         return asset_id
-    assets = kili.assets(
-        external_id_contains=[external_id], project_id=project_id, fields=['id'], disable_tqdm=True)
-    if len(assets) == 0:
-        raise Exception(
-            f'No asset found with external ID "{external_id}"')
-    if len(assets) > 1:
+    return get_external_id_index(kili, project_id).resolve([external_id])[0]
+
+
+def infer_ids_from_external_ids(kili, asset_id_array: Optional[List[str]],
+                                external_id_array: Optional[List[str]],
+                                project_id: str) -> List[str]:
+    """
+    Infer asset ids from external ids, with the external id index of the project
+    kept by the client, which looks up missing external ids by batches
+
+    Args:
+        asset_id_array: asset ids
+        external_id_array: external ids
+        project_id: project id
+    """
+    if asset_id_array is None and external_id_array is None:
         raise Exception(
-            f'Several assets found containing external ID "{external_id}":'
-            f' {assets}. Please, use asset ID instead.')
-    return assets[0]['id']
+            'Either provide asset_id_array or external_id_array and project_id')
+    if asset_id_array is not None:
+        return asset_id_array
+    return get_external_id_index(kili, project_id).resolve(external_id_array)
 
 
 def validate_category_search_query(query):
@@ -0,0 +1,277 @@
+"""
+Local mirror of the assets and labels of a project, kept up to date by delta syncs
+"""
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Generator, List, Optional, Union
+import json
+import sqlite3
+import threading
+
+from .orm import Asset, Label
+
+MIRROR_BATCH_SIZE = 1000
+# seconds subtracted from the start of a sync to get the watermark of the next one,
+# covering the clock skew with the API and the assets updated during the sync
+MIRROR_WATERMARK_MARGIN = 60
+
+MIRROR_ASSET_FIELDS = ['content', 'createdAt', 'externalId', 'id', 'isHoneypot',
+                       'jsonMetadata', 'skipped', 'status', 'updatedAt']
+MIRROR_LABEL_FIELDS = ['author.email', 'author.id', 'createdAt', 'id', 'isLatestLabelForUser',
+                       'jsonResponse', 'labelType', 'secondsToLabel', 'skipped']
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS assets (
+    id TEXT PRIMARY KEY,
+    external_id TEXT,
+    status TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS assets_created_at ON assets (created_at, id);
+CREATE INDEX IF NOT EXISTS assets_external_id ON assets (external_id);
+CREATE TABLE IF NOT EXISTS labels (
+    id TEXT PRIMARY KEY,
+    asset_id TEXT NOT NULL,
+    author_id TEXT,
+    label_type TEXT,
+    created_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS labels_asset_id ON labels (asset_id, created_at);
+CREATE TABLE IF NOT EXISTS sync (
+    project_id TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at TEXT
+);
+'''
+
+
+def batches(rows, batch_size: int):
+    """
+    Split an iterable in lists of batch_size rows
+    """
+    rows = iter(rows)
+    return iter(lambda: list(islice(rows, batch_size)), [])
+
+
+class ProjectMirror:
+    """
+    Copy of the assets of a project and of their labels in a local SQLite file.
+
+    `sync` only downloads the assets updated since the previous sync, using the
+    `updated_at_gte` filter of `kili.assets`, and records the date it started,
+    minus a safety margin, as the watermark of the next sync. Assets deleted in Kili
+    are detected by comparing the number of assets, then removed from the mirror.
+    `assets` and `labels` answer queries from the local file, without calling Kili.
+    """
+    # pylint: disable=too-many-arguments
+
+    def __init__(self, kili, project_id: str, path: str,
+                 asset_fields: Optional[List[str]] = None,
+                 label_fields: Optional[List[str]] = None):
+        """
+        Args:
+            kili: Kili client used to sync the mirror
+            project_id: Identifier of the project
+            path: Path of the SQLite file. It is created if it does not exist.
+            asset_fields: Fields of the assets to mirror.
+                `id`, `createdAt` and `updatedAt` are always mirrored.
+            label_fields: Fields of the labels to mirror.
+                `id` and `createdAt` are always mirrored.
+
+        Examples:
+            >>> mirror = ProjectMirror(kili, project_id, 'project.db')
+            >>> mirror.sync()
+            >>> assets = mirror.assets(status_in=['LABELED'])
+        """
+        self.kili = kili
+        self.project_id = project_id
+        self.asset_fields = sorted(set(asset_fields or MIRROR_ASSET_FIELDS)
+                                   | {'createdAt', 'id', 'updatedAt'})
+        self.label_fields = sorted(set(label_fields or MIRROR_LABEL_FIELDS)
+                                   | {'createdAt', 'id'})
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    @property
+    def watermark(self) -> Optional[str]:
+        """
+        Update date from which the next sync requests the assets
+        """
+        row = self.connection.execute(
+            'SELECT watermark FROM sync WHERE project_id = ?', (self.project_id,)).fetchone()
+        return row[0] if row else None
+
+    def sync(self, full: bool = False) -> int:
+        """
+        Download the assets updated since the last sync, with their labels,
+        and return their number
+
+        Args:
+            full: If `True`, download all the assets again
+        """
+        # assets updated while the pages are read may be missed by this sync,
+        # so the next one starts from the beginning of this one
+        started_at = datetime.now(timezone.utc) - timedelta(seconds=MIRROR_WATERMARK_MARGIN)
+        watermark = None if full else self.watermark
+        fields = self.asset_fields + [f'labels.{field}' for field in self.label_fields]
+        assets = self.kili.assets(project_id=self.project_id, fields=fields,
+                                  updated_at_gte=watermark, as_generator=True,
+                                  decode_json=False)
+        number_of_assets = 0
+        with self._lock:
+            for batch in batches(assets, MIRROR_BATCH_SIZE):
+                with self.connection:
+                    for asset in batch:
+                        self._write(asset)
+                number_of_assets += len(batch)
+            with self.connection:
+                self._remove_deleted_assets(full)
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO sync VALUES (?, ?, ?)',
+                    (self.project_id,
+                     started_at.isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+                     datetime.now(timezone.utc).isoformat()))
+        return number_of_assets
+
+    def assets(self,
+               asset_id_in: Optional[List[str]] = None,
+               external_id_contains: Optional[List[str]] = None,
+               status_in: Optional[List[str]] = None,
+               skip: int = 0,
+               first: Optional[int] = None,
+               as_generator: bool = False) -> Union[List[Asset], Generator[Asset, None, None]]:
+        """
+        Get the mirrored assets with their labels, ordered by creation date
+
+        Args:
+            asset_id_in: Returned assets have an id that belongs to that list, if given.
+            external_id_contains: Returned assets have an external id that belongs to that list,
+                if given.
+            status_in: Returned assets have a status that belongs to that list, if given.
+            skip: Number of assets to skip
+            first: Maximum number of assets to return
+            as_generator: If `True`, a generator on the assets is returned.
+        """
+        where, parameters = self._where({'id': asset_id_in, 'external_id': external_id_contains,
+                                         'status': status_in})
+        rows = self._select(
+            f'SELECT id, data FROM assets {where} ORDER BY created_at, id', parameters, skip, first)
+        asset_generator = (asset for batch in batches(rows, MIRROR_BATCH_SIZE)
+                           for asset in self._with_labels(batch))
+        if as_generator:
+            return asset_generator
+        return list(asset_generator)
+
+    def labels(self,
+               asset_id: Optional[str] = None,
+               author_in: Optional[List[str]] = None,
+               type_in: Optional[List[str]] = None,
+               skip: int = 0,
+               first: Optional[int] = None,
+               as_generator: bool = False) -> Union[List[Label], Generator[Label, None, None]]:
+        """
+        Get the mirrored labels, ordered by creation date
+
+        Args:
+            asset_id: Identifier of the asset of the labels, if given.
+            author_in: Returned labels have an author id that belongs to that list, if given.
+            type_in: Returned labels have a type that belongs to that list, if given.
+            skip: Number of labels to skip
+            first: Maximum number of labels to return
+            as_generator: If `True`, a generator on the labels is returned.
+        """
+        where, parameters = self._where({'asset_id': asset_id and [asset_id],
+                                         'author_id': author_in, 'label_type': type_in})
+        rows = self._select(
+            f'SELECT data FROM labels {where} ORDER BY created_at, id', parameters, skip, first)
+        label_generator = (Label(json.loads(data)) for data, in rows)
+        if as_generator:
+            return label_generator
+        return list(label_generator)
+
+    def count_assets(self) -> int:
+        """
+        Number of mirrored assets
+        """
+        return self.connection.execute('SELECT COUNT(*) FROM assets').fetchone()[0]
+
+    def close(self):
+        """
+        Close the SQLite file
+        """
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _write(self, asset):
+        """
+        Replace an asset and its labels
+        """
+        asset = dict(asset)
+        labels = [dict(label) for label in asset.pop('labels', None) or []]
+        self.connection.execute(
+            'INSERT OR REPLACE INTO assets VALUES (?, ?, ?, ?, ?, ?)',
+            (asset['id'], asset.get('externalId'), asset.get('status'), asset.get('createdAt'),
+             asset.get('updatedAt'), json.dumps(asset)))
+        self.connection.execute('DELETE FROM labels WHERE asset_id = ?', (asset['id'],))
+        self.connection.executemany(
+            'INSERT OR REPLACE INTO labels VALUES (?, ?, ?, ?, ?, ?)',
+            [(label['id'], asset['id'], (label.get('author') or {}).get('id'),
+              label.get('labelType'), label.get('createdAt'), json.dumps(label))
+             for label in labels])
+
+    def _remove_deleted_assets(self, full: bool):
+        """
+        Remove the assets deleted in Kili, when Kili and the mirror count different numbers
+        of assets, or after a full sync
+        """
+        if not full and self.kili.count_assets(project_id=self.project_id) == self.count_assets():
+            return
+        asset_ids = self.kili.assets(project_id=self.project_id, fields=['id'],
+                                     as_generator=True)
+        self.connection.execute('CREATE TEMPORARY TABLE kili_assets (id TEXT PRIMARY KEY)')
+        try:
+            self.connection.executemany('INSERT OR IGNORE INTO kili_assets VALUES (?)',
+                                        ((asset['id'],) for asset in asset_ids))
+            self.connection.execute(
+                'DELETE FROM labels WHERE asset_id NOT IN (SELECT id FROM kili_assets)')
+            self.connection.execute(
+                'DELETE FROM assets WHERE id NOT IN (SELECT id FROM kili_assets)')
+        finally:
+            self.connection.execute('DROP TABLE kili_assets')
+
+    @staticmethod
+    def _where(filters):
+        conditions, parameters = [], []
+        for column, values in filters.items():
+            if values is not None:
+                conditions.append(f'{column} IN ({", ".join("?" * len(values))})')
+                parameters.extend(values)
+        return ('WHERE ' + ' AND '.join(conditions) if conditions else ''), parameters
+
+    def _select(self, query, parameters, skip, first):
+        return self.connection.execute(f'{query} LIMIT ? OFFSET ?',
+                                       parameters + [-1 if first is None else first, skip])
+
+    def _with_labels(self, rows):
+        """
+        Asset records of a batch of rows, with their labels
+        """
+        labels = {}
+        label_rows = self.connection.execute(
+            f'SELECT asset_id, data FROM labels WHERE asset_id IN ({", ".join("?" * len(rows))})'
+            ' ORDER BY created_at, id', [asset_id for asset_id, _ in rows])
+        for asset_id, data in label_rows:
+            labels.setdefault(asset_id, []).append(json.loads(data))
+        for asset_id, data in rows:
+            asset = json.loads(data)
+            asset['labels'] = labels.get(asset_id, [])
+            yield Asset(asset)
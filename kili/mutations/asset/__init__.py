@@ -14,8 +14,10 @@ from .queries import (GQL_ADD_ALL_LABELED_ASSETS_TO_REVIEW,
                       GQL_UPDATE_PROPERTIES_IN_ASSETS)
 from .helpers import (process_append_many_to_dataset_parameters,
                       process_update_properties_in_assets_parameters)
-from ...constants import NO_ACCESS_RIGHT
+from ...constants import MUTATION_BATCH_MAX_BYTES, MUTATION_BATCH_SIZE, NO_ACCESS_RIGHT
 from ...orm import Asset, AssetStatus
+from ...utils.external_id_index import clear_external_id_indexes
+from ...utils.journal import ImportJournal
 from ...utils.pagination import _mutate_from_paginated_call
 
 
@@ -43,7 +45,11 @@ class MutationsAsset:
             is_honeypot_array: Optional[List[bool]] = None,
             status_array: Optional[List[str]] = None,
             json_content_array: Optional[List[List[Union[dict, str]]]] = None,
-            json_metadata_array: Optional[List[dict]] = None):
+            json_metadata_array: Optional[List[dict]] = None,
+            max_workers: int = 1,
+            max_batch_size: int = MUTATION_BATCH_SIZE,
+            max_batch_bytes: Optional[int] = MUTATION_BATCH_MAX_BYTES,
+            journal: Optional[str] = None):
         # pylint: disable=line-too-long
         """Append assets to a project.
 
@@ -75,9 +81,23 @@ class MutationsAsset:
                     Example for one asset: `json_metadata_array = [{'imageUrl': '','text': '','url': ''}]`.
                 - For video, you can specify a value with key 'processingParameters' to specify the sampling rate (default: 30).
                     Example for one asset: `json_metadata_array = [{'processingParameters': {'framesPlayedPerSecond': 10}}]`.
+            max_workers: Number of batches sent concurrently to Kili.
+                If some batches fail, the others still go through and a
+                `BatchMutationError` listing the failed batches is raised.
+            max_batch_size: Maximal number of assets sent in one call to Kili.
+            max_batch_bytes: Maximal estimated size in bytes of the payload of one call,
+                local files being counted with their base64 size. Batches are cut at
+                whichever of `max_batch_size` and `max_batch_bytes` is reached first.
+                A single asset larger than the budget is sent alone. Set to None to
+                only batch by number of assets.
+            journal: Path to a local file recording the external ids of the batches
+                successfully imported. When the import is run again with the same journal,
+                the assets already imported are skipped before being read or sent.
+                Requires `external_id_array`.
 
         Returns:
             A result object which indicates if the mutation was successful, or an error message.
+                None if all the assets were already imported according to the journal.
 
         Examples:
             >>> kili.append_many_to_dataset(
@@ -95,6 +115,26 @@ class MutationsAsset:
         projects = kili.projects(project_id, disable_tqdm=True)
         assert len(projects) == 1, NO_ACCESS_RIGHT
         input_type = projects[0]['inputType']
+        on_batch_success = None
+        if journal is not None:
+            if external_id_array is None:
+                raise ValueError('external_id_array is required to resume an import with a journal')
+            import_journal = ImportJournal(journal)
+            completed_external_ids = import_journal.completed_external_ids(project_id)
+            indices_to_import = [i for i, external_id in enumerate(external_id_array)
+                                 if external_id not in completed_external_ids]
+            if not indices_to_import:
+                return None
+            if len(indices_to_import) < len(external_id_array):
+                (content_array, external_id_array, is_honeypot_array, status_array,
+                 json_content_array, json_metadata_array) = (
+                    None if array is None else [array[i] for i in indices_to_import]
+                    for array in (content_array, external_id_array, is_honeypot_array,
+                                  status_array, json_content_array, json_metadata_array))
+
+            def record_batch(batch):
+                import_journal.record(project_id, batch['external_id_array'])
+            on_batch_success = record_batch
         properties_to_batch, upload_type, request = process_append_many_to_dataset_parameters(input_type,
                                                                                               content_array,
                                                                                               external_id_array,
@@ -122,7 +162,8 @@ class MutationsAsset:
             }
 
         results = _mutate_from_paginated_call(
-            self, properties_to_batch, generate_variables, request)
+            self, properties_to_batch, generate_variables, request, batch_size=max_batch_size,
+            max_workers=max_workers, max_bytes=max_batch_bytes, on_batch_success=on_batch_success)
         return format_result('data', results[0], Asset)
 
     @Compatible(['v2'])
@@ -140,7 +181,11 @@ class MutationsAsset:
                                     json_contents: Optional[List[str]] = None,
                                     status_array: Optional[List[str]] = None,
                                     is_used_for_consensus_array: Optional[List[bool]] = None,
-                                    is_honeypot_array: Optional[List[bool]] = None) -> List[dict]:
+                                    is_honeypot_array: Optional[List[bool]] = None,
+                                    max_workers: int = 1,
+                                    max_batch_size: int = MUTATION_BATCH_SIZE,
+                                    max_batch_bytes: Optional[int] = MUTATION_BATCH_MAX_BYTES
+                                    ) -> List[dict]:
         """Update the properties of one or more assets.
 
         Args:
@@ -165,6 +210,15 @@ class MutationsAsset:
             status_array: Each element should be in `TODO`, `ONGOING`, `LABELED`, `REVIEWED`
             is_used_for_consensus_array: Whether to use the asset to compute consensus kpis or not
             is_honeypot_array: Whether to use the asset for honeypot
+            max_workers: Number of batches sent concurrently to Kili.
+                If some batches fail, the others still go through and a
+                `BatchMutationError` listing the failed batches is raised.
+            max_batch_size: Maximal number of assets sent in one call to Kili.
+            max_batch_bytes: Maximal estimated size in bytes of the payload of one call,
+                local files being counted with their base64 size. Batches are cut at
+                whichever of `max_batch_size` and `max_batch_bytes` is reached first.
+                A single asset larger than the budget is sent alone. Set to None to
+                only batch by number of assets.
 
         Returns:
             A result object which indicates if the mutation was successful,
@@ -226,19 +280,28 @@ class MutationsAsset:
                 'dataArray': data_array
             }
 
-        results = _mutate_from_paginated_call(
-            self, properties_to_batch, generate_variables, GQL_UPDATE_PROPERTIES_IN_ASSETS)
+        try:
+            results = _mutate_from_paginated_call(
+                self, properties_to_batch, generate_variables, GQL_UPDATE_PROPERTIES_IN_ASSETS,
+                batch_size=max_batch_size, max_workers=max_workers, max_bytes=max_batch_bytes)
+        finally:
+            if external_ids is not None:
+                # renamed assets must not be resolved from their former external ids
+                clear_external_id_indexes(self)
         formated_results = [format_result(
             'data', result, Asset) for result in results]
         return [item for batch_list in formated_results for item in batch_list]
 
     @Compatible(['v1', 'v2'])
     @typechecked
-    def delete_many_from_dataset(self, asset_ids: List[str]):
+    def delete_many_from_dataset(self, asset_ids: List[str], max_workers: int = 1):
         """Delete assets from a project.
 
         Args:
             asset_ids: The list of identifiers of the assets to delete.
+            max_workers: Number of batches sent concurrently to Kili.
+                If some batches fail, the others still go through and a
+                `BatchMutationError` listing the failed batches is raised.
 
         Returns:
             A result object which indicates if the mutation was successful,
@@ -249,10 +312,15 @@ class MutationsAsset:
         def generate_variables(batch):
             return {'where': {'idIn': batch['asset_ids']}}
 
-        results = _mutate_from_paginated_call(self,
-                                              properties_to_batch,
-                                              generate_variables,
-                                              GQL_DELETE_MANY_FROM_DATASET)
+        try:
+            results = _mutate_from_paginated_call(self,
+                                                  properties_to_batch,
+                                                  generate_variables,
+                                                  GQL_DELETE_MANY_FROM_DATASET,
+                                                  max_workers=max_workers)
+        finally:
+            # deleted assets must not be resolved from their external ids anymore
+            clear_external_id_indexes(self)
         return format_result('data', results[0], Asset)
 
     @Compatible(['v1', 'v2'])
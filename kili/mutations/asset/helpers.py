@@ -1,21 +1,68 @@
 """
 Helpers for the asset mutations
 """
+from collections.abc import Sequence
 import csv
 import os
 from json import dumps
 from uuid import uuid4
-from typing import List, Optional, Tuple, Union
+from typing import Callable, List, Optional, Set, Tuple, Union
 import glob
 import mimetypes
 
 from ...constants import mime_extensions_for_IV2
-from ...helpers import (convert_to_list_of_none, encode_base64, format_metadata,
+from ...helpers import (base64_size, convert_to_list_of_none, encode_base64, format_metadata,
                         get_data_type, is_none_or_empty, is_url)
 from .queries import (GQL_APPEND_MANY_TO_DATASET,
                       GQL_APPEND_MANY_FRAMES_TO_DATASET)
 
 
+class LazilyProcessedArray(Sequence):
+    """
+    Array whose elements are processed only when they are read, for instance when
+    a batch is sliced out of it, so that only one batch of processed elements
+    (e.g. base64-encoded files) is held in memory at once
+    """
+
+    def __init__(self, array: list, process: Callable, indices_to_process: Set[int],
+                 estimate_size: Callable):
+        self.array = array
+        self.process = process
+        self.indices_to_process = indices_to_process
+        self.estimate_size = estimate_size
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = range(len(self))[index]
+        element = self.array[index]
+        return self.process(element) if index in self.indices_to_process else element
+
+    def estimate_sizes(self) -> List[int]:
+        """
+        Size in bytes of each processed element, without processing it
+        """
+        return [self.estimate_size(element) if i in self.indices_to_process
+                else len(dumps(element))
+                for i, element in enumerate(self.array)]
+
+
+def check_local_file(content, input_type) -> bool:
+    """
+    Return True if the content is a local file to be encoded, False if the content
+    cannot be uploaded to a project of this type.
+    Raise if the file does not exist, before any batch is uploaded.
+    """
+    if not check_file_mime_type(content, input_type):
+        return False
+    if not os.path.isfile(content):
+        raise FileNotFoundError(f'No such file: {content}')
+    return True
+
+
 def encode_object_if_not_url(content, input_type):
     """
     Return the object if it is a url, else it should be a path to a file.
@@ -40,6 +87,14 @@ def process_frame_json_content(json_content):
     return dumps(dict(zip(json_content_index, json_content_urls)))
 
 
+def estimate_frame_json_content_size(json_content):
+    """
+    Estimate the size of a processed json_content of FRAME projects
+    """
+    return sum(len(content) if is_url(content) else base64_size(content)
+               for content in json_content)
+
+
 def get_file_mimetype(content_array: Union[List[str], None],
                       json_content_array: Union[List[str], None]) -> Union[str, None]:
     """
@@ -68,7 +123,15 @@ def process_json_content(input_type: str,
     if json_content_array is None:
         return [''] * len(content_array)
     if input_type == 'FRAME':
-        return list(map(process_frame_json_content, json_content_array))
+        indices_to_process = set()
+        for i, json_content in enumerate(json_content_array):
+            if not is_url(json_content):
+                for content in json_content:
+                    if not is_url(content):
+                        check_local_file(content, 'IMAGE')
+                indices_to_process.add(i)
+        return LazilyProcessedArray(json_content_array, process_frame_json_content,
+                                    indices_to_process, estimate_frame_json_content_size)
     return [element if is_url(element) else dumps(element) for element in json_content_array]
 
 
@@ -77,17 +140,26 @@ def process_content(input_type: str,
                     json_content_array: Union[List[List[Union[dict, str]]], None]):
     """
     Process the array of contents
+
+    Local files are checked right away but only encoded in base64 batch by batch,
+    when the batches are sliced out of the returned array.
     """
-    if input_type in ['IMAGE', 'PDF']:
-        return [content if is_url(content)
-                else (content
-                      if (json_content_array is not None and json_content_array[i] is not None)
-                      else (encode_base64(content) if check_file_mime_type(content, input_type)
-                            else None))
-                for i, content in enumerate(content_array)]
-    if input_type == 'FRAME' and json_content_array is None:
-        content_array = [encode_object_if_not_url(
-            content, input_type) for content in content_array]
+    if input_type in ['IMAGE', 'PDF'] or (input_type == 'FRAME' and json_content_array is None):
+        processed_content_array = []
+        indices_to_encode = set()
+        for i, content in enumerate(content_array):
+            if is_url(content) or (json_content_array is not None
+                                   and json_content_array[i] is not None):
+                processed_content_array.append(content)
+            elif check_local_file(content, input_type):
+                processed_content_array.append(content)
+                indices_to_encode.add(i)
+            else:
+                processed_content_array.append(None)
+        if not indices_to_encode:
+            return processed_content_array
+        return LazilyProcessedArray(processed_content_array, encode_base64,
+                                    indices_to_encode, base64_size)
     if input_type == 'TIME_SERIES':
         content_array = list(map(process_time_series, content_array))
     return content_array
@@ -8,10 +8,12 @@ import warnings
 from typeguard import typechecked
 
 
-from ...helpers import Compatible, format_result, infer_id_from_external_id
+from ...constants import MUTATION_BATCH_MAX_BYTES
+from ...helpers import (Compatible, format_result, infer_id_from_external_id,
+                        infer_ids_from_external_ids)
 from .queries import (GQL_APPEND_TO_LABELS, GQL_CREATE_HONEYPOT,
                       GQL_CREATE_PREDICTIONS,
-                      GQL_UPDATE_PROPERTIES_IN_LABEL)
+                      GQL_UPDATE_PROPERTIES_IN_LABEL, gql_append_many_to_labels)
 from ...orm import Label
 from ...utils.pagination import _mutate_from_paginated_call
 
@@ -35,7 +37,8 @@ class MutationsLabel:
             project_id: str,
             external_id_array: List[str],
             model_name_array: List[str],
-            json_response_array: List[dict]):
+            json_response_array: List[dict],
+            max_workers: int = 1):
         # pylint: disable=line-too-long
         """Create predictions for specific assets.
 
@@ -45,6 +48,9 @@ class MutationsLabel:
             model_name_array: In case you want to precise from which model the label originated
             json_response_array: The predictions are given here. For examples,
                 see [the recipe](https://github.com/kili-technology/kili-python-sdk/blob/master/recipes/import_predictions.ipynb).
+            max_workers: Number of batches of 100 sent concurrently to Kili.
+                If some batches fail, the others still go through and a
+                `BatchMutationError` listing the failed batches is raised.
 
         Returns:
             A result object which indicates if the mutation was successful, or an error message.
@@ -71,7 +77,8 @@ class MutationsLabel:
             }
 
         results = _mutate_from_paginated_call(
-            self, properties_to_batch, generate_variables, GQL_CREATE_PREDICTIONS)
+            self, properties_to_batch, generate_variables, GQL_CREATE_PREDICTIONS,
+            max_workers=max_workers)
         return format_result('data', results[0], Label)
 
     @Compatible(['v1', 'v2'])
@@ -120,6 +127,84 @@ class MutationsLabel:
         result = self.auth.client.execute(GQL_APPEND_TO_LABELS, variables)
         return format_result('data', result, Label)
 
+    @Compatible(['v1', 'v2'])
+    @typechecked
+    def append_many_labels(self, json_response_array: List[dict],
+                           label_asset_id_array: Optional[List[str]] = None,
+                           label_asset_external_id_array: Optional[List[str]] = None,
+                           project_id: Optional[str] = None, author_id: Optional[str] = None,
+                           label_type: str = 'DEFAULT',
+                           seconds_to_label_array: Optional[List[int]] = None,
+                           skipped_array: Optional[List[bool]] = None,
+                           max_workers: int = 1):
+        # pylint: disable=line-too-long
+        """Append labels to several assets.
+
+        External ids are resolved with a few bulk queries, and labels are sent
+        by batches of 100 mutations in a single request, instead of one query
+        and one request per label as with `append_to_labels`.
+
+        Args:
+            json_response_array: Labels are given here
+            label_asset_id_array: Identifiers of the assets
+            label_asset_external_id_array: External identifiers of the assets
+            project_id: Identifier of the project
+            author_id: ID of the author of the labels
+            label_type: Can be one of `AUTOSAVE`, `DEFAULT`, `PREDICTION` or `REVIEW`
+            seconds_to_label_array: Time to create each label
+            skipped_array: Describe if each label is skipped or not
+            max_workers: Number of batches sent concurrently to Kili.
+                If some batches fail, the others still go through and a
+                `BatchMutationError` listing the failed batches is raised.
+
+        !!! warning
+            Either provide `label_asset_id_array` or `label_asset_external_id_array` and `project_id`
+
+        !!! warning
+            A batch is never sent twice, since some of its labels may already be created.
+            If Kili rejects labels of a batch, a `GraphQLError` is raised: its `data` holds
+            the labels created in the batch, by alias `data0`, `data1`..., and its `errors`
+            give the alias of each rejected label in their `path`.
+
+        Returns:
+            The created labels.
+
+        Examples:
+            >>> kili.append_many_labels(label_asset_id_array=[asset_id], json_response_array=[{...}])
+        """
+        label_asset_id_array = infer_ids_from_external_ids(
+            self, label_asset_id_array, label_asset_external_id_array, project_id)
+        assert len(label_asset_id_array) == len(
+            json_response_array), "IDs list and labels list should have the same length"
+        if author_id is None:
+            author_id = self.auth.user_id
+        number_of_labels = len(label_asset_id_array)
+        properties_to_batch = {
+            'label_asset_id_array': label_asset_id_array,
+            'json_response_array': json_response_array,
+            'seconds_to_label_array': seconds_to_label_array or [0] * number_of_labels,
+            'skipped_array': skipped_array or [False] * number_of_labels}
+
+        def generate_variables(batch):
+            variables = {}
+            for i, (asset_id, json_response, seconds_to_label, skipped) in enumerate(zip(
+                    batch['label_asset_id_array'], batch['json_response_array'],
+                    batch['seconds_to_label_array'], batch['skipped_array'])):
+                variables[f'data{i}'] = {'authorID': author_id,
+                                         'jsonResponse': dumps(json_response),
+                                         'labelType': label_type,
+                                         'secondsToLabel': seconds_to_label,
+                                         'skipped': skipped}
+                variables[f'where{i}'] = {'id': asset_id}
+            return variables
+
+        results = _mutate_from_paginated_call(
+            self, properties_to_batch, generate_variables,
+            lambda batch: gql_append_many_to_labels(len(batch['label_asset_id_array'])),
+            max_workers=max_workers, max_bytes=MUTATION_BATCH_MAX_BYTES)
+        return [format_result(name, result, Label)
+                for result in results for name in result['data']]
+
     @Compatible(['v1', 'v2'])
     @typechecked
     def update_properties_in_label(self,
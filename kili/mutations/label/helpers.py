@@ -1,11 +1,14 @@
 """
 Helpers for the label mutations
 """
+from concurrent.futures import ThreadPoolExecutor
 import json
 from typing import List
 from os import PathLike
 import csv
 
+from kili.constants import LABEL_FILE_READ_WORKERS
+
 
 def read_import_label_csv(csv_path: PathLike) -> dict:
     """
@@ -24,6 +27,23 @@ def read_import_label_csv(csv_path: PathLike) -> dict:
     return row_dict
 
 
+def read_json_files(paths: List[PathLike],
+                    max_workers: int = LABEL_FILE_READ_WORKERS) -> List[dict]:
+    """
+    Read json files concurrently, and return their contents in the order of the paths
+    Args:
+        paths: paths to the json files to read
+        max_workers: number of files read at once
+    """
+    def read_json_file(path):
+        with open(path, encoding='utf-8') as json_file:
+            return json.load(json_file)
+    if len(paths) < 2:
+        return [read_json_file(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(read_json_file, paths))
+
+
 def generate_create_predictions_arguments(
         label_paths: List[PathLike],
         external_id_array: List[str],
@@ -39,12 +59,7 @@ def generate_create_predictions_arguments(
         model_name: the model name
         project_id: Project ID
     """
-    json_response_array = []
-    for path in label_paths:
-        with open(path, encoding='utf-8') as label_file:
-            json_response = json.load(label_file)
-            json_response_array.append(json_response)
     return {'project_id': project_id,
-            'json_response_array': json_response_array,
+            'json_response_array': read_json_files(label_paths),
             'model_name_array': [model_name]*len(external_id_array),
             'external_id_array': external_id_array}
@@ -2,6 +2,8 @@
 Queries of label mutations
 """
 
+import functools
+
 from .fragments import LABEL_FRAGMENT, LABEL_FRAGMENT_ID
 
 GQL_CREATE_PREDICTIONS = f'''
@@ -32,6 +34,28 @@ mutation(
 }}
 '''
 
+@functools.lru_cache(maxsize=1024)
+def gql_append_many_to_labels(number_of_labels):
+    """
+    Return the GraphQL mutation appending several labels at once,
+    with one aliased appendToLabels per label
+    """
+    declarations = '\n'.join(f'    $data{i}: AppendToLabelsData!\n    $where{i}: AssetWhere!'
+                             for i in range(number_of_labels))
+    mutations = '\n'.join(f'''  data{i}: appendToLabels(
+    data: $data{i}
+    where: $where{i}
+  ) {{
+      {LABEL_FRAGMENT_ID}
+  }}''' for i in range(number_of_labels))
+    return f'''
+mutation(
+{declarations}
+) {{
+{mutations}
+}}
+'''
+
 
 GQL_UPDATE_PROPERTIES_IN_LABEL = f'''
 mutation(
@@ -2,17 +2,150 @@
 This script defines object-relational mapping helpers to ease
  the manipulation of Kili data structures.
 """
+from collections import namedtuple
 from dataclasses import dataclass
+import functools
+from typing import Dict, List, Tuple
+
+from .helpers import JSON_FIELDS, decode_json_field
 
 
 class DictClass(dict):
     """
     A python class that acts like dict
+
+    Its keys can also be read as attributes. The json fields (jsonResponse,
+    jsonMetadata, jsonInterface) are kept as sent by the API and decoded the
+    first time they are read, so that records only pay for what is used.
+    Nested dicts are records as well.
     """
 
-    def __init__(self, *args, **kwargs):
+    __slots__ = ('_pending_json_fields',)
+    _nested_classes = {}
+
+    def __init__(self, *args, decode_json=True, **kwargs):
         super().__init__(*args, **kwargs)
-        self.__dict__ = self
+        self._pending_json_fields = set()
+        for key, value in dict.items(self):
+            if key in JSON_FIELDS:
+                if decode_json and (value is None or isinstance(value, str)):
+                    self._pending_json_fields.add(key)
+            else:
+                nested_class = self._nested_classes.get(key, DictClass)
+                if isinstance(value, dict) and not isinstance(value, DictClass):
+                    dict.__setitem__(self, key, nested_class(value, decode_json=decode_json))
+                elif isinstance(value, list):
+                    dict.__setitem__(self, key, [
+                        nested_class(element, decode_json=decode_json)
+                        if isinstance(element, dict) and not isinstance(element, DictClass)
+                        else element for element in value])
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if key in self._pending_json_fields:
+            value = decode_json_field(key, value, dict.get(self, 'id'))
+            dict.__setitem__(self, key, value)
+            self._pending_json_fields.discard(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._pending_json_fields.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __getattr__(self, name):
+        if name in DictClass.__slots__:
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError as exception:
+            raise AttributeError(name) from exception
+
+    def __setattr__(self, name, value):
+        if name in DictClass.__slots__:
+            super().__setattr__(name, value)
+        else:
+            self[name] = value
+
+    def __delattr__(self, name):
+        try:
+            del self[name]
+        except KeyError as exception:
+            raise AttributeError(name) from exception
+
+    def _decode_all(self):
+        for key in list(self._pending_json_fields):
+            self[key]  # pylint: disable=pointless-statement
+
+    # Overriding __iter__ makes dict(record) and {**record} read the values
+    # through __getitem__ instead of copying the raw storage
+    def __iter__(self):
+        return dict.__iter__(self)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def items(self):
+        self._decode_all()
+        return dict.items(self)
+
+    def values(self):
+        self._decode_all()
+        return dict.values(self)
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __or__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        result = self.copy()
+        result.update(other)
+        return result
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        self._decode_all()
+        return dict.popitem(self)
+
+    def copy(self):
+        self._decode_all()
+        return dict.copy(self)
+
+    def __eq__(self, other):
+        self._decode_all()
+        if isinstance(other, DictClass):
+            other._decode_all()  # pylint: disable=protected-access
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        self._decode_all()
+        return dict.__repr__(self)
+
+    def __reduce_ex__(self, protocol):
+        self._decode_all()
+        return (self.__class__, (dict(dict.items(self)),))
 
 
 @dataclass
@@ -144,7 +277,7 @@ class Label(DictClass):
     Label class
     """
 
-    jsonResponse = {}
+    __slots__ = ()
 
     def json_response(self, _format=AnnotationFormat.Raw):
         """
@@ -185,14 +318,114 @@ class Asset(DictClass):
     Asset class
     """
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        if 'labels' in self:
-            labels = []
-            for label in self['labels']:
-                labels.append(Label(label))
-            self.labels = labels
-        if 'latestLabel' in self:
-            latest_label = self['latestLabel']
-            if latest_label is not None:
-                self.latestLabel = Label(latest_label) # pylint: disable=invalid-name
+    __slots__ = ()
+    _nested_classes = {'labels': Label, 'latestLabel': Label}
+
+
+class CompactRecord(tuple):
+    """
+    Read-only record stored as a tuple, built for a given list of fields
+
+    Values can be read by key (`record['id']`) or by attribute (`record.id`).
+    A record costs a few bytes per field instead of a whole hash table,
+    which matters when millions of rows are kept in memory.
+    Iterating a record yields its values, like a namedtuple.
+    """
+
+    __slots__ = ()
+    # set by compact_record_class
+    _fields: Tuple[str, ...]
+    _index: Dict[str, int]
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                key = self._index[key]
+            except KeyError as exception:
+                raise KeyError(key) from exception
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        """Value of the key, or default if the field was not requested"""
+        return self[key] if key in self._index else default
+
+    def keys(self):
+        """Names of the fields"""
+        return self._fields
+
+    def values(self):
+        """Values of the fields"""
+        return tuple(self)
+
+    def items(self):
+        """Pairs of field names and values"""
+        return zip(self._fields, self)
+
+    def to_dict(self):
+        """Convert the record, and its nested records, to dicts"""
+        return {key: to_dict(value) for key, value in self.items()}
+
+
+def to_dict(value):
+    """
+    Convert compact records, possibly nested in lists, to dicts
+
+    Args:
+        value: a compact record, a list or any other value
+    """
+    if isinstance(value, CompactRecord):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [to_dict(element) for element in value]
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def compact_record_class(fields: Tuple[str, ...]) -> type:
+    """
+    Build the class of the compact records holding these top-level fields
+
+    Args:
+        fields: names of the fields, valid python identifiers
+    """
+    return type('Record', (CompactRecord, namedtuple('Record', fields)), {
+        '__slots__': (),
+        '_index': {field: index for index, field in enumerate(fields)},
+    })
+
+
+def fields_tree(fields: List[str]) -> dict:
+    """
+    Group the fields of a query by parent field, e.g.
+    ['id', 'author.email'] gives {'id': {}, 'author': {'email': {}}}
+
+    Args:
+        fields: the fields of the query
+    """
+    tree = {}
+    for field in fields:
+        node = tree
+        for key in field.split('.'):
+            node = node.setdefault(key, {})
+    return tree
+
+
+def compact_record(row: dict, tree: dict):
+    """
+    Convert a formatted row of a query result to a compact record
+
+    Args:
+        row: the row
+        tree: the requested fields, as built by fields_tree
+    """
+    record_class = compact_record_class(tuple(tree))
+    return record_class(*(_compact_value(row.get(key), subtree)
+                          for key, subtree in tree.items()))
+
+
+def _compact_value(value, tree):
+    if not tree or value is None:
+        return value
+    if isinstance(value, list):
+        return [compact_record(element, tree) for element in value]
+    return compact_record(value, tree)
@@ -1,19 +1,25 @@
 
 """Asset queries."""
 
+import functools
 from typing import Generator, List, Optional, Union
 import warnings
 
 from typeguard import typechecked
-import pandas as pd
 
 from ...helpers import (Compatible, deprecate, format_result,
                         fragment_builder, validate_category_search_query)
 from .queries import gql_assets, GQL_ASSETS_COUNT
 from ...types import Asset as AssetType
-from ...orm import Asset
+from ...orm import Asset, compact_record, fields_tree
+from ...utils.arrow_export import arrow_schema, write_rows
+from ...utils.dataframe import (ASSET_CATEGORIES, ASSET_DTYPES, DATAFRAME_CHUNK_SIZE,
+                               dataframe_chunks)
+from ...utils.lazy_import import LazyModule
 from ...utils.pagination import row_generator_from_paginated_calls
 
+pd = LazyModule('pandas')
+
 
 class QueriesAsset:
     """
@@ -75,7 +81,11 @@ class QueriesAsset:
                updated_at_lte: Optional[str] = None,
                as_generator: bool = False,
                label_category_search: Optional[str] = None,
-               ) -> Union[List[dict], Generator[dict, None, None], pd.DataFrame]:
+               prefetch_pages: int = 0,
+               decode_json: bool = True,
+               chunk_size: int = DATAFRAME_CHUNK_SIZE,
+               ) -> Union[List[dict], Generator[dict, None, None], 'pd.DataFrame',
+                          Generator['pd.DataFrame', None, None]]:
         # pylint: disable=line-too-long
         """Get an asset list, an asset generator or a pandas DataFrame that match a set of constraints.
 
@@ -107,10 +117,22 @@ class QueriesAsset:
             skipped: Returned assets should be skipped
             updated_at_gte: Returned assets should have a label whose update date is greated or equal to this date.
             updated_at_lte: Returned assets should have a label whose update date is lower or equal to this date.
-            format: If equal to 'pandas', returns a pandas DataFrame
+            format: If equal to 'pandas', returns a pandas DataFrame.
+                If equal to 'compact', assets are returned as read-only tuple-backed records
+                holding the requested `fields`, readable by key or attribute. They take
+                several times less memory than dicts on large projects.
             disable_tqdm: If `True`, the progress bar will be disabled
             as_generator: If `True`, a generator on the assets is returned.
+                With `format='pandas'`, a generator of DataFrames of `chunk_size` assets is returned.
+                Their columns have the same explicit dtypes in every chunk: `status` is categorical,
+                `createdAt` and `updatedAt` are UTC datetimes and the marks are floats.
             label_category_search: Returned assets should have a label that follows this category search query.
+            prefetch_pages: Number of pages of 100 rows requested concurrently, ahead of the one
+                being read. Speeds up large exports when the API is slow to answer. 0 disables prefetching.
+            decode_json: If `False`, the `jsonMetadata`, `jsonResponse` and `jsonInterface` fields
+                are returned as the raw JSON strings sent by the API instead of being decoded.
+                Saves CPU time when these fields are only stored or forwarded.
+            chunk_size: Number of assets in each DataFrame, with `format='pandas'` and `as_generator=True`.
 
         !!! info "Dates format"
             Date strings should have format: "YYYY-MM-DD"
@@ -126,6 +148,8 @@ class QueriesAsset:
             >>> kili.assets(project_id, asset_id=asset_id)
             # returns a generator of the project assets
             >>> kili.assets(project_id, as_generator=True)
+            # returns a generator of DataFrames of 10000 assets
+            >>> kili.assets(project_id, format='pandas', as_generator=True, chunk_size=10000)
             ```
 
         !!! example "How to filter based on Metadata"
@@ -163,13 +187,11 @@ class QueriesAsset:
                 please iterate on your projects with .projects and concatenate the results.
                 """
             warnings.warn(message, DeprecationWarning)
-        if format == "pandas" and as_generator:
-            raise ValueError(
-                "Argument values as_generator==True and format==\"pandas\" are not compatible.")
 
         saved_args = locals()
         count_args = {k: v for (k, v) in saved_args.items()
-                      if k not in ['skip', 'first', 'disable_tqdm', 'format', 'fields', 'self', 'as_generator', 'message']}
+                      if k not in ['skip', 'first', 'disable_tqdm', 'format', 'fields', 'self', 'as_generator', 'message',
+                                   'prefetch_pages', 'decode_json', 'chunk_size']}
 
         # using tqdm with a generator is messy, so it is always disabled
         disable_tqdm = disable_tqdm or as_generator
@@ -213,12 +235,16 @@ class QueriesAsset:
             first,
             self.count_assets,
             count_args,
-            self._query_assets,
+            functools.partial(self._query_assets, decode_json=decode_json,
+                              compact=format == 'compact'),
             payload_query,
             fields,
-            disable_tqdm
+            disable_tqdm,
+            prefetch_pages
         )
 
+        if format == "pandas" and as_generator:
+            return dataframe_chunks(asset_generator, ASSET_DTYPES, ASSET_CATEGORIES, chunk_size)
         if format == "pandas":
             return pd.DataFrame(list(asset_generator))
         if as_generator:
@@ -229,14 +255,56 @@ class QueriesAsset:
                       skip: int,
                       first: int,
                       payload: dict,
-                      fields: List[str]):
+                      fields: List[str],
+                      decode_json: bool = True,
+                      compact: bool = False):
 
         payload.update({"skip": skip, "first": first})
         _gql_assets = gql_assets(fragment_builder(fields, AssetType))
         result = self.auth.client.execute(_gql_assets, payload)
-        assets = format_result('data', result, Asset)
+        if compact:
+            tree = fields_tree(fields)
+            return [compact_record(asset, tree)
+                    for asset in format_result('data', result, decode_json=decode_json)]
+        assets = format_result('data', result, Asset, decode_json)
         return assets
 
+    # pylint: disable=dangerous-default-value
+    @typechecked
+    def export_assets_as_arrow(self,
+                               project_id: str,
+                               path: str,
+                               fields: List[str] = ['content',
+                                                    'createdAt',
+                                                    'externalId',
+                                                    'id',
+                                                    'isHoneypot',
+                                                    'jsonMetadata',
+                                                    'skipped',
+                                                    'status'],
+                               file_format: str = 'parquet') -> int:
+        # pylint: disable=line-too-long
+        """Write the assets of a project to a Parquet or Feather file.
+
+        Assets are written page by page with a schema fixed by the requested fields,
+        so memory stays bounded whatever the size of the project. Json fields are
+        written as JSON strings. Requires `pyarrow`.
+
+        Args:
+            project_id: Identifier of the project
+            path: Path of the file to write
+            fields: All the fields to request among the possible fields for the assets.
+                See [the documentation](https://docs.kili-technology.com/reference/graphql-api#asset) for all possible fields.
+            file_format: `parquet` or `feather`
+
+        Returns:
+            The number of assets written.
+        """
+        schema = arrow_schema(fields)
+        assets = self.assets(project_id=project_id, fields=fields, as_generator=True,
+                             decode_json=False)
+        return write_rows(assets, path, schema, file_format)
+
     @Compatible(['v1', 'v2'])
     @typechecked
     @deprecate(removed_in="2.116")
@@ -2,7 +2,10 @@
 Queries of asset queries
 """
 
+import functools
 
+
+@functools.lru_cache(maxsize=1024)
 def gql_assets(fragment):
     """
     Return the GraphQL assets query
@@ -2,7 +2,10 @@
 Queries of issue queries
 """
 
+import functools
 
+
+@functools.lru_cache(maxsize=1024)
 def gql_issues(fragment):
     """
     Return the GraphQL issues query
@@ -1,10 +1,10 @@
 """Label queries."""
 
+import functools
 from typing import Generator, List, Optional, Union
 import warnings
 
 from typeguard import typechecked
-import pandas as pd
 
 
 from ...helpers import (Compatible, deprecate, format_result,
@@ -14,9 +14,13 @@ from ..project import QueriesProject
 from .queries import gql_labels, GQL_LABELS_COUNT
 from ...constants import NO_ACCESS_RIGHT
 from ...types import Label as LabelType
-from ...orm import Label
+from ...orm import Label, compact_record, fields_tree
+from ...utils.arrow_export import arrow_schema, label_rows, write_rows
+from ...utils.lazy_import import LazyModule
 from ...utils.pagination import row_generator_from_paginated_calls
 
+pd = LazyModule('pandas')
+
 
 class QueriesLabel:
     """Set of Label queries."""
@@ -58,6 +62,10 @@ class QueriesLabel:
                disable_tqdm: bool = False,
                as_generator: bool = False,
                category_search: Optional[str] = None,
+               prefetch_pages: int = 0,
+               keyset_pagination: bool = False,
+               decode_json: bool = True,
+               format: Optional[str] = None,  # pylint: disable=redefined-builtin
                ) -> Union[List[dict], Generator[dict, None, None]]:
         # pylint: disable=line-too-long
         """Get a label list or a label generator from a project based on a set of criteria.
@@ -85,6 +93,18 @@ class QueriesLabel:
             user_id: Identifier of the user.
             disable_tqdm: If `True`, the progress bar will be disabled
             as_generator: If `True`, a generator on the labels is returned.
+            prefetch_pages: Number of pages of 100 rows requested concurrently, ahead of the one
+                being read. Speeds up large exports when the API is slow to answer. 0 disables prefetching.
+            keyset_pagination: If `True`, each page is requested by filtering on the creation date
+                of the last label received instead of skipping the previous ones.
+                The cost of a call does not grow with the depth of the page, and labels created
+                during a long export do not shift the pages. Not compatible with `prefetch_pages`.
+            decode_json: If `False`, the `jsonMetadata` and `jsonResponse` fields
+                are returned as the raw JSON strings sent by the API instead of being decoded.
+                Saves CPU time when these fields are only stored or forwarded.
+            format: If equal to 'compact', labels are returned as read-only tuple-backed records
+                holding the requested `fields`, readable by key or attribute. They take
+                several times less memory than dicts on large projects.
 
         !!! info "Dates format"
             Date strings should have format: "YYYY-MM-DD"
@@ -138,9 +158,17 @@ class QueriesLabel:
                 'self',
                 'skip',
                 'message',
+                'prefetch_pages',
+                'keyset_pagination',
+                'decode_json',
+                'format',
             ]
         }
 
+        if keyset_pagination and prefetch_pages > 0:
+            raise ValueError(
+                "Argument values keyset_pagination==True and prefetch_pages>0 are not compatible.")
+
         # using tqdm with a generator is messy, so it is always disabled
         disable_tqdm = disable_tqdm or as_generator
 
@@ -174,15 +202,23 @@ class QueriesLabel:
             },
         }
 
+        if format == 'compact' and keyset_pagination and 'createdAt' not in fields:
+            # compact records are read-only, the cursor field cannot be removed from them
+            fields = fields + ['createdAt']
+
         labels_generator = row_generator_from_paginated_calls(
             skip,
             first,
             self.count_labels,
             count_args,
-            self._query_labels,
+            functools.partial(self._query_labels, decode_json=decode_json,
+                              compact=format == 'compact'),
             payload_query,
             fields,
-            disable_tqdm
+            disable_tqdm,
+            prefetch_pages,
+            cursor_field='createdAt' if keyset_pagination else None,
+            cursor_where_key='createdAtGte'
         )
 
         if as_generator:
@@ -193,12 +229,18 @@ class QueriesLabel:
                       skip: int,
                       first: int,
                       payload: dict,
-                      fields: List[str]):
+                      fields: List[str],
+                      decode_json: bool = True,
+                      compact: bool = False):
 
         payload.update({'skip': skip, 'first': first})
         _gql_labels = gql_labels(fragment_builder(fields, LabelType))
         result = self.auth.client.execute(_gql_labels, payload)
-        return format_result('data', result, Label)
+        if compact:
+            tree = fields_tree(fields)
+            return [compact_record(label, tree)
+                    for label in format_result('data', result, decode_json=decode_json)]
+        return format_result('data', result, Label, decode_json)
 
     # pylint: disable=dangerous-default-value
     @typechecked
@@ -214,7 +256,7 @@ class QueriesLabel:
                             ],
                             asset_fields: List[str] = [
                                 'externalId'
-                            ]) -> pd.DataFrame:
+                            ]) -> 'pd.DataFrame':
         # pylint: disable=line-too-long
         """Get the labels of a project as a pandas DataFrame.
 
@@ -238,6 +280,53 @@ class QueriesLabel:
         labels_df = pd.DataFrame(labels)
         return labels_df
 
+    # pylint: disable=dangerous-default-value
+    @typechecked
+    def export_labels_as_arrow(self,
+                               project_id: str,
+                               path: str,
+                               fields: List[str] = [
+                                   'author.email',
+                                   'author.id',
+                                   'createdAt',
+                                   'id',
+                                   'labelType',
+                                   'skipped'
+                               ],
+                               asset_fields: List[str] = [
+                                   'externalId'
+                               ],
+                               file_format: str = 'parquet') -> int:
+        # pylint: disable=line-too-long
+        """Write the labels of a project to a Parquet or Feather file.
+
+        The columns are the same as in `export_labels_as_df`, but labels are written
+        page by page with a schema fixed by the requested fields, so memory stays bounded
+        whatever the size of the project. Json fields are written as JSON strings.
+        Requires `pyarrow`.
+
+        Args:
+            project_id: Identifier of the project
+            path: Path of the file to write
+            fields: All the fields to request among the possible fields for the labels.
+                See [the documentation](https://docs.kili-technology.com/reference/graphql-api#label) for all possible fields.
+            asset_fields: All the fields to request among the possible fields for the assets.
+                See [the documentation](https://docs.kili-technology.com/reference/graphql-api#asset) for all possible fields.
+            file_format: `parquet` or `feather`
+
+        Returns:
+            The number of labels written.
+        """
+        projects = QueriesProject(self.auth).projects(project_id)
+        assert len(projects) == 1, NO_ACCESS_RIGHT
+        schema = arrow_schema(fields, {'asset_': asset_fields})
+        assets = QueriesAsset(self.auth).assets(
+            project_id=project_id,
+            fields=asset_fields + ['labels.' + field for field in fields],
+            as_generator=True,
+            decode_json=False)
+        return write_rows(label_rows(assets), path, schema, file_format)
+
     @Compatible(['v1', 'v2'])
     @typechecked
     @deprecate(removed_in="2.116")
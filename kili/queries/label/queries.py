@@ -2,7 +2,10 @@
 Queries of label queries
 """
 
+import functools
 
+
+@functools.lru_cache(maxsize=1024)
 def gql_labels(fragment):
     """
     Return the GraphQL labels query
@@ -2,7 +2,10 @@
 Queries of lock queries
 """
 
+import functools
 
+
+@functools.lru_cache(maxsize=1024)
 def gql_locks(fragment):
     """
     Return the GraphQL locks query
@@ -2,7 +2,10 @@
 Queries of notification queries
 """
 
+import functools
 
+
+@functools.lru_cache(maxsize=1024)
 def gql_notifications(fragment):
     """
     Return the GraphQL notifications query
@@ -2,7 +2,10 @@
 Queries and organization queries
 """
 
+import functools
 
+
+@functools.lru_cache(maxsize=1024)
 def gql_organizations(fragment):
     """
     Return the GraphQL organizations query
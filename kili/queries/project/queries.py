@@ -2,7 +2,10 @@
 Queries of project queries
 """
 
+import functools
 
+
+@functools.lru_cache(maxsize=1024)
 def gql_projects(fragment: str):
     """
     Return the GraphQL projects query
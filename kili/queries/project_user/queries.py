@@ -2,7 +2,10 @@
 Queries of project user queries
 """
 
+import functools
 
+
+@functools.lru_cache(maxsize=1024)
 def gql_project_users(fragment):
     """
     Return the GraphQL projectUsers query
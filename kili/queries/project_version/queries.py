@@ -2,7 +2,10 @@
 Queries of project version queries
 """
 
+import functools
 
+
+@functools.lru_cache(maxsize=1024)
 def gql_project_version(fragment):
     """
     Return the GraphQL projectVersion query
@@ -2,7 +2,10 @@
 Queries of user queries
 """
 
+import functools
 
+
+@functools.lru_cache(maxsize=1024)
 def gql_users(fragment):
     """
     Return the GraphQL users query
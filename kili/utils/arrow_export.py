@@ -0,0 +1,234 @@
+"""
+Streaming export of query results to Parquet or Feather files, with pyarrow
+"""
+from itertools import chain, islice
+import json
+from typing import Dict, Iterable, Iterator, List
+
+from kili.orm import fields_tree
+
+ARROW_EXPORT_BATCH_SIZE = 1000
+
+# Arrow types of the fields which are not strings, by field name.
+# Their `...Compute` counterparts have the same type.
+ARROW_FIELD_TYPES = {
+    'activated': 'bool_',
+    'consensusMark': 'float64',
+    'duration': 'float64',
+    'hasBeenSeen': 'bool_',
+    'honeypotMark': 'float64',
+    'inferenceMark': 'float64',
+    'isHoneypot': 'bool_',
+    'isLatestDefaultLabelForUser': 'bool_',
+    'isLatestLabelForUser': 'bool_',
+    'isLatestReviewLabelForUser': 'bool_',
+    'isToBeLabeledBy': 'bool_',
+    'isUsedForConsensus': 'bool_',
+    'issueNumber': 'int64',
+    'numberOfAnnotations': 'int64',
+    'numberOfLabeledAssets': 'int64',
+    'numberOfLabels': 'int64',
+    'numberOfValidLocks': 'int64',
+    'priority': 'int64',
+    'secondsToLabel': 'int64',
+    'skipped': 'bool_',
+    'starred': 'bool_',
+    'totalDuration': 'float64',
+    'totalSecondsToLabel': 'float64',
+}
+
+# Fields holding a list of objects
+ARROW_LIST_FIELDS = {'comments', 'issues', 'labels', 'locks', 'toBeLabeledBy'}
+
+
+def import_pyarrow():
+    """
+    Import pyarrow, which is an optional dependency of the SDK
+    """
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+    except ImportError as exception:
+        raise ImportError(
+            'Exporting to Parquet or Feather requires pyarrow: pip install pyarrow') from exception
+    return pyarrow
+
+
+def arrow_type(field: str, tree: dict):
+    """
+    Arrow type of a field of the API
+
+    Args:
+        field: name of the field
+        tree: requested subfields of the field, as built by fields_tree
+    """
+    pyarrow = import_pyarrow()
+    if not tree:
+        name = field[:-len('Compute')] if field.endswith('Compute') else field
+        return getattr(pyarrow, ARROW_FIELD_TYPES.get(name, 'string'))()
+    struct = pyarrow.struct([pyarrow.field(key, arrow_type(key, subtree))
+                             for key, subtree in tree.items()])
+    return pyarrow.list_(struct) if field in ARROW_LIST_FIELDS else struct
+
+
+def arrow_schema(fields: List[str], prefixed_fields: Dict[str, List[str]] = None):
+    """
+    Fixed Arrow schema of the rows holding these fields
+
+    Args:
+        fields: the requested fields, e.g. ['id', 'author.email']
+        prefixed_fields: other fields, stored in columns named with a prefix,
+            e.g. {'asset_': ['externalId']} gives a column asset_externalId
+    """
+    pyarrow = import_pyarrow()
+    columns = [pyarrow.field(key, arrow_type(key, subtree))
+               for key, subtree in fields_tree(fields).items()]
+    for prefix, other_fields in (prefixed_fields or {}).items():
+        columns.extend(pyarrow.field(prefix + key, arrow_type(key, subtree))
+                       for key, subtree in fields_tree(other_fields).items())
+    return pyarrow.schema(columns)
+
+
+def refine_type(declared, inferred):
+    """
+    Type of a column declared as string by default, refined with the type inferred
+    from its values when they are numbers or booleans
+
+    Args:
+        declared: the Arrow type given by arrow_schema
+        inferred: the Arrow type inferred by pyarrow from the first rows
+    """
+    pyarrow = import_pyarrow()
+    if pyarrow.types.is_struct(declared) and pyarrow.types.is_struct(inferred):
+        return pyarrow.struct([refine_field(field, inferred) for field in declared])
+    if pyarrow.types.is_list(declared) and pyarrow.types.is_list(inferred):
+        return pyarrow.list_(refine_type(declared.value_type, inferred.value_type))
+    if pyarrow.types.is_string(declared):
+        if pyarrow.types.is_boolean(inferred):
+            return pyarrow.bool_()
+        if pyarrow.types.is_integer(inferred):
+            return pyarrow.int64()
+        if pyarrow.types.is_floating(inferred):
+            return pyarrow.float64()
+    return declared
+
+
+def refine_field(field, inferred):
+    """
+    Arrow field with its type refined by the type of the same field in an inferred
+    struct or schema, if it is there
+    """
+    pyarrow = import_pyarrow()
+    if inferred.get_field_index(field.name) < 0:
+        return field
+    return pyarrow.field(field.name, refine_type(field.type, inferred.field(field.name).type))
+
+
+def infer_schema(schema, rows: List[dict]):
+    """
+    Schema of the rows, where the columns which are not in ARROW_FIELD_TYPES and
+    hold numbers or booleans in these rows are given their type instead of string
+
+    Args:
+        schema: Arrow schema of the rows, see arrow_schema
+        rows: the first rows written
+    """
+    pyarrow = import_pyarrow()
+    try:
+        inferred = pyarrow.RecordBatch.from_pylist(rows).schema
+    except (pyarrow.ArrowException, TypeError, ValueError):
+        return schema
+    return pyarrow.schema([refine_field(field, inferred) for field in schema])
+
+
+def write_rows(rows: Iterable[dict], path: str, schema, file_format: str = 'parquet',
+               batch_size: int = ARROW_EXPORT_BATCH_SIZE) -> int:
+    """
+    Write rows to a Parquet or Feather file, batch by batch, and return the number of rows
+
+    Only one batch of rows is converted at a time, so rows can be streamed
+    from a generator without holding the whole result in memory. The types of
+    the columns typed as strings by default are refined from the first batch,
+    and later values of the columns left as strings are written as strings.
+
+    Args:
+        rows: the rows, as dicts
+        path: path of the file to write
+        schema: Arrow schema of the rows, see arrow_schema
+        file_format: 'parquet' or 'feather'
+        batch_size: number of rows converted and written at once
+    """
+    pyarrow = import_pyarrow()
+    if file_format not in ('parquet', 'feather'):
+        raise ValueError(f'file_format should be parquet or feather, not {file_format}')
+    rows = iter(rows)
+    batches = iter(lambda: list(islice(rows, batch_size)), [])
+    first_batch = next(batches, [])
+    schema = infer_schema(schema, first_batch) if first_batch else schema
+    if file_format == 'parquet':
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+        writer = pyarrow.parquet.ParquetWriter(path, schema)
+    else:
+        writer = pyarrow.ipc.new_file(path, schema)
+    number_of_rows = 0
+    with writer:
+        for batch in chain([first_batch], batches):
+            writer.write_batch(record_batch(batch, schema))
+            number_of_rows += len(batch)
+    return number_of_rows
+
+
+def record_batch(rows: List[dict], schema):
+    """
+    Convert rows to an Arrow record batch. If a column typed as string, because its
+    type is unknown and it was null in the first batch, holds other values, they are
+    written as strings rather than failing the export.
+
+    Args:
+        rows: the rows, as dicts
+        schema: Arrow schema of the rows
+    """
+    pyarrow = import_pyarrow()
+    try:
+        return pyarrow.RecordBatch.from_pylist(rows, schema=schema)
+    except (pyarrow.ArrowTypeError, pyarrow.ArrowInvalid):
+        struct = pyarrow.struct(list(schema))
+        return pyarrow.RecordBatch.from_pylist([conform(row, struct) for row in rows],
+                                               schema=schema)
+
+
+def conform(value, arrow_type_of_value):
+    """
+    Value with the values of its string fields which are not strings converted to strings,
+    as json for objects and lists
+
+    Args:
+        value: a value of a row
+        arrow_type_of_value: its Arrow type
+    """
+    pyarrow = import_pyarrow()
+    if value is None:
+        return None
+    if pyarrow.types.is_string(arrow_type_of_value):
+        if isinstance(value, str):
+            return value
+        return json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+    if pyarrow.types.is_struct(arrow_type_of_value) and isinstance(value, dict):
+        return {field.name: conform(value.get(field.name), field.type)
+                for field in arrow_type_of_value}
+    if pyarrow.types.is_list(arrow_type_of_value) and isinstance(value, list):
+        return [conform(element, arrow_type_of_value.value_type) for element in value]
+    return value
+
+
+def label_rows(assets: Iterable[dict]) -> Iterator[dict]:
+    """
+    Flatten assets and their labels into one row per label,
+    the fields of the asset being prefixed with asset_
+
+    Args:
+        assets: assets holding their labels
+    """
+    for asset in assets:
+        asset_columns = {f'asset_{key}': value for key, value in asset.items() if key != 'labels'}
+        for label in asset['labels']:
+            yield {**label, **asset_columns}
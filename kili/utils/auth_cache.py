@@ -0,0 +1,65 @@
+"""
+Disk cache of the user and API key checked when a client is created
+"""
+from typing import Optional
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from kili.constants import AUTH_CACHE_TTL
+
+
+class AuthCache:
+    """
+    Cache of the user attached to an API key and of the creation date of the key,
+    stored in `cache_dir` so that the clients created by short-lived processes do not
+    call the API to check them again. Entries are keyed by a hash of the endpoint and
+    of the API key, which is never written to disk.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: float = AUTH_CACHE_TTL):
+        """
+        Args:
+            cache_dir: Directory of the cache. Defaults to the KILI_CACHE_DIR environment
+                variable. If it is not set either, nothing is cached.
+            ttl: Seconds during which a cached entry is used
+        """
+        self.cache_dir = cache_dir if cache_dir is not None else os.getenv('KILI_CACHE_DIR')
+        self.ttl = ttl
+
+    def _path(self, api_key: str, api_endpoint: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        key = hashlib.sha256(f'{api_endpoint}\n{api_key}'.encode()).hexdigest()
+        return os.path.join(self.cache_dir, f'auth-{key}.json')
+
+    def get(self, api_key: str, api_endpoint: str) -> Optional[dict]:
+        """
+        Return the cached entry of the API key, or None if it is missing or expired
+        """
+        path = self._path(api_key, api_endpoint)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get('cached_at', 0) > self.ttl:
+            return None
+        return entry
+
+    def set(self, api_key: str, api_endpoint: str, entry: dict):
+        """
+        Cache the entry of the API key
+        """
+        path = self._path(api_key, api_endpoint)
+        if path is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(file_descriptor, 'w', encoding='utf-8') as file:
+            json.dump({**entry, 'cached_at': time.time()}, file)
+        os.replace(temporary_path, path)
@@ -0,0 +1,74 @@
+"""
+Conversion of query results to pandas DataFrames, chunk by chunk
+"""
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from kili.utils.lazy_import import LazyModule
+
+pd = LazyModule('pandas')
+
+DATAFRAME_CHUNK_SIZE = 10000
+
+ASSET_STATUSES = ['TODO', 'ONGOING', 'LABELED', 'TO_REVIEW', 'REVIEWED']
+
+# Explicit dtypes of the asset columns, so that every chunk has the same ones.
+# Categorical columns are given their categories by ASSET_CATEGORIES.
+ASSET_DTYPES = {
+    'consensusMark': 'float64',
+    'createdAt': 'datetime',
+    'honeypotMark': 'float64',
+    'inferenceMark': 'float64',
+    'isHoneypot': 'boolean',
+    'isUsedForConsensus': 'boolean',
+    'numberOfValidLocks': 'Int64',
+    'priority': 'Int64',
+    'skipped': 'boolean',
+    'status': 'category',
+    'updatedAt': 'datetime',
+}
+
+ASSET_CATEGORIES = {
+    'status': ASSET_STATUSES,
+}
+
+
+def to_dataframe(rows: Iterable[dict], dtypes: Dict[str, str],
+                 categories: Optional[Dict[str, List[str]]] = None) -> 'pd.DataFrame':
+    """
+    Build a DataFrame from rows, casting the columns which have an explicit dtype
+
+    Args:
+        rows: the rows, as dicts
+        dtypes: dtypes of the columns, by column name. Other columns are inferred by pandas.
+            'datetime' parses the column as UTC dates.
+        categories: categories of the categorical columns, by column name
+    """
+    dataframe = pd.DataFrame(list(rows))
+    for column, dtype in dtypes.items():
+        if column not in dataframe:
+            continue
+        if dtype == 'datetime':
+            dataframe[column] = pd.to_datetime(dataframe[column], utc=True)
+        elif dtype == 'category' and column in (categories or {}):
+            dataframe[column] = dataframe[column].astype(pd.CategoricalDtype(categories[column]))
+        else:
+            dataframe[column] = dataframe[column].astype(dtype)
+    return dataframe
+
+
+def dataframe_chunks(rows: Iterable[dict], dtypes: Dict[str, str],
+                     categories: Optional[Dict[str, List[str]]] = None,
+                     chunk_size: int = DATAFRAME_CHUNK_SIZE) -> Iterator['pd.DataFrame']:
+    """
+    Yield DataFrames of at most chunk_size rows, all with the same dtypes
+
+    Args:
+        rows: the rows, as dicts
+        dtypes: dtypes of the columns, by column name
+        categories: categories of the categorical columns, by column name
+        chunk_size: number of rows of each DataFrame
+    """
+    rows = iter(rows)
+    for chunk in iter(lambda: list(islice(rows, chunk_size)), []):
+        yield to_dataframe(chunk, dtypes, categories)
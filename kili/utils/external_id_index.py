@@ -0,0 +1,145 @@
+"""
+In-memory index of the asset ids of a project by external id
+"""
+from typing import Dict, Iterable, List
+import threading
+import time
+
+from kili.constants import EXTERNAL_ID_INDEX_TTL, EXTERNAL_ID_LOOKUP_BATCH_SIZE
+
+
+class ExternalIdIndex:
+    """
+    Thread-safe map from the external ids of the assets of a project to their ids.
+
+    External ids missing from the index are looked up with one assets query per
+    `batch_size` external ids, and `load` indexes all the assets of the project at once,
+    so that thousands of external ids are resolved with a handful of requests.
+    The index is emptied when it is older than `ttl`, so that deleted assets
+    are eventually forgotten.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, kili, project_id: str, ttl: float = EXTERNAL_ID_INDEX_TTL,
+                 batch_size: int = EXTERNAL_ID_LOOKUP_BATCH_SIZE):
+        """
+        Args:
+            kili: Kili client used to query the assets
+            project_id: Identifier of the project
+            ttl: Seconds during which indexed ids are used without being queried again
+            batch_size: Number of external ids looked up by each query
+        """
+        self.kili = kili
+        self.project_id = project_id
+        self.ttl = ttl
+        self.batch_size = batch_size
+        self._ids: Dict[str, List[str]] = {}
+        self._is_complete = False
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def load(self):
+        """
+        Index all the assets of the project
+        """
+        assets = self.kili.assets(project_id=self.project_id, fields=['id', 'externalId'],
+                                  as_generator=True, disable_tqdm=True, prefetch_pages=4)
+        ids = {}
+        for asset in assets:
+            ids.setdefault(asset['externalId'], []).append(asset['id'])
+        with self._lock:
+            self._ids = ids
+            self._is_complete = True
+            self._updated_at = time.monotonic()
+
+    def refresh(self):
+        """
+        Query again the ids of the indexed external ids, or of the whole project
+        if it was loaded
+        """
+        with self._lock:
+            external_ids, is_complete = list(self._ids), self._is_complete
+            self._ids, self._is_complete = {}, False
+            self._updated_at = time.monotonic()
+        if is_complete:
+            self.load()
+        else:
+            self._lookup(external_ids)
+
+    def clear(self):
+        """
+        Empty the index
+        """
+        with self._lock:
+            self._ids, self._is_complete = {}, False
+            self._updated_at = time.monotonic()
+
+    def resolve(self, external_ids: Iterable[str]) -> List[str]:
+        """
+        Return the asset ids of these external ids, in the same order
+
+        Args:
+            external_ids: external ids of assets of the project
+        """
+        external_ids = list(external_ids)
+        with self._lock:
+            if time.monotonic() - self._updated_at > self.ttl:
+                self._ids, self._is_complete = {}, False
+                self._updated_at = time.monotonic()
+            missing_external_ids = [external_id for external_id in dict.fromkeys(external_ids)
+                                    if external_id not in self._ids]
+        self._lookup(missing_external_ids)
+        with self._lock:
+            ids = {external_id: self._ids.get(external_id, []) for external_id in external_ids}
+        for external_id, asset_ids in ids.items():
+            if len(asset_ids) == 0:
+                raise Exception(
+                    f'No asset found with external ID "{external_id}"')
+            if len(asset_ids) > 1:
+                raise Exception(
+                    f'Several assets found with external ID "{external_id}":'
+                    f' {asset_ids}. Please, use asset ID instead.')
+        return [ids[external_id][0] for external_id in external_ids]
+
+    def _lookup(self, external_ids: List[str]):
+        """
+        Query and index the ids of these external ids
+        """
+        for start in range(0, len(external_ids), self.batch_size):
+            assets = self.kili.assets(
+                project_id=self.project_id, fields=['id', 'externalId'],
+                external_id_contains=external_ids[start:start + self.batch_size],
+                as_generator=True, disable_tqdm=True)
+            ids = {}
+            for asset in assets:
+                ids.setdefault(asset['externalId'], []).append(asset['id'])
+            with self._lock:
+                self._ids.update(ids)
+
+
+def get_external_id_index(kili, project_id: str) -> ExternalIdIndex:
+    """
+    Return the external id index of a project kept by a Kili client
+
+    Args:
+        kili: Kili client
+        project_id: Identifier of the project
+    """
+    indexes = vars(kili).setdefault('_external_id_indexes', {})
+    if project_id not in indexes:
+        indexes.setdefault(project_id, ExternalIdIndex(kili, project_id))
+    return indexes[project_id]
+
+
+def clear_external_id_indexes(kili):
+    """
+    Empty the external id indexes kept by a Kili client, for example after assets are deleted
+
+    Args:
+        kili: Kili client
+    """
+    for index in vars(kili).get('_external_id_indexes', {}).values():
+        index.clear()
@@ -0,0 +1,67 @@
+"""
+Concurrent calls of the same query over several projects
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator, Tuple
+import types
+
+from kili.utils.lazy_import import LazyModule
+
+pd = LazyModule('pandas')
+
+
+def fan_out_calls(query: Callable[[str], Any], project_ids: Iterable[str],
+                  max_workers: int) -> Iterator[Tuple[str, Any]]:
+    """
+    Call a query for each project concurrently, and yield the pairs of project id and
+    result in the order in which the calls complete. The error of a call is raised when
+    its result is reached. Calls not started yet are cancelled if the iteration stops.
+
+    Args:
+        query: function taking a project id and returning the result of the query
+        project_ids: identifiers of the projects
+        max_workers: number of calls running at the same time
+    """
+    def call(project_id):
+        result = query(project_id)
+        # generators are consumed in the worker, not by the caller
+        return list(result) if isinstance(result, types.GeneratorType) else result
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='kili-fan-out')
+    futures = {executor.submit(call, project_id): project_id
+               for project_id in dict.fromkeys(project_ids)}
+    try:
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def tagged_dataframe(results: Iterable[Tuple[str, Any]],
+                     column: str = 'projectId') -> 'pd.DataFrame':
+    """
+    Concatenate the results of a query over several projects in a single DataFrame,
+    with a column holding the project of each row
+
+    Args:
+        results: pairs of project id and result, a list of rows, a DataFrame, a row
+            or a single value such as a count, which is stored in a `result` column
+        column: name of the column holding the project ids
+    """
+    frames = []
+    for project_id, result in results:
+        if isinstance(result, pd.DataFrame):
+            frame = result.copy()
+        elif isinstance(result, list):
+            frame = pd.DataFrame(result)
+        elif isinstance(result, dict):
+            frame = pd.DataFrame([result])
+        else:
+            frame = pd.DataFrame({'result': [result]})
+        frame.insert(0, column, project_id)
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=[column])
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,173 @@
+"""
+Cache of the json interfaces downloaded from the URLs returned by the API
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+import copy
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from kili.constants import (JSON_INTERFACE_CACHE_MAX_AGE, JSON_INTERFACE_CACHE_SIZE,
+                            JSON_INTERFACE_DOWNLOAD_WORKERS)
+from kili.graphql_client import create_session
+from kili.utils.json_decoder import loads
+
+
+class JsonInterfaceCache:
+    """
+    Thread-safe cache of json interfaces, with an in-memory LRU and an optional disk tier.
+
+    Interfaces are keyed by project and by URL without its query string, so that signed
+    URLs generated for each call still hit the cache. Cached interfaces are revalidated
+    with ETag / Last-Modified conditional requests once they are older than `max_age`.
+    Each call returns its own copy of the interface, which the caller may edit.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, maxsize: int = JSON_INTERFACE_CACHE_SIZE,
+                 max_age: float = JSON_INTERFACE_CACHE_MAX_AGE,
+                 cache_dir: Optional[str] = None,
+                 max_workers: int = JSON_INTERFACE_DOWNLOAD_WORKERS):
+        """
+        Args:
+            maxsize: Number of interfaces kept in memory.
+            max_age: Seconds during which a cached interface is used without revalidation.
+            cache_dir: Directory where interfaces are also stored, to be reused by other
+                processes. Defaults to the KILI_CACHE_DIR environment variable, if set.
+            max_workers: Number of interfaces downloaded at once by prefetch.
+        """
+        self.maxsize = maxsize
+        self.max_age = max_age
+        self.cache_dir = cache_dir if cache_dir is not None else os.getenv('KILI_CACHE_DIR')
+        self.max_workers = max_workers
+        self.session = create_session(pool_maxsize=max_workers)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(url: str, project_id: Optional[str] = None) -> str:
+        """
+        Key of an interface: its project and its URL without the query string
+        """
+        parts = urlsplit(url)
+        return f'{project_id}:{parts.netloc}{parts.path}'
+
+    def get(self, url: str, project_id: Optional[str] = None):
+        """
+        Return the json interface at this URL, from the cache if it is still valid
+
+        Args:
+            url: URL of the interface
+            project_id: Identifier of the project of the interface, if known
+        """
+        key = self.cache_key(url, project_id)
+        entry = self._read(key)
+        if entry is not None and time.monotonic() - entry['validated_at'] < self.max_age:
+            self._count(hit=True)
+            return copy.deepcopy(entry['json_interface'])
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        response = self.session.get(url, headers=headers)
+        if entry is not None and response.status_code == 304:
+            self._count(hit=True)
+            entry['validated_at'] = time.monotonic()
+            return copy.deepcopy(entry['json_interface'])
+        response.raise_for_status()
+        self._count(hit=False)
+        entry = {'etag': response.headers.get('ETag'),
+                 'last_modified': response.headers.get('Last-Modified'),
+                 'json_interface': loads(response.content),
+                 'validated_at': time.monotonic()}
+        self._write(key, entry)
+        # callers get their own copy, so that editing it does not alter the cache
+        return copy.deepcopy(entry['json_interface'])
+
+    def prefetch(self, urls: Iterable[Tuple[str, Optional[str]]]):
+        """
+        Download or revalidate several interfaces concurrently
+
+        Args:
+            urls: pairs of interface URL and project identifier
+        """
+        urls = list(dict.fromkeys(urls))
+        if len(urls) < 2:
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(lambda url: self.get(*url), urls))
+
+    def clear(self):
+        """
+        Empty the in-memory cache
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _read(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        path = self._disk_path(key)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        # entries read from disk are always revalidated
+        entry['validated_at'] = -float('inf')
+        self._remember(key, entry)
+        return entry
+
+    def _write(self, key, entry):
+        self._remember(key, entry)
+        path = self._disk_path(key)
+        if path is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(file_descriptor, 'w', encoding='utf-8') as file:
+            json.dump({k: v for k, v in entry.items() if k != 'validated_at'}, file)
+        os.replace(temporary_path, path)
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _disk_path(self, key):
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir,
+                            'json-interface-' + hashlib.sha256(key.encode()).hexdigest() + '.json')
+
+
+@functools.lru_cache(maxsize=None)
+def get_json_interface_cache() -> JsonInterfaceCache:
+    """
+    Return the json interface cache shared by the process
+    """
+    return JsonInterfaceCache()
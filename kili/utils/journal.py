@@ -0,0 +1,60 @@
+"""
+Local journal of the assets already imported, used to resume interrupted imports
+"""
+import json
+import os
+import threading
+from typing import List, Set
+
+
+class ImportJournal:
+    """
+    Append-only file recording the external ids of the batches successfully imported.
+
+    Each line is a JSON object `{"project_id": ..., "external_ids": [...]}` written
+    and flushed to disk once its batch is acknowledged by Kili. A line truncated by
+    a crash is ignored when the journal is read back, so its batch is sent again.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Path of the journal file. It is created if it does not exist.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._ends_with_truncated_line = False
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, 'rb') as file:
+                file.seek(-1, os.SEEK_END)
+                self._ends_with_truncated_line = file.read(1) != b'\n'
+
+    def completed_external_ids(self, project_id: str) -> Set[str]:
+        """
+        External ids of the assets already imported in the project
+        """
+        external_ids = set()
+        if not os.path.exists(self.path):
+            return external_ids
+        with open(self.path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get('project_id') == project_id:
+                    external_ids.update(entry['external_ids'])
+        return external_ids
+
+    def record(self, project_id: str, external_ids: List[str]):
+        """
+        Record that the assets have been imported in the project
+        """
+        line = json.dumps({'project_id': project_id, 'external_ids': external_ids})
+        with self._lock, open(self.path, 'a', encoding='utf-8') as file:
+            if self._ends_with_truncated_line:
+                file.write('\n')
+                self._ends_with_truncated_line = False
+            file.write(line + '\n')
+            file.flush()
+            os.fsync(file.fileno())
@@ -0,0 +1,33 @@
+"""
+JSON decoder used for the responses of the API, backed by orjson or ujson when installed
+"""
+import json
+
+try:
+    import orjson as _fast_json
+    JSON_BACKEND = 'orjson'
+except ImportError:
+    try:
+        import ujson as _fast_json
+        JSON_BACKEND = 'ujson'
+    except ImportError:
+        _fast_json = json
+        JSON_BACKEND = 'json'
+
+
+def loads(data):
+    """
+    Decode a JSON document given as str or bytes
+
+    The fast backends are stricter than the standard library (e.g. on NaN),
+    so documents they reject are decoded again with the standard library.
+
+    Args:
+        data: the JSON document
+    """
+    try:
+        return _fast_json.loads(data)
+    except ValueError:
+        if _fast_json is json:
+            raise
+        return json.loads(data)
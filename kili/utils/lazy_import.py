@@ -0,0 +1,26 @@
+"""
+Lazy import of the heavy dependencies, to keep `import kili` and the CLI fast to start
+"""
+import importlib
+
+
+class LazyModule:
+    """
+    Stand-in for a module, imported the first time one of its attributes is read.
+
+    Annotations referring to a lazy module must be strings, like `'pd.DataFrame'`,
+    so that they do not import it when the function is defined.
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Name of the module, e.g. `pandas`
+        """
+        self.__name = name
+
+    def __getattr__(self, attribute):
+        return getattr(importlib.import_module(self.__name), attribute)
+
+    def __repr__(self):
+        return f'<lazy module {self.__name!r}>'
@@ -1,12 +1,24 @@
 """
 Utils
 """
-from typing import Dict, List, Callable, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from json import dumps
+from operator import add
+from typing import Dict, Iterator, List, Callable, Optional, Tuple, Union
+import copy
+import threading
 import time
-from tqdm import tqdm
 
-from kili.constants import MUTATION_BATCH_SIZE, THROTTLING_DELAY
-from kili.exceptions import GraphQLError
+from kili.constants import MUTATION_BATCH_SIZE, PAGINATION_COUNT_TTL
+from kili.exceptions import BatchMutationError, GraphQLError
+from kili.utils.lazy_import import LazyModule
+
+tqdm = LazyModule('tqdm')
+
+# Counts of rows recently computed, by count method and arguments
+_recent_counts = {}
+_recent_counts_lock = threading.Lock()
 
 # pylint: disable=too-many-arguments,too-many-locals
 
@@ -20,6 +32,9 @@ def row_generator_from_paginated_calls(
     paged_call_payload: dict,
     fields: List[str],
     disable_tqdm: bool,
+    prefetch_pages: int = 0,
+    cursor_field: Optional[str] = None,
+    cursor_where_key: Optional[str] = None,
 ):
     """
     Builds a row generator from paginated calls.
@@ -33,45 +48,219 @@ def row_generator_from_paginated_calls(
         paged_call_payload: Payload for the GraphQL query.
         fields: The list of strings to retrieved.
         disable_tqdm: If `True`, disables tqdm.
+        prefetch_pages: Number of pages requested concurrently ahead of the one being consumed.
+            If 0, pages are requested one after the other.
+        cursor_field: If given, pages are walked with a cursor on this field instead of offsets.
+            Rows must be returned sorted by this field.
+        cursor_where_key: Key of the `where` payload filtering rows greater or equal to the cursor.
     """
     count_rows_retrieved = 0
-    if not disable_tqdm:
-        count_rows_available = count_method(**count_kwargs)
-        count_rows_queried_total = min(count_rows_available,
-                                       first) if first is not None else count_rows_available
-    else:
-        # dummy value that won't have any impact since tqdm is disabled
-        count_rows_queried_total = 1 if first != 0 else 0
     count_rows_query_default = min(100, first or 100)
-    throttling_delay = 60 / 250
+    if first == 0:
+        return
+    count_query = None
+    if not disable_tqdm:
+        # the total of the progress bar is counted while the first page is requested
+        executor = ThreadPoolExecutor(max_workers=1)
+        count_query = executor.submit(memoized_count, count_method, count_kwargs)
+        executor.shutdown(wait=False)
 
-    if count_rows_queried_total == 0:
-        yield from ()
+    if cursor_field is not None:
+        pages = keyset_page_generator(
+            skip, count_rows_query_default, paged_call_method,
+            paged_call_payload, fields, cursor_field, cursor_where_key)
+    elif prefetch_pages > 0:
+        pages = prefetched_page_generator(
+            skip, first, count_rows_query_default, paged_call_method,
+            paged_call_payload, fields, prefetch_pages)
     else:
-        with tqdm(total=count_rows_queried_total, disable=disable_tqdm) as pbar:
-            while True:
-                query_start = time.time()
-                rows = paged_call_method(
-                    count_rows_retrieved + skip,
-                    count_rows_query_default,
-                    paged_call_payload,
-                    fields,
-                )
-                query_time = time.time() - query_start
-
-                if query_time < throttling_delay:
-                    time.sleep(throttling_delay - query_time)
-
+        pages = page_generator(
+            skip, count_rows_query_default, paged_call_method,
+            paged_call_payload, fields)
+    with tqdm.tqdm(total=None, disable=disable_tqdm) as pbar:
+        try:
+            for rows in pages:
+                if count_query is not None:
+                    count_rows_available = count_query.result()
+                    pbar.total = min(count_rows_available, first) \
+                        if first is not None else count_rows_available
+                    pbar.refresh()
+                    count_query = None
                 if rows is None or len(rows) == 0:
                     break
 
-                for row in rows:
-                    yield row
+                yield from rows
 
                 count_rows_retrieved += len(rows)
                 pbar.update(len(rows))
                 if first is not None and count_rows_retrieved >= first:
                     break
+        finally:
+            pages.close()
+
+
+def memoized_count(count_method: Callable[..., int], count_kwargs: dict) -> int:
+    """
+    Call count_method, or return the count it gave with the same arguments
+    less than PAGINATION_COUNT_TTL seconds ago.
+
+    Args:
+        count_method: Callable returning the number of available rows given `count_kwargs`.
+        count_kwargs: Keyword arguments passed to the `count_method`.
+    """
+    key = (id(getattr(count_method, '__self__', None)),
+           getattr(count_method, '__func__', count_method),
+           dumps(count_kwargs, sort_keys=True, default=str))
+    now = time.monotonic()
+    with _recent_counts_lock:
+        for expired_key in [recent_key for recent_key, (counted_at, _) in _recent_counts.items()
+                            if now - counted_at > PAGINATION_COUNT_TTL]:
+            del _recent_counts[expired_key]
+        if key in _recent_counts:
+            return _recent_counts[key][1]
+    count = count_method(**count_kwargs)
+    with _recent_counts_lock:
+        _recent_counts[key] = (now, count)
+    return count
+
+
+def clear_recent_counts():
+    """
+    Forget the memoized counts, for example after a mutation changed the rows they count
+    """
+    with _recent_counts_lock:
+        _recent_counts.clear()
+
+
+def page_generator(
+    skip: int,
+    page_size: int,
+    paged_call_method: Callable[..., List[dict]],
+    paged_call_payload: dict,
+    fields: List[str],
+):
+    """
+    Yields the pages one after the other.
+
+    Args:
+        skip: Number of rows to skip.
+        page_size: Number of rows requested per call.
+        paged_call_method: Callable returning the list of samples.
+        paged_call_payload: Payload for the GraphQL query.
+        fields: The list of strings to retrieved.
+    """
+    offset = skip
+    while True:
+        rows = paged_call_method(offset, page_size, paged_call_payload, fields)
+        yield rows
+        if rows is None:
+            return
+        offset += len(rows)
+
+
+def keyset_page_generator(
+    skip: int,
+    page_size: int,
+    paged_call_method: Callable[..., List[dict]],
+    paged_call_payload: dict,
+    fields: List[str],
+    cursor_field: str,
+    cursor_where_key: str,
+):
+    """
+    Yields the pages by filtering on the cursor value of the last row received.
+
+    Each call only skips the rows sharing the cursor value of the last row already
+    received, so its cost does not grow with the depth of the page, and rows inserted
+    before the cursor during the crawl do not shift the following pages.
+
+    Args:
+        skip: Number of rows to skip.
+        page_size: Number of rows requested per call.
+        paged_call_method: Callable returning the list of samples, sorted by `cursor_field`.
+        paged_call_payload: Payload for the GraphQL query, with a `where` filter.
+        fields: The list of strings to retrieved.
+        cursor_field: Field on which the rows are sorted.
+        cursor_where_key: Key of the `where` payload filtering rows greater or equal to the cursor.
+    """
+    query_fields = fields if cursor_field in fields else fields + [cursor_field]
+    cursor = None
+    offset = skip
+    while True:
+        payload = dict(paged_call_payload)
+        if cursor is not None:
+            payload['where'] = {**paged_call_payload['where'], cursor_where_key: cursor}
+        rows = paged_call_method(offset, page_size, payload, query_fields)
+        if not rows:
+            yield rows
+            return
+        last_value = rows[-1][cursor_field]
+        rows_with_last_value = 0
+        for row in reversed(rows):
+            if row[cursor_field] != last_value:
+                break
+            rows_with_last_value += 1
+        if last_value == cursor or (cursor is None and offset > 0
+                                    and rows_with_last_value == len(rows)):
+            offset += len(rows)
+        else:
+            cursor = last_value
+            offset = rows_with_last_value
+        if query_fields is not fields:
+            for row in rows:
+                del row[cursor_field]
+        yield rows
+
+
+def prefetched_page_generator(
+    skip: int,
+    first: Optional[int],
+    page_size: int,
+    paged_call_method: Callable[..., List[dict]],
+    paged_call_payload: dict,
+    fields: List[str],
+    prefetch_pages: int,
+):
+    """
+    Yields the pages in order while the next `prefetch_pages` ones are requested concurrently.
+
+    At most `prefetch_pages` pages are held in memory. The calls draw from
+    the rate limiter of the client, so prefetching does not exceed the API budget.
+
+    Args:
+        skip: Number of rows to skip.
+        first: Maximum number of rows to return.
+        page_size: Number of rows requested per call.
+        paged_call_method: Callable returning the list of samples.
+        paged_call_payload: Payload for the GraphQL query. It is copied for each call.
+        fields: The list of strings to retrieved.
+        prefetch_pages: Number of pages requested ahead.
+    """
+    end = skip + first if first is not None else None
+    executor = ThreadPoolExecutor(max_workers=prefetch_pages)
+    window = deque()
+    next_offset = skip
+
+    def submit_next_page():
+        nonlocal next_offset
+        window.append(executor.submit(paged_call_method, next_offset, page_size,
+                                      copy.copy(paged_call_payload), fields))
+        next_offset += page_size
+
+    try:
+        while True:
+            while len(window) < prefetch_pages and (end is None or next_offset < end):
+                submit_next_page()
+            if not window:
+                return
+            rows = window.popleft().result()
+            yield rows
+            if rows is None or len(rows) < page_size:
+                return
+    finally:
+        for future in window:
+            future.cancel()
+        executor.shutdown(wait=False)
 
 
 def batch_iterator_builder(iterable: List, batch_size=MUTATION_BATCH_SIZE):
@@ -85,42 +274,107 @@ def batch_iterator_builder(iterable: List, batch_size=MUTATION_BATCH_SIZE):
         yield iterable[ndx:min(ndx + batch_size, iterable_length)]
 
 
+def estimate_payload_sizes(properties_to_batch: Dict[str, Optional[list]]) -> List[int]:
+    """Estimate the number of bytes each object adds to the payload of a mutation
+    Args:
+        properties_to_batch: a dictionnary of properties to be batched. Arrays processed
+            lazily provide an estimate_sizes method, so that files are not encoded to be measured
+    """
+    sizes = []
+    for values in properties_to_batch.values():
+        if values is None:
+            continue
+        if hasattr(values, 'estimate_sizes'):
+            values_sizes = values.estimate_sizes()
+        else:
+            values_sizes = [len(dumps(value, default=str)) for value in values]
+        sizes = list(map(add, sizes, values_sizes)) if sizes else values_sizes
+    return sizes
+
+
+def batch_bounds_builder(sizes: List[int], batch_size: int,
+                         max_bytes: int) -> Iterator[Tuple[int, int]]:
+    """Generate the bounds of batches holding at most batch_size objects and max_bytes bytes.
+    An object larger than max_bytes is sent alone in its batch.
+    Args:
+        sizes: the size of each object
+        batch_size: the maximal number of objects in a batch
+        max_bytes: the maximal size of a batch
+    """
+    start, batch_bytes = 0, 0
+    for end, size in enumerate(sizes):
+        if end > start and (end - start >= batch_size or batch_bytes + size > max_bytes):
+            yield start, end
+            start, batch_bytes = end, 0
+        batch_bytes += size
+    if start < len(sizes):
+        yield start, len(sizes)
+
+
 def batch_object_builder(
         properties_to_batch: Dict[str, Optional[list]],
-        batch_size: int = MUTATION_BATCH_SIZE) -> Dict[str, Optional[list]]:
+        batch_size: int = MUTATION_BATCH_SIZE,
+        max_bytes: Optional[int] = None) -> Dict[str, Optional[list]]:
     """Generate a paginated iterator for several variables
     Args:
         properties_to_batch: a dictionnary of properties to be batched.
         batch_size: the size of the batches to produce
+        max_bytes: if given, the batches are also cut so that their estimated payload
+            stays under this number of bytes
     """
     if len(list(filter(None, properties_to_batch.values()))) == 0:
         yield properties_to_batch
         return
     number_of_objects = len([v for v in properties_to_batch.values(
     ) if v is not None][0])
-    number_of_batches = len(range(0, number_of_objects, batch_size))
-    batched_properties = {k: (batch_iterator_builder(v, batch_size) if v is not None
-                              else (item for item in [v]*number_of_batches))
-                          for k, v in properties_to_batch.items()}
-    batch_object_iterator = [dict(zip(batched_properties, t))
-                             for t in zip(*batched_properties.values())]
-    for batch in batch_object_iterator:
-        yield batch
+    if max_bytes is None:
+        bounds = ((ndx, min(ndx + batch_size, number_of_objects))
+                  for ndx in range(0, number_of_objects, batch_size))
+    else:
+        bounds = batch_bounds_builder(
+            estimate_payload_sizes(properties_to_batch), batch_size, max_bytes)
+    for start, end in bounds:
+        yield {k: (v[start:end] if v is not None else None)
+               for k, v in properties_to_batch.items()}
+
+
+def batches_with_offsets(
+        batches: Iterator[Dict[str, Optional[list]]]) -> Iterator[Tuple[int, int, dict]]:
+    """Number each batch and give the index of its first object among all the objects
+    Args:
+        batches: batches of properties, as generated by batch_object_builder
+    """
+    offset = 0
+    for batch_number, batch in enumerate(batches):
+        yield batch_number, offset, batch
+        offset += next((len(values) for values in batch.values() if values is not None), 0)
 
 
 def _mutate_from_paginated_call(self,
                                 properties_to_batch: Dict[str, Optional[list]],
                                 generate_variables: Callable,
-                                request: str,
-                                batch_size: int = MUTATION_BATCH_SIZE):
+                                request: Union[str, Callable[[dict], str]],
+                                batch_size: int = MUTATION_BATCH_SIZE,
+                                max_workers: int = 1,
+                                max_bytes: Optional[int] = None,
+                                on_batch_success: Optional[Callable[[dict], None]] = None):
     """Run a mutation by making paginated calls
     Args:
         properties_to_batch: a dictionnary of properties to be batched.
             constants across batch are defined in the generate_variables function
         generate_variables: function that takes batched properties and return
             a graphQL payload for request for this batch
-        request: the GraphQL request to call,
+        request: the GraphQL request to call, or a function that takes batched
+            properties and returns the GraphQL request for this batch
         batch_size: the size of the batches to produce
+        max_workers: the number of batches sent concurrently. Batches share the rate
+            limit of the client and results keep the order of the batches. When
+            several workers are used, failed batches do not abort the others: a
+            BatchMutationError holding every result and error is raised at the end.
+        max_bytes: if given, the batches are also cut so that their estimated payload
+            stays under this number of bytes
+        on_batch_success: function called with the batched properties of each batch
+            successfully sent, in the order of the batches
     Example:
         '''
         properties_to_batch={prop1: [0,1], prop2: ['a', 'b']}
@@ -136,15 +390,46 @@ def _mutate_from_paginated_call(self,
                 )
         '''
     """
+    batches = batches_with_offsets(batch_object_builder(properties_to_batch, batch_size, max_bytes))
+    batch_request = request if callable(request) else lambda _: request
     results = []
-    for batch_number, batch in enumerate(batch_object_builder(properties_to_batch, batch_size)):
-        mutation_start = time.time()
-        variables = generate_variables(batch)
-        result = self.auth.client.execute(request, variables)
-        mutation_time = time.time() - mutation_start
+    if max_workers <= 1:
+        for batch_number, offset, batch in batches:
+            variables = generate_variables(batch)
+            result = self.auth.client.execute(batch_request(batch), variables)
+            results.append(result)
+            if 'errors' in result:
+                raise GraphQLError('data', result['errors'], batch_number, result.get('data'),
+                                   offset)
+            if on_batch_success is not None:
+                on_batch_success(batch)
+        return results
+
+    errors = []
+
+    def collect(batch_number, offset, batch, future):
+        try:
+            result = future.result()
+        except Exception as error:  # pylint: disable=broad-except
+            results.append(None)
+            errors.append(error)
+            return
         results.append(result)
         if 'errors' in result:
-            raise GraphQLError('data', result['errors'], batch_number)
-        if mutation_time < THROTTLING_DELAY:
-            time.sleep(THROTTLING_DELAY - mutation_time)
+            errors.append(GraphQLError('data', result['errors'], batch_number,
+                                       result.get('data'), offset))
+        elif on_batch_success is not None:
+            on_batch_success(batch)
+
+    window = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for batch_number, offset, batch in batches:
+            window.append((batch_number, offset, batch, executor.submit(
+                self.auth.client.execute, batch_request(batch), generate_variables(batch))))
+            if len(window) >= 2 * max_workers:
+                collect(*window.popleft())
+        while window:
+            collect(*window.popleft())
+    if errors:
+        raise BatchMutationError(results, errors)
     return results
@@ -0,0 +1,165 @@
+"""
+Read-through cache of the results of GraphQL queries
+"""
+from collections import OrderedDict
+from typing import Dict, Optional
+import copy
+import json
+import re
+import threading
+import time
+
+from kili.constants import QUERY_CACHE_SIZE, QUERY_CACHE_TTL
+
+PROJECT_DELETIONS = ('deleteproject', 'projectdeleteasynchronously')
+
+# Words of a mutation which show that it touches an entity, besides the name of the entity
+MUTATION_ENTITY_KEYWORDS = {
+    'asset': ('dataset', 'label') + PROJECT_DELETIONS,
+    'label': ('asset', 'prediction') + PROJECT_DELETIONS,
+    'projectUser': ('role',) + PROJECT_DELETIONS,
+}
+
+# Entities of the root fields which do not derive from their name
+QUERY_ENTITY_ALIASES = {
+    'me': 'user',
+}
+
+ROOT_FIELD_PATTERN = re.compile(r'{\s*(?:\w+\s*:\s*)?(\w+)')
+
+
+def normalize_query(query: str) -> str:
+    """
+    Query string with its whitespace collapsed
+    """
+    return ' '.join(query.split())
+
+
+def is_mutation(query: str) -> bool:
+    """
+    Whether the GraphQL operation is a mutation
+    """
+    return query.lstrip().startswith('mutation')
+
+
+def query_entity(query: str) -> Optional[str]:
+    """
+    Entity returned by a GraphQL query, read from its root field.
+    For example `projects` and `countProjects` both return `project`.
+    """
+    match = ROOT_FIELD_PATTERN.search(query)
+    if match is None:
+        return None
+    name = re.sub(r'^count(?=[A-Z])', '', match.group(1))
+    name = name[0].lower() + name[1:]
+    if name in QUERY_ENTITY_ALIASES:
+        return QUERY_ENTITY_ALIASES[name]
+    return name[:-1] if name.endswith('s') else name
+
+
+def mutation_header(query: str) -> str:
+    """
+    Declaration and root field of a mutation, without its selection set, in lower case
+    """
+    opening_braces = [match.start() for match in re.finditer('{', query)][:2]
+    return query[:opening_braces[-1]].lower() if opening_braces else query.lower()
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache of query results, with a time to live per entity.
+
+    Results are keyed by the normalized query string and its variables. Mutations
+    sent by the same client evict the cached results of the entities they touch,
+    as told by the names and types in their declaration. Cached results are
+    copied in and out, so that modifying a returned result does not alter the cache.
+    """
+
+    def __init__(self, maxsize: int = QUERY_CACHE_SIZE, ttl: float = QUERY_CACHE_TTL,
+                 ttls: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            maxsize: Number of query results kept.
+            ttl: Seconds during which a result is served from the cache.
+            ttls: Seconds during which results are served from the cache, by entity.
+                For example `{'project': 300, 'asset': 0}` keeps projects five minutes
+                and never caches assets. Other entities are kept `ttl` seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(query: str, variables: Optional[dict]) -> str:
+        """
+        Key of a query: the normalized query string and its variables
+        """
+        return normalize_query(query) + '\n' + json.dumps(variables, sort_keys=True, default=str)
+
+    def get(self, query: str, variables: Optional[dict] = None) -> Optional[dict]:
+        """
+        Return a copy of the cached result of the query, or None if it is missing or expired
+
+        Args:
+            query: the GraphQL query
+            variables: the variables of the query
+        """
+        key = self.cache_key(query, variables)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(entry[2])
+
+    def put(self, query: str, variables: Optional[dict], result: dict):
+        """
+        Cache the result of a query, unless its entity has no time to live
+
+        Args:
+            query: the GraphQL query
+            variables: the variables of the query
+            result: the decoded response of the API
+        """
+        entity = query_entity(query)
+        ttl = self.ttls.get(entity, self.ttl)
+        if ttl <= 0:
+            return
+        entry = (entity, time.monotonic() + ttl, copy.deepcopy(result))
+        key = self.cache_key(query, variables)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, mutation: str):
+        """
+        Evict the cached results of the entities touched by a mutation
+
+        Args:
+            mutation: the GraphQL mutation
+        """
+        header = mutation_header(mutation)
+        with self._lock:
+            touched_entities = {
+                entity for entity, _, _ in self._entries.values()
+                if entity is None or any(keyword.lower() in header for keyword in
+                                         (entity,) + MUTATION_ENTITY_KEYWORDS.get(entity, ()))}
+            for key in [key for key, entry in self._entries.items()
+                        if entry[0] in touched_entities]:
+                del self._entries[key]
+
+    def clear(self):
+        """
+        Empty the cache
+        """
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,104 @@
+"""
+Rate limiter shared by all the calls made to the Kili API
+"""
+import threading
+import time
+from typing import Dict
+
+from kili.constants import MAX_CALLS_PER_MINUTE
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket spacing the calls to the API.
+
+    Calls reserve a token and wait until it is available, so that threads sharing
+    the limiter share the budget instead of each assuming they own it.
+    The rate is halved each time the API answers that it is overloaded,
+    then increased back step by step after successful calls.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, max_calls: int = MAX_CALLS_PER_MINUTE, period: float = 60.,
+                 burst: int = 1, min_rate_ratio: float = 1 / 16):
+        """
+        Args:
+            max_calls: Number of calls allowed per period.
+            period: Duration of the period in seconds.
+            burst: Number of calls that can be made at once after an idle time.
+            min_rate_ratio: Lowest rate reached when backing off, as a ratio of the maximum rate.
+        """
+        self.max_rate = max_calls / period
+        self.min_rate = self.max_rate * min_rate_ratio
+        self.rate = self.max_rate
+        self.burst = burst
+        self.total_wait_time = 0.
+        self.last_wait_time = 0.
+        self.number_of_calls = 0
+        self.number_of_throttled_calls = 0
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Wait until a call can be made, and return the time waited in seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst,
+                               self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= 1
+            wait_time = -self._tokens / self.rate if self._tokens < 0 else 0.
+            self.number_of_calls += 1
+            self.total_wait_time += wait_time
+            self.last_wait_time = wait_time
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+    def on_throttled(self):
+        """
+        Halve the rate after the API answered that it is overloaded (429 or 5xx)
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.number_of_throttled_calls += 1
+
+    def on_success(self):
+        """
+        Increase the rate back towards its maximum after a successful call
+        """
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Return the current rate in calls per minute and the time spent waiting
+        """
+        return {
+            'rate_per_minute': self.rate * 60,
+            'total_wait_time': self.total_wait_time,
+            'last_wait_time': self.last_wait_time,
+            'number_of_calls': self.number_of_calls,
+            'number_of_throttled_calls': self.number_of_throttled_calls,
+        }
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(endpoint: str) -> RateLimiter:
+    """
+    Return the rate limiter shared by all the clients of the process calling this endpoint
+
+    Args:
+        endpoint: url of the Kili API
+    """
+    with _rate_limiters_lock:
+        if endpoint not in _rate_limiters:
+            _rate_limiters[endpoint] = RateLimiter()
+        return _rate_limiters[endpoint]
@@ -21,17 +21,18 @@ def main(api_endpoint):
     kili = Kili(api_key=api_key,
                 api_endpoint=api_endpoint)
 
-    df = pd.DataFrame(columns=['Project', 'Date', 'Email'])
-    for project_id in source_project_id.split(','):
-        project = kili.projects(project_id=project_id)[0]
-        assets = kili.assets(project_id=project_id)
-        title = project['title']
+    project_ids = source_project_id.split(',')
+    titles = {project_id: projects[0]['title'] for project_id, projects
+              in kili.fan_out('projects', project_ids, fields=['title'])}
+    rows = []
+    for project_id, assets in kili.fan_out('assets', project_ids,
+                                           fields=['labels.createdAt', 'labels.author.email']):
         for asset in assets:
             for label in asset['labels']:
-                created_at = label['createdAt'][:10]
-                author_email = label['author']['email']
-                df = df.append({'Project': title, 'Date': created_at,
-                                'Email': author_email}, ignore_index=True)
+                rows.append({'Project': titles[project_id],
+                             'Date': label['createdAt'][:10],
+                             'Email': label['author']['email']})
+    df = pd.DataFrame(rows, columns=['Project', 'Date', 'Email'])
     df_grouped = df.groupby(['Project', 'Date', 'Email']).size()
     time = datetime.now().strftime('%Y%m%d%H%M')
     df_grouped.to_excel(f'labeler-stats-{time}.xlsx')
@@ -36,6 +36,10 @@ setup(
                       "pyparsing",
                       "websocket-client"],
 
+    # Optional dependencies, e.g. pip install kili[fast-json]
+    extras_require={"fast-json": ["orjson"],
+                    "arrow": ["pyarrow>=7"]},
+
     # Taking into account MANIFEST.in
     include_package_data=True,
 
@@ -1,15 +1,21 @@
 """
 Test mutations with pytest
 """
+import base64
 import os
 import shutil
 import tempfile
 import unittest
+from unittest.mock import MagicMock, patch
 import uuid
 
 import pytest
+from kili.exceptions import GraphQLError
+from kili.helpers import encode_base64
+from kili.mutations.asset import MutationsAsset
 from kili.mutations.asset.helpers import get_file_mimetype, process_append_many_to_dataset_parameters, process_content
 from kili.mutations.asset.queries import GQL_APPEND_MANY_FRAMES_TO_DATASET
+from kili.utils.journal import ImportJournal
 import requests
 
 
@@ -98,6 +104,24 @@ class TestMimeType():
             json_content_array = None
             process_content('IMAGE', content_array, json_content_array)
 
+    def test_local_files_are_encoded_batch_by_batch(self, tmpdir):
+        paths = []
+        for i in range(3):
+            path = os.path.join(tmpdir, f'{i}.png')
+            with open(path, 'wb') as file:
+                file.write(bytes(range(256)) * (i + 1))
+            paths.append(path)
+        content_array = paths + ['https://storage.googleapis.com/label-public-staging/car/car_1.jpg']
+        processed_content = process_content('IMAGE', content_array, None)
+        assert processed_content.array == content_array
+        batch = processed_content[1:]
+        assert batch[0] == 'data:image/png;base64,' + \
+            base64.b64encode(bytes(range(256)) * 2).decode('ascii')
+        assert batch[2] == content_array[3]
+        assert encode_base64(paths[2], chunk_size=3) == processed_content[2]
+        assert processed_content.estimate_sizes()[:3] == [
+            len(content) for content in processed_content[:3]]
+
 
 class TestUploadTiff(unittest.TestCase):
     """
@@ -138,3 +162,36 @@ class TestUploadTiff(unittest.TestCase):
         assert properties['external_id_array'] == ['bogota']
         assert upload_type == 'GEO_SATELLITE', 'uploadType do not match'
         assert request == GQL_APPEND_MANY_FRAMES_TO_DATASET, 'Requests do not match'
+
+
+def test_import_resumes_from_journal(tmpdir):
+    """Assets recorded in the journal are not sent again when the import is run again"""
+    journal = os.path.join(tmpdir, 'import.journal')
+    external_ids = [f'asset{i}' for i in range(250)]
+    content_array = [f'text {i}' for i in range(250)]
+    sent_external_ids = []
+    failing_external_ids = {'asset150'}
+
+    def execute(_request, variables):
+        batch_external_ids = variables['data']['externalIDArray']
+        sent_external_ids.extend(batch_external_ids)
+        if failing_external_ids.intersection(batch_external_ids):
+            return {'errors': ['Internal server error']}
+        return {'data': {'data': {'id': 'project'}}}
+
+    auth = MagicMock()
+    auth.client.endpoint = 'http://localhost:4001/api/label/v2/graphql'
+    auth.client.execute.side_effect = execute
+    with patch('kili.mutations.asset.QueriesProject') as queries_project:
+        queries_project.return_value.projects.return_value = [{'inputType': 'TEXT'}]
+        with pytest.raises(GraphQLError):
+            MutationsAsset(auth).append_many_to_dataset(
+                'project', content_array=content_array,
+                external_id_array=external_ids, journal=journal)
+        sent_external_ids.clear()
+        failing_external_ids.clear()
+        MutationsAsset(auth).append_many_to_dataset(
+            'project', content_array=content_array,
+            external_id_array=external_ids, journal=journal)
+    assert sent_external_ids == external_ids[100:]
+    assert ImportJournal(journal).completed_external_ids('project') == set(external_ids)
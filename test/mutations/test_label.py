@@ -0,0 +1,91 @@
+"""
+Test label mutations with pytest
+"""
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from kili.exceptions import GraphQLError
+from kili.graphql_client import GraphQLClient
+from kili.mutations.label import MutationsLabel
+from kili.mutations.label.helpers import read_json_files
+
+
+def label_mutations(number_of_assets):
+    """Label mutations of a client whose project holds assets asset0, asset1, ..."""
+    auth = MagicMock()
+    auth.client.endpoint = 'https://cloud.kili-technology.com/api/label/v2/graphql'
+    auth.user_id = 'user_id'
+
+    def execute(query, variables):
+        return {'data': {f'data{i}': {'id': f'label-{variables[f"where{i}"]["id"]}'}
+                         for i in range(len(variables) // 2)}}
+    auth.client.execute = MagicMock(side_effect=execute)
+    mutations = MutationsLabel(auth)
+
+    def assets(external_id_contains, **_):
+        return iter([{'id': f'id-{external_id}', 'externalId': external_id}
+                     for external_id in external_id_contains
+                     if int(external_id[len('asset'):]) < number_of_assets])
+    mutations.assets = MagicMock(side_effect=assets)
+    return mutations
+
+
+def test_append_many_labels_sends_batches_of_aliased_mutations():
+    """Labels are sent by batches of 100 aliased appendToLabels, in the order of the assets"""
+    mutations = label_mutations(150)
+    external_ids = [f'asset{i}' for i in range(150)]
+    labels = mutations.append_many_labels(
+        json_response_array=[{'JOB_0': {'text': str(i)}} for i in range(150)],
+        label_asset_external_id_array=external_ids, project_id='project_id')
+
+    assert [label['id'] for label in labels] == [f'label-id-{external_id}'
+                                                for external_id in external_ids]
+    assert mutations.assets.call_count == 2
+    calls = mutations.auth.client.execute.call_args_list
+    assert len(calls) == 2
+    query, variables = calls[1].args
+    assert 'data49: appendToLabels' in query and 'data50' not in query
+    assert variables['data0'] == {'authorID': 'user_id',
+                                  'jsonResponse': json.dumps({'JOB_0': {'text': '100'}}),
+                                  'labelType': 'DEFAULT', 'secondsToLabel': 0, 'skipped': False}
+    assert variables['where0'] == {'id': 'id-asset100'}
+
+
+def test_append_many_labels_fails_on_unknown_external_id():
+    """No label is sent when an external id is not found"""
+    mutations = label_mutations(1)
+    with pytest.raises(Exception, match='No asset found with external ID "asset1"'):
+        mutations.append_many_labels(
+            json_response_array=[{}, {}], label_asset_external_id_array=['asset0', 'asset1'],
+            project_id='project_id')
+    mutations.auth.client.execute.assert_not_called()
+
+
+def test_read_json_files_keeps_the_order_of_the_paths(tmp_path):
+    """Files read concurrently are returned in the order of their paths"""
+    paths = []
+    for i in range(20):
+        path = tmp_path / f'label{i}.json'
+        path.write_text(json.dumps({'index': i}), encoding='utf-8')
+        paths.append(str(path))
+    assert read_json_files(paths) == [{'index': i} for i in range(20)]
+
+
+def test_append_many_labels_does_not_resend_a_partially_failed_batch():
+    """A batch where one label is rejected is sent once, and its created labels are reported"""
+    mutations = label_mutations(2)
+    client = GraphQLClient(mutations.auth.client.endpoint, rate_limiter=MagicMock())
+    response = MagicMock(status_code=200, content=json.dumps({
+        'data': {'data0': {'id': 'label0'}, 'data1': None},
+        'errors': [{'message': 'Invalid jsonResponse', 'path': ['data1']}]}).encode())
+    client.session.post = MagicMock(return_value=response)
+    mutations.auth.client = client
+    with pytest.raises(GraphQLError) as error:
+        mutations.append_many_labels(
+            json_response_array=[{}, {'JOB_0': None}],
+            label_asset_external_id_array=['asset0', 'asset1'], project_id='project_id')
+    assert client.session.post.call_count == 1
+    assert error.value.data == {'data0': {'id': 'label0'}, 'data1': None}
+    assert error.value.errors[0]['path'] == ['data1']
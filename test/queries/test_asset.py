@@ -53,3 +53,16 @@ def test_assets(mocker):
         else:
             actual_list = list(actual)
         assert expected == actual_list, f'Test case "{case_name}" failed'
+
+
+def test_assets_as_dataframe_chunks(mocker):
+    """
+    Test that assets are yielded as DataFrames of chunk_size rows
+    """
+    mocker.patch("kili.queries.asset.QueriesAsset._query_assets",
+                 side_effect=mocked_query_method)
+    mocker.patch("kili.queries.asset.QueriesAsset.count_assets",
+                 return_value=mocked_count_method)
+    chunks = kili.assets(project_id="abcdef", format="pandas", as_generator=True,
+                         first=50, chunk_size=20)
+    assert [len(chunk) for chunk in chunks] == [20, 20, 10]
@@ -0,0 +1,106 @@
+"""Tests for the streaming export to Parquet and Feather files"""
+
+import pytest
+
+from kili.helpers import format_result
+from kili.orm import Asset
+from kili.utils.arrow_export import arrow_schema, label_rows, write_rows
+
+
+def assets_generator(number_of_assets):
+    """Assets with two labels each, as returned by kili.assets(as_generator=True)"""
+    for i in range(number_of_assets):
+        yield from format_result('data', {'data': {'data': [{
+            'externalId': f'asset{i}',
+            'labels': [{'author': {'email': 'test@kili-technology.com', 'id': 'user'},
+                        'id': f'label{i}-{j}',
+                        'jsonResponse': '{"JOB_0": {}}',
+                        'secondsToLabel': j,
+                        'skipped': None} for j in range(2)],
+        }]}}, Asset, decode_json=False)
+
+
+def test_label_rows():
+    """Labels are flattened with the fields of their asset"""
+    rows = list(label_rows(assets_generator(2)))
+    assert [row['id'] for row in rows] == ['label0-0', 'label0-1', 'label1-0', 'label1-1']
+    assert rows[3]['asset_externalId'] == 'asset1'
+    assert rows[3]['jsonResponse'] == '{"JOB_0": {}}'
+
+
+@pytest.mark.parametrize('file_format', ['parquet', 'feather'])
+def test_write_labels(tmpdir, file_format):
+    """Labels are written batch by batch with a schema fixed by the fields"""
+    pyarrow = pytest.importorskip('pyarrow')
+    path = str(tmpdir / f'labels.{file_format}')
+    fields = ['author.email', 'author.id', 'id', 'jsonResponse', 'secondsToLabel', 'skipped']
+    schema = arrow_schema(fields, {'asset_': ['externalId']})
+    number_of_rows = write_rows(label_rows(assets_generator(1500)), path, schema, file_format,
+                                batch_size=1000)
+    assert number_of_rows == 3000
+    if file_format == 'parquet':
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+        table = pyarrow.parquet.read_table(path)
+    else:
+        table = pyarrow.ipc.open_file(path).read_all()
+    assert table.schema == schema
+    assert table.num_rows == 3000
+    assert table.column('author')[5].as_py() == {
+        'email': 'test@kili-technology.com', 'id': 'user'}
+    assert table.column('secondsToLabel').type == pyarrow.int64()
+    assert table.column('asset_externalId')[2999].as_py() == 'asset1499'
+
+
+def test_write_unknown_format(tmpdir):
+    """Only parquet and feather are supported"""
+    pytest.importorskip('pyarrow')
+    with pytest.raises(ValueError):
+        write_rows([], str(tmpdir / 'labels.csv'), arrow_schema(['id']), 'csv')
+
+
+def test_types_outside_the_map_are_inferred(tmpdir):
+    """Numeric and boolean fields missing from ARROW_FIELD_TYPES are typed from their values"""
+    pyarrow = pytest.importorskip('pyarrow')
+    import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+    path = str(tmpdir / 'labels.parquet')
+    fields = ['author.activated', 'id', 'isLatestDefaultLabelForUser', 'numberOfAnnotations',
+              'totalSecondsToLabel']
+    rows = [{'author': {'activated': True}, 'id': 'a', 'isLatestDefaultLabelForUser': None,
+             'numberOfAnnotations': 3, 'totalSecondsToLabel': 12},
+            {'author': {'activated': False}, 'id': 'b', 'isLatestDefaultLabelForUser': True,
+             'numberOfAnnotations': 1, 'totalSecondsToLabel': 7.5}]
+    assert write_rows(rows, path, arrow_schema(fields)) == 2
+    table = pyarrow.parquet.read_table(path)
+    assert table.column('author').type == pyarrow.struct([('activated', pyarrow.bool_())])
+    assert table.column('isLatestDefaultLabelForUser').type == pyarrow.bool_()
+    assert table.column('totalSecondsToLabel').to_pylist() == [12, 7.5]
+    assert table.column('id').type == pyarrow.string()
+
+
+def test_columns_null_in_the_first_batch(tmpdir):
+    """Numbers in columns which are null in the whole first batch do not fail the export"""
+    pyarrow = pytest.importorskip('pyarrow')
+    import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+    path = str(tmpdir / 'assets.parquet')
+    fields = ['duration', 'id', 'numberOfValidLocks', 'unknownScore']
+    rows = [{'duration': None, 'id': f'asset{i}', 'numberOfValidLocks': None,
+             'unknownScore': None} for i in range(3)]
+    rows.append({'duration': 1.5, 'id': 'asset3', 'numberOfValidLocks': 2, 'unknownScore': 0.5})
+    assert write_rows(rows, path, arrow_schema(fields), batch_size=3) == 4
+    table = pyarrow.parquet.read_table(path)
+    assert table.column('duration').to_pylist() == [None, None, None, 1.5]
+    assert table.column('numberOfValidLocks').type == pyarrow.int64()
+    assert table.column('unknownScore').to_pylist() == [None, None, None, '0.5']
+
+
+def test_write_locks(tmpdir):
+    """Locks and issues of the assets are lists of objects"""
+    pyarrow = pytest.importorskip('pyarrow')
+    import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+    path = str(tmpdir / 'assets.parquet')
+    rows = [{'id': 'a', 'locks': [{'id': 'l1'}], 'issues': []},
+            {'id': 'b', 'locks': [], 'issues': [{'issueNumber': 3}]}]
+    assert write_rows(rows, path, arrow_schema(['id', 'issues.issueNumber', 'locks.id'])) == 2
+    table = pyarrow.parquet.read_table(path)
+    assert table.column('locks').to_pylist() == [[{'id': 'l1'}], []]
+    assert table.column('issues').to_pylist() == [[], [{'issueNumber': 3}]]
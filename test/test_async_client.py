@@ -0,0 +1,53 @@
+"""Tests for the asynchronous client"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from kili.async_client import AsyncKili
+
+
+def mocked_assets(project_id, as_generator=False, **_):
+    """Simulates a blocking query returning 250 assets"""
+    time.sleep(0.1)
+    assets = ({'id': f'{project_id}-{i}'} for i in range(250))
+    return assets if as_generator else list(assets)
+
+
+@patch('kili.async_client.Kili')
+def test_calls_run_concurrently(kili_mock):
+    """Blocking calls do not block the event loop and run side by side"""
+    kili_mock.return_value.assets = MagicMock(side_effect=mocked_assets)
+
+    async def main():
+        async with AsyncKili(max_concurrency=10) as kili:
+            start = time.perf_counter()
+            results = await asyncio.gather(*(kili.assets(f'project{i}') for i in range(10)))
+            duration = time.perf_counter() - start
+            rows = [asset async for asset in kili.assets('project', as_generator=True)]
+        return results, duration, rows
+
+    results, duration, rows = asyncio.run(main())
+    assert [len(assets) for assets in results] == [250] * 10
+    assert results[3][0] == {'id': 'project3-0'}
+    assert duration < 0.5
+    assert rows == [{'id': f'project-{i}'} for i in range(250)]
+    kili_mock.return_value.auth.client.close.assert_called_once()
+
+
+@patch('kili.async_client.Kili')
+def test_create_authenticates_outside_the_event_loop(kili_mock):
+    """The blocking authentication of AsyncKili.create runs in the thread pool"""
+    threads = []
+    kili_mock.side_effect = lambda **_: threads.append(threading.current_thread()) or MagicMock()
+
+    async def main():
+        async with await AsyncKili.create(api_key='key', max_concurrency=2) as kili:
+            return kili
+
+    kili = asyncio.run(main())
+    assert threads[0] is not threading.main_thread()
+    assert kili.executor._max_workers == 2  # pylint: disable=protected-access
+    kili_mock.assert_called_once_with(api_key='key', api_endpoint=None, verify=True,
+                                      pool_maxsize=2, compress_requests=False)
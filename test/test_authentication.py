@@ -0,0 +1,36 @@
+"""Tests for the initialization of the authentication"""
+
+import threading
+from unittest.mock import patch
+
+from kili.authentication import KiliAuth
+from kili.utils.auth_cache import AuthCache
+
+API_ENDPOINT = 'https://cloud.kili-technology.com/api/label/v2/graphql'
+
+
+def test_startup_calls_are_concurrent_and_cached(tmpdir):
+    """The three startup calls run at once, then their result is read from the cache"""
+    barrier = threading.Barrier(3, timeout=5)
+
+    def concurrent_call(result):
+        def call(*_):
+            barrier.wait()
+            return result
+        return call
+
+    with patch.object(KiliAuth, 'check_versions_match', side_effect=concurrent_call(None)) \
+            as check_versions_match, \
+            patch.object(KiliAuth, 'get_user', side_effect=concurrent_call(
+                {'id': 'user', 'email': 'test@kili-technology.com'})) as get_user, \
+            patch.object(KiliAuth, 'get_api_key_creation_date',
+                         side_effect=concurrent_call('2100-01-01T00:00:00.000Z')):
+        auth = KiliAuth('key', API_ENDPOINT, auth_cache=AuthCache(str(tmpdir)))
+        assert (auth.user_id, auth.user_email) == ('user', 'test@kili-technology.com')
+
+        auth = KiliAuth('key', API_ENDPOINT, auth_cache=AuthCache(str(tmpdir)))
+        assert auth.user_id == 'user'
+        assert check_versions_match.call_count == 1 and get_user.call_count == 1
+
+        KiliAuth('key', API_ENDPOINT, auth_cache=AuthCache(str(tmpdir), ttl=-1))
+        assert get_user.call_count == 2
@@ -41,7 +41,7 @@ def mocked__projects(project_id=None, **_):
 kili_client = MagicMock()
 kili_client.auth.client.endpoint = "https://staging.cloud.kili-technology.com/api/label/v2/graphql"
 kili_client.projects = project_mock = MagicMock(side_effect=mocked__projects)
-kili_client.append_to_labels = append_to_labels_mock = MagicMock()
+kili_client.append_many_labels = append_many_labels_mock = MagicMock()
 kili_client.create_predictions = create_predictions_mock = MagicMock()
 kili_client.count_projects = count_projects_mock = MagicMock(return_value=1)
 kili_client.append_many_to_dataset = append_many_to_dataset_mock = MagicMock()
@@ -88,7 +88,8 @@ class TestCLI():
                 'project_id': 'image_project',
                 'content_array': ['test_tree/image1.png', 'test_tree/leaf/image3.png'],
                 'external_id_array': ['image1.png', 'image3.png'],
-                'json_metadata_array': None
+                'json_metadata_array': None,
+                'journal': None
             }
         },
             {
@@ -101,7 +102,8 @@ class TestCLI():
                 'project_id': 'image_project',
                 'content_array': ['test_tree/image2.jpg', 'test_tree/leaf/image3.png', 'test_tree/leaf/image4.jpg'],
                 'external_id_array': ['image2.jpg', 'image3.png', 'image4.jpg'],
-                'json_metadata_array': None
+                'json_metadata_array': None,
+                'journal': None
             }
         },
             {
@@ -114,7 +116,8 @@ class TestCLI():
                     'project_id': 'image_project',
                     'content_array': ['test_tree/image2.jpg', 'test_tree/leaf/image4.jpg'],
                     'external_id_array': ['image2.jpg', 'image4.jpg'],
-                    'json_metadata_array': None
+                    'json_metadata_array': None,
+                    'journal': None
                 }
         },
             {
@@ -127,7 +130,8 @@ class TestCLI():
                 'project_id': 'text_project',
                 'content_array': ['test_tree/leaf/texte2.txt', 'test_tree/texte1.txt'],
                 'external_id_array': ['texte2.txt', 'texte1.txt'],
-                'json_metadata_array': None
+                'json_metadata_array': None,
+                'journal': None
             }
         },
             {
@@ -147,7 +151,8 @@ class TestCLI():
                         'framesPlayedPerSecond': 10,
                         'shouldUseNativeVideo': True}
                      }
-                ] * 2
+                ] * 2,
+                'journal': None
             }
         },
             {
@@ -167,7 +172,8 @@ class TestCLI():
                         'framesPlayedPerSecond': None,
                         'shouldUseNativeVideo': False}
                      }
-                ] * 2
+                ] * 2,
+                'journal': None
             }
         }
         ]
@@ -216,10 +222,10 @@ class TestCLI():
                 'project-id': 'project_id',
             },
             'flags': [],
-            'mutation_to_call': 'append_to_labels',
+            'mutation_to_call': 'append_many_labels',
             'expected_mutation_payload': {
                 'project_id': 'project_id',
-                'json_response': {
+                'json_response_array': [{
                     "JOB_0": {
                         "categories": [
                             {
@@ -228,8 +234,8 @@ class TestCLI():
                             }
                         ]
                     }
-                },
-                'label_asset_external_id': 'poules.png',
+                }]*2,
+                'label_asset_external_id_array': ['poules.png', 'test.jpg'],
             }
         },
             {
@@ -267,8 +273,8 @@ class TestCLI():
                 arguments.extend(['--'+flag for flag in test_case['flags']])
             result = runner.invoke(import_labels, arguments)
             debug_subprocess_pytest(result)
-            if test_case['mutation_to_call'] == 'append_to_labels':
-                append_to_labels_mock.assert_any_call(
+            if test_case['mutation_to_call'] == 'append_many_labels':
+                append_many_labels_mock.assert_called_with(
                     **test_case['expected_mutation_payload'])
             else:
                 create_predictions_mock.assert_called_with(
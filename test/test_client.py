@@ -17,3 +17,25 @@ class TestClient():
     def test_no_api_key(self, monkeypatch):
         with pytest.raises(AuthenticationFailed):
             _ = Kili()
+
+
+def production_client(endpoint):
+    """Client in production mode, without connection to the API"""
+    kili = Kili.__new__(Kili)
+    kili.auth = mock.MagicMock()
+    kili.auth.client.endpoint = endpoint
+    kili._bind_undecorated_resolvers()  # pylint: disable=protected-access
+    return kili
+
+
+def test_production_mode():
+    """Compatible methods are bound undecorated, with a shallow check of their arguments"""
+    kili = production_client('http://localhost:4000/api/label/graphql')
+    assert 'assets' in vars(kili)
+    assert 'update_properties_in_assets' not in vars(kili)
+    kili = production_client('https://cloud.kili-technology.com/api/label/v2/graphql')
+    with mock.patch('kili.mutations.asset._mutate_from_paginated_call', return_value=[]), \
+            mock.patch('kili.mutations.asset.format_result', return_value=[]):
+        kili.update_properties_in_assets(asset_ids=['asset'], priorities=[1])
+        with pytest.raises(TypeError):
+            kili.update_properties_in_assets(asset_ids='asset')
@@ -0,0 +1,26 @@
+"""Tests for the conversion of query results to DataFrames"""
+
+from kili.utils.dataframe import ASSET_CATEGORIES, ASSET_DTYPES, dataframe_chunks
+
+
+def asset_rows(number_of_rows):
+    """Assets, with missing values in the last ones"""
+    for i in range(number_of_rows):
+        yield {'id': f'asset{i}',
+               'consensusMark': 0.5 if i < 3 else None,
+               'createdAt': '2022-01-01T00:00:00.000Z',
+               'priority': None,
+               'skipped': i == 0,
+               'status': 'LABELED' if i % 2 else 'TODO'}
+
+
+def test_dataframe_chunks_have_the_same_dtypes():
+    """Every chunk has the explicit dtypes, whatever the values it holds"""
+    chunks = list(dataframe_chunks(asset_rows(5), ASSET_DTYPES, ASSET_CATEGORIES, chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 2]
+    assert chunks[0].dtypes.equals(chunks[1].dtypes)
+    assert chunks[1]['consensusMark'].dtype == 'float64'
+    assert chunks[1]['priority'].dtype == 'Int64'
+    assert str(chunks[1]['createdAt'].dtype).startswith('datetime64')
+    assert list(chunks[1]['status'].cat.categories) == ASSET_CATEGORIES['status']
+    assert chunks[0]['skipped'].tolist() == [True, False, False]
@@ -0,0 +1,101 @@
+"""
+Tests of the external id index
+"""
+import time
+from unittest import mock
+
+import pytest
+
+from kili.helpers import infer_id_from_external_id, infer_ids_from_external_ids
+from kili.mutations.asset import MutationsAsset
+from kili.utils.external_id_index import (ExternalIdIndex, clear_external_id_indexes,
+                                          get_external_id_index)
+
+
+class FakeKili:
+    """Client whose project holds the assets id0, id1, ... with external ids asset0, asset1, ..."""
+
+    def __init__(self, number_of_assets, duplicates=()):
+        self.assets_by_external_id = {f'asset{i}': [f'id{i}'] for i in range(number_of_assets)}
+        for external_id in duplicates:
+            self.assets_by_external_id[external_id].append(f'{external_id}-copy')
+        self.calls = []
+
+    def assets(self, project_id, fields, external_id_contains=None, **kwargs):
+        self.calls.append({'project_id': project_id, 'fields': fields,
+                           'external_id_contains': external_id_contains, **kwargs})
+        external_ids = self.assets_by_external_id if external_id_contains is None \
+            else external_id_contains
+        return iter([{'id': asset_id, 'externalId': external_id}
+                     for external_id in external_ids
+                     for asset_id in self.assets_by_external_id.get(external_id, [])])
+
+
+def test_external_ids_are_looked_up_by_batches_then_indexed():
+    kili = FakeKili(1000)
+    index = ExternalIdIndex(kili, 'project_id')
+    external_ids = [f'asset{i}' for i in range(250)]
+    assert index.resolve(external_ids) == [f'id{i}' for i in range(250)]
+    assert [len(call['external_id_contains']) for call in kili.calls] == [100, 100, 50]
+    assert index.resolve(reversed(external_ids)) == [f'id{i}' for i in reversed(range(250))]
+    assert len(kili.calls) == 3
+    assert index.resolve(['asset0', 'asset300']) == ['id0', 'id300']
+    assert kili.calls[-1]['external_id_contains'] == ['asset300']
+
+
+def test_load_indexes_the_whole_project_with_one_query():
+    kili = FakeKili(500)
+    index = ExternalIdIndex(kili, 'project_id')
+    index.load()
+    assert len(kili.calls) == 1 and kili.calls[0]['external_id_contains'] is None
+    assert len(index) == 500
+    assert index.resolve(['asset499', 'asset7']) == ['id499', 'id7']
+    assert len(kili.calls) == 1
+    index.refresh()
+    assert len(kili.calls) == 2 and len(index) == 500
+
+
+def test_index_expires_after_its_ttl():
+    kili = FakeKili(10)
+    index = ExternalIdIndex(kili, 'project_id', ttl=0.01)
+    index.resolve(['asset1'])
+    time.sleep(0.02)
+    kili.assets_by_external_id['asset1'] = ['new-id1']
+    assert index.resolve(['asset1']) == ['new-id1']
+    assert len(kili.calls) == 2
+
+
+def test_unknown_and_duplicated_external_ids_raise():
+    index = ExternalIdIndex(FakeKili(10, duplicates=['asset2']), 'project_id')
+    with pytest.raises(Exception, match='No asset found with external ID "asset10"'):
+        index.resolve(['asset1', 'asset10'])
+    with pytest.raises(Exception, match='Several assets found with external ID "asset2"'):
+        index.resolve(['asset2'])
+
+
+def test_helpers_share_the_index_of_the_client():
+    kili = FakeKili(10)
+    assert get_external_id_index(kili, 'project_id') is get_external_id_index(kili, 'project_id')
+    assert infer_ids_from_external_ids(kili, None, ['asset1', 'asset2'], 'project_id') \
+        == ['id1', 'id2']
+    assert infer_id_from_external_id(kili, None, 'asset2', 'project_id') == 'id2'
+    assert infer_id_from_external_id(kili, 'id5', None, 'project_id') == 'id5'
+    assert len(kili.calls) == 1
+    clear_external_id_indexes(kili)
+    assert infer_id_from_external_id(kili, None, 'asset2', 'project_id') == 'id2'
+    assert len(kili.calls) == 2
+
+
+def test_renamed_assets_are_not_resolved_from_their_former_external_ids():
+    """Changing external ids with update_properties_in_assets empties the indexes"""
+    project = FakeKili(10)
+    kili = MutationsAsset(mock.MagicMock())
+    kili.auth.client.endpoint = 'https://cloud.kili-technology.com/api/label/v2/graphql'
+    kili.assets = project.assets
+    assert infer_id_from_external_id(kili, None, 'asset1', 'project_id') == 'id1'
+    project.assets_by_external_id['renamed1'] = project.assets_by_external_id.pop('asset1')
+    with mock.patch('kili.mutations.asset._mutate_from_paginated_call', return_value=[]):
+        kili.update_properties_in_assets(asset_ids=['id1'], external_ids=['renamed1'])
+    with pytest.raises(Exception, match='No asset found with external ID "asset1"'):
+        infer_id_from_external_id(kili, None, 'asset1', 'project_id')
+    assert infer_id_from_external_id(kili, None, 'renamed1', 'project_id') == 'id1'
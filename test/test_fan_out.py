@@ -0,0 +1,67 @@
+"""
+Tests of the queries run over several projects
+"""
+import threading
+import time
+from unittest import mock
+
+from kili.client import Kili
+from kili.utils.fan_out import fan_out_calls, tagged_dataframe
+
+
+def fan_out_client():
+    """Client whose queries wait for each other, without connection to the API"""
+    kili = Kili.__new__(Kili)
+    kili.auth = mock.MagicMock()
+    barrier = threading.Barrier(3, timeout=5)
+    calls = []
+
+    def assets(project_id=None, fields=None, disable_tqdm=False):
+        calls.append({'project_id': project_id, 'fields': fields, 'disable_tqdm': disable_tqdm})
+        barrier.wait()
+        return [{'id': f'{project_id}-asset{i}'} for i in range(int(project_id[-1]))]
+    kili.assets = assets
+    return kili, calls
+
+
+def test_fan_out_runs_the_queries_concurrently():
+    """Queries of all the projects run at the same time, without progress bars"""
+    kili, calls = fan_out_client()
+    results = dict(kili.fan_out('assets', ['project1', 'project2', 'project3'],
+                                max_workers=3, fields=['id']))
+    assert results == {f'project{n}': [{'id': f'project{n}-asset{i}'} for i in range(n)]
+                       for n in [1, 2, 3]}
+    assert all(call['fields'] == ['id'] and call['disable_tqdm'] for call in calls)
+
+
+def test_fan_out_as_dataframe_tags_the_rows_with_their_project():
+    """Rows of all the projects are concatenated with a projectId column"""
+    kili, _ = fan_out_client()
+    dataframe = kili.fan_out('assets', ['project1', 'project2', 'project3'],
+                             max_workers=3, as_dataframe=True)
+    assert list(dataframe.columns) == ['projectId', 'id']
+    assert sorted(dataframe['projectId'].value_counts().items()) == [
+        ('project1', 1), ('project2', 2), ('project3', 3)]
+
+
+def test_tagged_dataframe_of_single_values():
+    """Single values such as counts are stored in a result column"""
+    dataframe = tagged_dataframe([('project1', 4), ('project2', 2)])
+    assert dataframe.to_dict('records') == [{'projectId': 'project1', 'result': 4},
+                                            {'projectId': 'project2', 'result': 2}]
+    assert list(tagged_dataframe([]).columns) == ['projectId']
+
+
+def test_fan_out_calls_cancels_pending_calls_when_stopped():
+    """Calls not started yet are cancelled when the iteration stops"""
+    started = []
+
+    def query(project_id):
+        started.append(project_id)
+        time.sleep(0.05)
+        return project_id
+    results = fan_out_calls(query, [f'project{i}' for i in range(20)], max_workers=2)
+    next(results)
+    results.close()
+    time.sleep(0.1)
+    assert len(started) <= 4
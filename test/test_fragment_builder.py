@@ -0,0 +1,25 @@
+"""Tests for the building of GraphQL fragments"""
+
+import pytest
+
+from kili.helpers import fragment_builder
+from kili.types import Asset
+
+
+def test_fragment_builder():
+    """Subfields are grouped by subquery, in the order of the fields"""
+    fields = ['id', 'labels.author.email', 'labels.jsonResponse', 'latestLabel.id',
+              'labels.author.id']
+    assert fragment_builder(fields, Asset) == \
+        ' labels{ author{ email id} jsonResponse} latestLabel{ id} id'
+    assert fragment_builder(tuple(fields), Asset) is fragment_builder(fields, Asset)
+
+
+def test_fragment_builder_validates_fields():
+    """Unknown fields and subqueries on scalar fields are rejected"""
+    with pytest.raises(AttributeError):
+        fragment_builder(['unknownField'], Asset)
+    with pytest.raises(AttributeError):
+        fragment_builder(['externalId.id'], Asset)
+    with pytest.raises(Exception, match='as strings'):
+        fragment_builder([1], Asset)
@@ -0,0 +1,89 @@
+"""Tests for the GraphQL client transport"""
+
+import gzip
+from http.client import RemoteDisconnected
+import json
+from unittest import mock
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+from kili.graphql_client import GraphQLClient
+
+
+def test_session_pool_size():
+    """The connections to the endpoint are pooled with the given size"""
+    client = GraphQLClient('https://kili/api/label/v2/graphql', pool_maxsize=32)
+    adapter = client.session.get_adapter('https://kili/api/label/v2/graphql')
+    assert adapter._pool_maxsize == 32  # pylint: disable=protected-access
+
+
+def test_request_compression():
+    """Large bodies are gzipped only when compression is enabled"""
+    data = {'query': 'query', 'variables': {'contentArray': ['a' * 2048]}}
+    for compress_requests in [False, True]:
+        client = GraphQLClient('https://kili/api/label/v2/graphql',
+                               compress_requests=compress_requests)
+        headers = {}
+        body = client._build_body(data, headers)  # pylint: disable=protected-access
+        if compress_requests:
+            assert headers['Content-Encoding'] == 'gzip'
+            body = gzip.decompress(body)
+        else:
+            assert 'Content-Encoding' not in headers
+        assert json.loads(body) == data
+
+
+def test_connection_errors_are_retried():
+    """Queries are sent again after any connection error, mutations only if it was not sent"""
+    for query, error in [('query { data: assets }', requests.exceptions.ConnectionError()),
+                         ('mutation { data: deleteAssets }', requests.exceptions.ConnectTimeout()),
+                         ('mutation { data: deleteAssets }', requests.exceptions.ConnectionError(
+                             MaxRetryError(None, '/', NewConnectionError(None, 'refused'))))]:
+        client = GraphQLClient('https://kili/api/label/v2/graphql',
+                               rate_limiter=mock.MagicMock())
+        response = mock.MagicMock(status_code=200, content=b'{"data": {"data": []}}')
+        client.session.post = mock.MagicMock(side_effect=[error, response])
+        with mock.patch('kili.graphql_client.time.sleep'):
+            assert client.execute(query) == {'data': {'data': []}}
+        assert client.session.post.call_count == 2
+
+
+def test_mutations_are_not_retried_once_received():
+    """Mutations which may have reached the server are not sent twice"""
+    read_error = requests.exceptions.ConnectionError(
+        ProtocolError('Connection aborted.', RemoteDisconnected('closed')))
+    server_error = mock.MagicMock(status_code=503, content=b'Service Unavailable')
+    for outcome in [read_error, requests.exceptions.ReadTimeout(), server_error]:
+        client = GraphQLClient('https://kili/api/label/v2/graphql',
+                               rate_limiter=mock.MagicMock())
+        client.session.post = mock.MagicMock(side_effect=[outcome])
+        with mock.patch('kili.graphql_client.time.sleep'), pytest.raises(Exception):
+            client.execute('mutation { data: deleteAssets }')
+        assert client.session.post.call_count == 1
+
+
+def test_every_attempt_draws_from_the_rate_limiter():
+    """The rate limiter is acquired before each request sent, retries included"""
+    client = GraphQLClient('https://kili/api/label/v2/graphql', rate_limiter=mock.MagicMock())
+    responses = [mock.MagicMock(status_code=200, content=b'{"errors": [{"message": "busy"}]}'),
+                 mock.MagicMock(status_code=200, content=b'{"data": {"data": []}}')]
+    client.session.post = mock.MagicMock(side_effect=responses)
+    with mock.patch('kili.graphql_client.time.sleep'):
+        assert client.execute('query { data: assets }') == {'data': {'data': []}}
+    assert client.rate_limiter.acquire.call_count == 2
+
+
+def test_throttled_requests_wait_for_retry_after():
+    """A 429 slows the rate limiter down and waits for the delay given by the server"""
+    client = GraphQLClient('https://kili/api/label/v2/graphql', rate_limiter=mock.MagicMock())
+    throttled = mock.MagicMock(status_code=429, headers={'Retry-After': '7'})
+    response = mock.MagicMock(status_code=200, content=b'{"data": {"data": []}}')
+    client.session.post = mock.MagicMock(side_effect=[throttled, response])
+    with mock.patch('kili.graphql_client.time.sleep') as sleep:
+        assert client.execute('query { data: assets }') == {'data': {'data': []}}
+    sleep.assert_called_once_with(7.)
+    client.rate_limiter.on_throttled.assert_called_once_with()
+    client.rate_limiter.on_success.assert_called_once_with()
+    assert client.rate_limiter.acquire.call_count == 2
@@ -0,0 +1,36 @@
+"""Tests for the time taken to import the SDK and its CLI"""
+
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time of kili.cli, in seconds. About 0.25s with typeguard 2.
+IMPORT_TIME_BUDGET = 2.
+
+LAZY_MODULES = ['numpy', 'pandas', 'pyparsing', 'tabulate', 'tqdm', 'websocket']
+
+
+def import_times(module):
+    """Cumulative import time of each module imported by `import module`, in seconds"""
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+@pytest.mark.parametrize('module', ['kili.client', 'kili.cli'])
+def test_heavy_dependencies_are_imported_lazily(module):
+    """Heavy dependencies are only imported when they are first used"""
+    times = import_times(module)
+    assert not set(LAZY_MODULES) & set(times)
+
+
+def test_import_time_budget():
+    """The CLI starts within the budget"""
+    assert import_times('kili.cli')['kili.cli'] < IMPORT_TIME_BUDGET
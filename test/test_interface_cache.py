@@ -0,0 +1,53 @@
+"""Tests for the cache of json interfaces"""
+
+from unittest.mock import MagicMock
+
+from kili.utils.interface_cache import JsonInterfaceCache
+
+URL = 'https://storage.example.com/project/interface.json'
+
+
+def response(status_code, content=b'', headers=None):
+    """Mocked response of the storage"""
+    mocked_response = MagicMock(status_code=status_code, content=content,
+                                headers=headers or {})
+    return mocked_response
+
+
+def test_interfaces_are_revalidated_with_etags(tmpdir):
+    """Interfaces are downloaded once, then revalidated with conditional requests"""
+    cache = JsonInterfaceCache(max_age=0, cache_dir=str(tmpdir))
+    cache.session.get = MagicMock(side_effect=[
+        response(200, b'{"jobs": {}}', {'ETag': '"v1"'}),
+        response(304),
+    ])
+    assert cache.get(URL + '?signature=1', 'project') == {'jobs': {}}
+    assert cache.get(URL + '?signature=2', 'project') == {'jobs': {}}
+    cache.session.get.assert_called_with(URL + '?signature=2', headers={'If-None-Match': '"v1"'})
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    other_process_cache = JsonInterfaceCache(max_age=0, cache_dir=str(tmpdir))
+    other_process_cache.session.get = MagicMock(return_value=response(304))
+    assert other_process_cache.get(URL, 'project') == {'jobs': {}}
+    assert other_process_cache.misses == 0
+
+
+def test_fresh_interfaces_are_not_requested():
+    """Interfaces validated less than max_age seconds ago are served from memory"""
+    cache = JsonInterfaceCache(max_age=60, cache_dir='')
+    cache.session.get = MagicMock(
+        side_effect=lambda url, headers: response(200, f'{{"url": "{url}"}}'.encode()))
+    urls = [(f'{URL}{i % 5}', f'project{i % 5}') for i in range(20)]
+    cache.prefetch(urls)
+    assert cache.session.get.call_count == 5
+    assert cache.get(*urls[7]) == {'url': f'{URL}2'}
+    assert cache.session.get.call_count == 5
+
+
+def test_returned_interfaces_are_copies():
+    """Editing a returned interface does not alter the cache"""
+    cache = JsonInterfaceCache(max_age=60, cache_dir='')
+    cache.session.get = MagicMock(return_value=response(200, b'{"jobs": {"JOB_0": {}}}'))
+    cache.get(URL, 'project')['jobs']['JOB_1'] = {}
+    assert cache.get(URL, 'project') == {'jobs': {'JOB_0': {}}}
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,23 @@
+"""Tests for the decoding of the json fields of the results"""
+
+from kili.helpers import format_result
+from kili.orm import Label
+from kili.utils.json_decoder import loads
+
+
+def test_loads_falls_back_on_the_standard_library():
+    """Documents rejected by the fast backends are still decoded"""
+    assert loads(b'{"a": [1, 2.5, "b"]}') == {'a': [1, 2.5, 'b']}
+    assert loads('{"a": NaN}')['a'] != loads('{"a": NaN}')['a']
+
+
+def test_format_result_without_decoding():
+    """Json fields are kept as strings when decoding is disabled"""
+    result = {'data': {'data': [{'id': 'label', 'jsonResponse': '{"JOB_0": {}}',
+                                 'labelOf': {'jsonMetadata': '{"a": 1}'}}]}}
+    labels = format_result('data', result, Label, decode_json=False)
+    assert labels[0]['jsonResponse'] == '{"JOB_0": {}}'
+    assert labels[0]['labelOf']['jsonMetadata'] == '{"a": 1}'
+    labels = format_result('data', result, Label)
+    assert labels[0]['jsonResponse'] == {'JOB_0': {}}
+    assert labels[0]['labelOf']['jsonMetadata'] == {'a': 1}
@@ -0,0 +1,106 @@
+"""Tests for the local mirror of a project"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from kili.helpers import format_result
+from kili.mirror import MIRROR_WATERMARK_MARGIN, ProjectMirror
+from kili.orm import Asset
+
+
+def api_assets(*assets):
+    """Assets as returned by kili.assets(decode_json=False)"""
+    return iter(format_result('data', {'data': {'data': list(assets)}}, Asset, decode_json=False))
+
+
+def asset(asset_id, updated_at, labels=()):
+    """An asset with its labels, as sent by the API"""
+    return {'id': asset_id, 'createdAt': asset_id, 'externalId': f'external-{asset_id}',
+            'jsonMetadata': '{"imageUrl": "url"}', 'status': 'LABELED' if labels else 'TODO',
+            'updatedAt': updated_at,
+            'labels': [{'author': {'id': 'user'}, 'createdAt': created_at, 'id': label_id,
+                        'jsonResponse': '{"JOB_0": {}}', 'labelType': 'DEFAULT'}
+                       for label_id, created_at in labels]}
+
+
+def assert_watermark_is_start_of_sync(watermark):
+    """The watermark is the date the sync started, minus the safety margin"""
+    expected = datetime.now(timezone.utc) - timedelta(seconds=MIRROR_WATERMARK_MARGIN)
+    started_at = datetime.fromisoformat(watermark.replace('Z', '+00:00'))
+    assert timedelta(0) <= expected - started_at < timedelta(seconds=5)
+
+
+def test_delta_sync(tmpdir):
+    """Syncs only request the assets updated since the watermark of the previous sync"""
+    kili = MagicMock()
+    kili.assets.side_effect = [
+        api_assets(asset('a', '2022-01-01T00:00:00.000Z'),
+                   asset('b', '2022-01-02T00:00:00.000Z', [('l1', '2022-01-03T00:00:00.000Z')])),
+        api_assets(asset('a', '2022-01-04T00:00:00.000Z', [('l2', '2022-01-04T00:00:00.000Z')])),
+    ]
+    kili.count_assets.return_value = 2
+    with ProjectMirror(kili, 'project', str(tmpdir / 'project.db')) as mirror:
+        assert mirror.sync() == 2
+        assert kili.assets.call_args.kwargs['updated_at_gte'] is None
+        watermark = mirror.watermark
+        assert_watermark_is_start_of_sync(watermark)
+        assert mirror.sync() == 1
+        assert kili.assets.call_args.kwargs['updated_at_gte'] == watermark
+        assert_watermark_is_start_of_sync(mirror.watermark)
+
+    with ProjectMirror(kili, 'project', str(tmpdir / 'project.db')) as mirror:
+        assets = mirror.assets(status_in=['LABELED'])
+        assert [asset['id'] for asset in assets] == ['a', 'b']
+        assert assets[0]['jsonMetadata'] == {'imageUrl': 'url'}
+        assert assets[0]['labels'][0]['jsonResponse'] == {'JOB_0': {}}
+        assert [label['id'] for label in mirror.labels(author_in=['user'])] == ['l1', 'l2']
+        assert mirror.assets(external_id_contains=['external-b'], first=1)[0]['id'] == 'b'
+
+
+def test_deleted_assets_are_removed(tmpdir):
+    """Assets missing from Kili are removed when Kili counts another number of assets"""
+    kili = MagicMock()
+    kili.assets.side_effect = [
+        api_assets(asset('a', '2022-01-01T00:00:00.000Z'),
+                   asset('b', '2022-01-02T00:00:00.000Z', [('l1', '2022-01-02T00:00:00.000Z')])),
+        api_assets(),
+        api_assets({'id': 'a'}),
+    ]
+    kili.count_assets.side_effect = [2, 1]
+    mirror = ProjectMirror(kili, 'project', str(tmpdir / 'project.db'))
+    mirror.sync()
+    assert mirror.sync() == 0
+    assert [asset['id'] for asset in mirror.assets()] == ['a']
+    assert mirror.labels() == []
+
+
+def test_deleted_assets_are_removed_when_assets_are_created(tmpdir):
+    """An asset deleted while others are created is removed, although Kili counts more assets"""
+    kili = MagicMock()
+    kili.assets.side_effect = [
+        api_assets(asset('a', '2022-01-01T00:00:00.000Z'), asset('b', '2022-01-01T00:00:00.000Z')),
+        api_assets(asset('c', '2022-01-02T00:00:00.000Z')),
+        api_assets({'id': 'b'}, {'id': 'c'}, {'id': 'd'}, {'id': 'e'}),
+    ]
+    # a is deleted, c, d and e are created, d and e after the pages of the sync are read
+    kili.count_assets.side_effect = [2, 4]
+    mirror = ProjectMirror(kili, 'project', str(tmpdir / 'project.db'))
+    mirror.sync()
+    assert mirror.sync() == 1
+    assert [asset['id'] for asset in mirror.assets()] == ['b', 'c']
+
+
+def test_full_sync_always_reconciles(tmpdir):
+    """A full sync removes the deleted assets even when the numbers of assets are equal"""
+    kili = MagicMock()
+    kili.assets.side_effect = [
+        api_assets(asset('a', '2022-01-01T00:00:00.000Z')),
+        api_assets(asset('b', '2022-01-02T00:00:00.000Z')),
+        api_assets({'id': 'b'}),
+    ]
+    kili.count_assets.side_effect = [1]
+    mirror = ProjectMirror(kili, 'project', str(tmpdir / 'project.db'))
+    mirror.sync()
+    assert mirror.sync(full=True) == 1
+    assert [asset['id'] for asset in mirror.assets()] == ['b']
+    assert kili.count_assets.call_count == 1
@@ -0,0 +1,87 @@
+"""Tests for the object-relational mapping of the results"""
+
+import copy
+import json
+import pickle
+from unittest.mock import patch
+
+import pandas as pd
+
+from kili.helpers import format_result
+from kili.orm import Asset, Label, compact_record, fields_tree
+
+
+def asset_result():
+    """Result of an assets query, as sent by the API"""
+    return {'data': {'data': [{
+        'id': 'asset',
+        'status': 'LABELED',
+        'jsonMetadata': '{"imageUrl": "url"}',
+        'labels': [{'id': 'label', 'jsonResponse': '{"JOB_0": {"categories": []}}'}],
+        'latestLabel': {'id': 'label', 'jsonResponse': ''},
+    }]}}
+
+
+def test_json_fields_are_decoded_on_first_access():
+    """Json fields are decoded only when they are read, then kept decoded"""
+    with patch('kili.orm.decode_json_field', wraps=lambda key, value, *_: json.loads(value or '{}')) \
+            as decode_json_field:
+        asset = format_result('data', asset_result(), Asset)[0]
+        assert asset['id'] == 'asset' and asset.status == 'LABELED'
+        decode_json_field.assert_not_called()
+        assert asset.labels[0].jsonResponse == {'JOB_0': {'categories': []}}
+        assert asset.labels[0]['jsonResponse'] is asset.labels[0].jsonResponse
+        assert decode_json_field.call_count == 1
+    assert isinstance(asset.labels[0], Label) and isinstance(asset.latestLabel, Label)
+    assert asset.latestLabel.json_response() == {}
+
+
+def test_records_behave_like_decoded_dicts():
+    """Comparisons, copies and conversions see the decoded values"""
+    expected = {
+        'id': 'asset',
+        'status': 'LABELED',
+        'jsonMetadata': {'imageUrl': 'url'},
+        'labels': [{'id': 'label', 'jsonResponse': {'JOB_0': {'categories': []}}}],
+        'latestLabel': {'id': 'label', 'jsonResponse': {}},
+    }
+    assert format_result('data', asset_result(), Asset)[0] == expected
+    assert dict(format_result('data', asset_result(), Asset)[0])['jsonMetadata'] == {
+        'imageUrl': 'url'}
+    assert {**format_result('data', asset_result(), Asset)[0]} == expected
+    assert json.loads(json.dumps(format_result('data', asset_result(), Asset)[0])) == expected
+    assert copy.deepcopy(format_result('data', asset_result(), Asset)[0]) == expected
+    assert pickle.loads(pickle.dumps(format_result('data', asset_result(), Asset)[0])) == expected
+    dataframe = pd.DataFrame(format_result('data', asset_result(), Asset))
+    assert dataframe['jsonMetadata'][0] == {'imageUrl': 'url'}
+    assert format_result('data', asset_result(), Asset, decode_json=False)[0][
+        'jsonMetadata'] == '{"imageUrl": "url"}'
+
+
+def test_dict_methods_see_the_decoded_values():
+    """setdefault and merges return decoded values, and values set by update are kept"""
+    assert Asset({'id': 'a', 'jsonMetadata': '{"x": 1}'}).setdefault('jsonMetadata') == {'x': 1}
+    assert Asset({'id': 'a', 'jsonMetadata': '{"x": 1}'}) | {'status': 'TODO'} == {
+        'id': 'a', 'jsonMetadata': {'x': 1}, 'status': 'TODO'}
+    asset = Asset({'id': 'a', 'jsonMetadata': '{"x": 1}'})
+    asset.update(jsonMetadata='not a json')
+    asset |= {'status': 'TODO'}
+    assert asset == {'id': 'a', 'jsonMetadata': 'not a json', 'status': 'TODO'}
+    assert dict(Asset({'id': 'a', 'jsonMetadata': '{"x": 1}'})) == {
+        'id': 'a', 'jsonMetadata': {'x': 1}}
+
+
+def test_compact_records():
+    """Compact records hold the requested fields, readable by key and attribute"""
+    fields = ['id', 'jsonMetadata', 'labels.author.email', 'labels.id']
+    rows = format_result('data', asset_result())
+    record = compact_record(rows[0], fields_tree(fields))
+    assert record.id == record['id'] == 'asset'
+    assert record.jsonMetadata == {'imageUrl': 'url'}
+    assert record.labels[0].author is None
+    assert record['labels'][0]['id'] == 'label'
+    assert record.get('status') is None
+    assert list(record.keys()) == ['id', 'jsonMetadata', 'labels']
+    assert record.to_dict() == {'id': 'asset', 'jsonMetadata': {'imageUrl': 'url'},
+                                'labels': [{'author': None, 'id': 'label'}]}
+    assert list(pd.DataFrame([record]).columns) == ['id', 'jsonMetadata', 'labels']
@@ -1,7 +1,18 @@
 """Tests for utils module"""
 
+from types import SimpleNamespace
+from unittest import mock
+import random
+import threading
+import time
+
+import pytest
+
+from kili.exceptions import BatchMutationError, GraphQLError
+from kili.graphql_client import GraphQLClient
 from kili.utils.pagination import (
-    batch_iterator_builder, batch_object_builder, row_generator_from_paginated_calls)
+    _mutate_from_paginated_call, batch_iterator_builder, batch_object_builder, memoized_count,
+    row_generator_from_paginated_calls)
 from .utils import mocked_count_method, mocked_query_method
 
 TEST_CASES = [
@@ -77,6 +88,32 @@ def test_row_generator_from_paginated_calls():
             f"Test case \"{case_name}\" failed"
 
 
+def test_row_generator_from_paginated_calls_with_prefetching():
+    """
+        Pages requested concurrently are yielded in order
+    """
+    for test_case in TEST_CASES:
+        if test_case["args"].get('first', 0) > 1000:
+            continue
+        case_name = test_case["case"]
+        skip = test_case["args"].get('skip', 0)
+        first = test_case["args"].get('first')
+        disable_tqdm = test_case["args"].get('disable_tqdm', False)
+        expected = [{"id": i} for i in range(skip, skip + first)]
+
+        actual = row_generator_from_paginated_calls(
+            skip,
+            first,
+            mocked_count_method,
+            {},
+            mocked_query_method,
+            {first, skip},
+            [],
+            disable_tqdm,
+            prefetch_pages=3)
+        assert list(actual) == expected, f"Test case \"{case_name}\" failed"
+
+
 def test_batch_iterator_builder():
     """Test batch iterator builder."""
     TEST_CASE = [{
@@ -142,3 +179,132 @@ def test_batch_object_builder():
         case_name = test_case['case']
         assert all(a == b for a, b in zip(actual, expected)
                    ), f"Test case \"{case_name}\" failed"
+
+
+def test_batch_object_builder_with_max_bytes():
+    """Batches are cut by number of objects or by payload size, whichever comes first"""
+    texts = ['a' * 8, 'b' * 8, 'c' * 98, 'd' * 8, 'e' * 200, 'f', 'g', 'h', 'i']
+    actual = batch_object_builder(
+        {'texts': texts, 'ids': list(range(9)), 'none': None}, batch_size=3, max_bytes=100)
+    assert [batch['ids'] for batch in actual] == [[0, 1], [2], [3], [4], [5, 6, 7], [8]]
+    actual = batch_object_builder({'texts': texts}, batch_size=3, max_bytes=100)
+    assert next(actual) == {'texts': ['a' * 8, 'b' * 8]}
+
+
+def test_row_generator_from_paginated_calls_with_keyset_pagination():
+    """
+        Rows are walked with a cursor on their creation date, ties included,
+        and rows inserted before the cursor during the crawl are not yielded twice
+    """
+    # rows share creation dates across page boundaries, and over more than a page
+    def created_at(i):
+        minute = i // 37 if i < 300 or i >= 550 else 300 // 37
+        return f'2022-01-01T00:{minute:02d}:00.000Z'
+    table = []
+
+    def query_method(skip, first, payload, fields):
+        created_at_gte = payload['where'].get('createdAtGte')
+        rows = [row for row in table
+                if created_at_gte is None or row['createdAt'] >= created_at_gte]
+        page = [{field: row[field] for field in fields} for row in rows[skip:skip + first]]
+        # a row is created at the beginning of the project during the crawl
+        table.insert(0, {'id': -len(table), 'createdAt': '2021-01-01T00:00:00.000Z'})
+        return page
+
+    for skip, first in [(0, None), (20, 500), (0, 1)]:
+        table[:] = [{'id': i, 'createdAt': created_at(i)} for i in range(1000)]
+        actual = row_generator_from_paginated_calls(
+            skip,
+            first,
+            mocked_count_method,
+            {},
+            query_method,
+            {'where': {'createdAtGte': None}},
+            ['id'],
+            True,
+            cursor_field='createdAt',
+            cursor_where_key='createdAtGte')
+        actual = list(actual)
+        expected_ids = list(range(skip, 1000 if first is None else skip + first))
+        assert [row['id'] for row in actual] == expected_ids
+        assert all(key == 'id' for row in actual for key in row)
+
+
+def test_mutate_from_paginated_call_with_workers():
+    """Batches sent concurrently keep their order and failures do not abort the others"""
+    def execute(request, variables):
+        time.sleep(random.random() / 100)
+        if variables['ids'][0] == 300:
+            return {'errors': [f'{request} failed']}
+        return {'data': variables['ids']}
+    kili = SimpleNamespace(auth=SimpleNamespace(client=SimpleNamespace(execute=execute)))
+
+    results = _mutate_from_paginated_call(
+        kili, {'ids': list(range(300))}, lambda batch: {'ids': batch['ids']}, 'mutation',
+        max_workers=4)
+    assert [result['data'] for result in results] == [
+        list(range(i, i + 100)) for i in range(0, 300, 100)]
+
+    with pytest.raises(BatchMutationError) as error:
+        _mutate_from_paginated_call(
+            kili, {'ids': list(range(1000))}, lambda batch: {'ids': batch['ids']}, 'mutation',
+            max_workers=4)
+    assert [graphql_error.batch_number for graphql_error in error.value.errors] == [3]
+    assert len(error.value.results) == 10
+    assert error.value.results[4] == {'data': list(range(400, 500))}
+
+
+def test_failed_batch_reports_its_offset():
+    """Errors give the index of the first object of the failed batch, whatever its size"""
+    def execute(request, variables):
+        if 25 in variables['ids']:
+            return {'errors': [f'{request} failed']}
+        return {'data': variables['ids']}
+    kili = SimpleNamespace(auth=SimpleNamespace(client=SimpleNamespace(execute=execute)))
+
+    with pytest.raises(GraphQLError) as error:
+        _mutate_from_paginated_call(
+            kili, {'ids': list(range(100))}, lambda batch: {'ids': batch['ids']}, 'mutation',
+            max_bytes=20)
+    # ids below 10 take 1 byte and the others 2, so the batches hold 15 ids then 10 ids
+    assert (error.value.batch_number, error.value.offset) == (2, 25)
+    assert 'failed from index 25' in str(error.value)
+
+
+def test_count_is_concurrent_with_the_first_page():
+    """The progress bar total is counted while the first page is requested, then reused"""
+    barrier = threading.Barrier(2, timeout=5)
+    calls = []
+    first_run = [True]
+
+    def count_method(**_):
+        calls.append('count')
+        barrier.wait()
+        return 2
+
+    def paged_call_method(skip, first, *_):
+        if skip == 0 and first_run[0]:
+            barrier.wait()
+        return [{'id': i} for i in range(skip, min(2, skip + first))]
+
+    for _ in range(2):
+        rows = row_generator_from_paginated_calls(
+            0, None, count_method, {'project_id': 'project'}, paged_call_method, {}, ['id'],
+            False)
+        assert list(rows) == [{'id': 0}, {'id': 1}]
+        first_run[0] = False
+    assert calls == ['count']
+
+
+def test_mutations_forget_the_memoized_counts():
+    """A count is computed again after a mutation, which may have changed it"""
+    counts = iter([2, 3])
+    count_method = mock.MagicMock(side_effect=lambda **_: next(counts))
+    assert memoized_count(count_method, {'project_id': 'project'}) == 2
+    assert memoized_count(count_method, {'project_id': 'project'}) == 2
+    client = GraphQLClient('https://kili/api/label/v2/graphql', rate_limiter=mock.MagicMock())
+    client.session.post = mock.MagicMock(return_value=mock.MagicMock(
+        status_code=200, content=b'{"data": {"data": []}}'))
+    client.execute('mutation { data: deleteAssets }')
+    assert memoized_count(count_method, {'project_id': 'project'}) == 3
+    assert count_method.call_count == 2
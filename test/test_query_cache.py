@@ -0,0 +1,83 @@
+"""Tests for the cache of query results"""
+
+from unittest.mock import MagicMock, patch
+
+from kili.graphql_client import GraphQLClient
+from kili.mutations.asset.queries import GQL_APPEND_MANY_TO_DATASET
+from kili.mutations.label.queries import GQL_APPEND_TO_LABELS, GQL_UPDATE_PROPERTIES_IN_LABEL
+from kili.mutations.project.queries import GQL_APPEND_TO_ROLES
+from kili.queries.asset.queries import GQL_ASSETS_COUNT
+from kili.queries.project.queries import GQL_PROJECTS_COUNT
+from kili.queries.project_user.queries import GQL_PROJECT_USERS_COUNT
+from kili.utils.query_cache import QueryCache, query_entity
+
+
+def cached_client(query_cache):
+    """GraphQL client answering every query with a new count"""
+    client = GraphQLClient('https://kili/api/label/v2/graphql', query_cache=query_cache)
+    client._send = MagicMock(  # pylint: disable=protected-access
+        side_effect=lambda *_: {'data': {'data': client._send.call_count}})  # pylint: disable=protected-access
+    return client
+
+
+def test_query_entities():
+    """Queries are told apart by the entity of their root field"""
+    assert query_entity(GQL_ASSETS_COUNT) == 'asset'
+    assert query_entity(GQL_PROJECTS_COUNT) == 'project'
+    assert query_entity(GQL_PROJECT_USERS_COUNT) == 'projectUser'
+    assert query_entity('query Me { data: me { id } }') == 'user'
+
+
+def test_identical_queries_are_cached():
+    """Queries are keyed by their normalized string and variables, and returned as copies"""
+    client = cached_client(QueryCache())
+    where = {'where': {'project': {'id': 'project'}, 'status': None}}
+    first_result = client.execute(GQL_ASSETS_COUNT, where)
+    first_result['data']['data'] = 'modified'
+    assert client.execute('  ' + GQL_ASSETS_COUNT.replace('\n', ' '),
+                          {'where': {'status': None, 'project': {'id': 'project'}}}) \
+        == {'data': {'data': 1}}
+    assert client.execute(GQL_ASSETS_COUNT, {'where': {'project': {'id': 'other'}}}) \
+        == {'data': {'data': 2}}
+    assert (client.query_cache.hits, client.query_cache.misses) == (1, 2)
+
+
+def test_mutations_evict_the_entities_they_touch():
+    """Appending assets evicts asset and project results, not project users"""
+    client = cached_client(QueryCache())
+    for query in [GQL_ASSETS_COUNT, GQL_PROJECTS_COUNT, GQL_PROJECT_USERS_COUNT]:
+        client.execute(query, {'where': {}})
+    client.execute(GQL_APPEND_MANY_TO_DATASET, {'data': {}, 'where': {}})
+    assert client.execute(GQL_ASSETS_COUNT, {'where': {}}) == {'data': {'data': 5}}
+    assert client.execute(GQL_PROJECTS_COUNT, {'where': {}}) == {'data': {'data': 6}}
+    assert client.execute(GQL_PROJECT_USERS_COUNT, {'where': {}}) == {'data': {'data': 3}}
+    client.execute(GQL_APPEND_TO_ROLES, {'data': {}, 'where': {}})
+    assert client.execute(GQL_PROJECT_USERS_COUNT, {'where': {}}) == {'data': {'data': 8}}
+
+
+def test_label_mutations_evict_the_assets():
+    """Asset results may hold labels, so they are evicted by label mutations"""
+    client = cached_client(QueryCache())
+    client.execute(GQL_ASSETS_COUNT, {'where': {}})
+    for number_of_calls, mutation in [(2, GQL_APPEND_TO_LABELS),
+                                      (4, GQL_UPDATE_PROPERTIES_IN_LABEL),
+                                      (6, 'mutation($where: LabelWhere!) { data: deleteLabels }')]:
+        client.execute(mutation, {'data': {}, 'where': {}})
+        assert client.execute(GQL_ASSETS_COUNT, {'where': {}}) == {
+            'data': {'data': number_of_calls + 1}}
+
+
+def test_ttl_and_lru_eviction():
+    """Results expire after the ttl of their entity and the least recently used are evicted"""
+    client = cached_client(QueryCache(maxsize=2, ttl=60, ttls={'asset': 0}))
+    client.execute(GQL_ASSETS_COUNT, {'where': {}})
+    client.execute(GQL_ASSETS_COUNT, {'where': {}})
+    assert client._send.call_count == 2  # pylint: disable=protected-access
+    for project_id in ['a', 'b', 'a', 'c', 'a']:
+        client.execute(GQL_PROJECTS_COUNT, {'where': {'id': project_id}})
+    assert client._send.call_count == 5  # pylint: disable=protected-access
+    client.execute(GQL_PROJECTS_COUNT, {'where': {'id': 'b'}})
+    assert client._send.call_count == 6  # pylint: disable=protected-access
+    with patch('kili.utils.query_cache.time.monotonic', return_value=float('inf')):
+        client.execute(GQL_PROJECTS_COUNT, {'where': {'id': 'a'}})
+    assert client._send.call_count == 7  # pylint: disable=protected-access
@@ -0,0 +1,36 @@
+"""Tests for the rate limiter shared by the calls to the API"""
+
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from kili.utils.rate_limiter import RateLimiter, get_rate_limiter
+
+
+def test_threads_share_the_budget():
+    """Calls made from several threads are spaced by the same limiter"""
+    rate_limiter = RateLimiter(max_calls=20, period=1.)
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: rate_limiter.acquire(), range(21)))
+    assert time.monotonic() - start >= 0.99
+    assert rate_limiter.metrics()['number_of_calls'] == 21
+    assert rate_limiter.metrics()['total_wait_time'] > 0
+
+
+def test_backoff_and_recovery():
+    """The rate is halved when the API is overloaded, then recovers after successes"""
+    rate_limiter = RateLimiter(max_calls=250, period=60.)
+    rate_limiter.on_throttled()
+    rate_limiter.on_throttled()
+    assert round(rate_limiter.metrics()['rate_per_minute'], 6) == 250 / 4
+    assert rate_limiter.metrics()['number_of_throttled_calls'] == 2
+    for _ in range(100):
+        rate_limiter.on_success()
+    assert round(rate_limiter.metrics()['rate_per_minute'], 6) == 250
+
+
+def test_limiter_is_shared_by_endpoint():
+    """Clients of the same endpoint share the same limiter"""
+    endpoint = 'https://cloud.kili-technology.com/api/label/v2/graphql'
+    assert get_rate_limiter(endpoint) is get_rate_limiter(endpoint)
+    assert get_rate_limiter(endpoint) is not get_rate_limiter('http://localhost:4001/graphql')
@@ -44,7 +44,7 @@ class burstthrottle(object):
 
 
 @burstthrottle(max_hits=250, minutes=1)
-def mocked_query_method(skip, first, *_):
+def mocked_query_method(skip, first, *_, **__):
     """
     Simulates a query result by returning a list of ids
     """